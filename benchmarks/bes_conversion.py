@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Benchmark of sapieConverter.convert_bes_to_unicode
+#
+# Usage: python benchmarks/bes_conversion.py [size in MB ...]
+#
+# Converts synthetic BES volumes with the byte-at-a-time implementation the
+# add-on used before and with the current one, checks that both produce the
+# same text, and prints the throughput of each.
+
+import os
+import sys
+import time
+import types
+import random
+import importlib
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(ROOT_DIR, 'sapieLibrary', 'globalPlugins', 'sapieLibrary')
+
+
+def load_module(name):
+	"""Import an add-on module without NVDA (sapieLibrary/__init__.py needs it)"""
+	if 'sapieLibrary' not in sys.modules:
+		package = types.ModuleType('sapieLibrary')
+		package.__path__ = [PACKAGE_DIR]
+		sys.modules['sapieLibrary'] = package
+	return importlib.import_module('sapieLibrary.' + name)
+
+
+def legacy_convert_bes_to_unicode(content):
+	"""Previous implementation, kept as the reference for output and speed"""
+	result = ""
+	i = 0
+	for i in range(len(content)):
+		if i > 1024:
+			break
+
+	tenji = bytearray(content[i:])
+	tenji = tenji.replace(b'\x0d\xfe', b'\r\n')
+
+	for i in range(2, len(tenji)):
+		if tenji[i] == 0xfd:
+			tenji[i-2] = 0x0c
+			tenji[i-1] = 0x0c
+
+	for i in range(len(tenji)):
+		byte = tenji[i]
+		ch = chr(byte + 0x2800 - 0xa0)
+
+		if byte == 0x0d:
+			result += "\r"
+		elif byte == 0x0a:
+			result += "\n"
+		elif byte == 0xfd:
+			result += "\r\n"
+		elif byte == 0xfe:
+			result += "\r\n"
+		elif byte == 0x0c:
+			pass
+		elif byte == 0xff:
+			pass
+		elif '\u2800' <= ch <= '\u283f':
+			result += chr(byte + 0x2800 - 0xa0)
+
+	return result
+
+
+def make_bes(size, seed=0):
+	"""
+	Build a synthetic BES volume
+
+	Args:
+		size (int): Approximate size in bytes
+		seed (int): Random seed
+
+	Returns:
+		bytes: Header followed by lines of braille cells and page breaks
+	"""
+	rng = random.Random(seed)
+	cells = bytes(range(0xa0, 0xe0))
+	parts = [bytes(1024)]
+	length = 1024
+	while length < size:
+		line = bytes(rng.choice(cells) for _ in range(rng.randint(10, 32)))
+		end = b'\x0d\xfe' if rng.random() < 0.9 else b'\x0d\xfe\xfd'
+		parts.append(line + end)
+		length += len(line) + len(end)
+	return b''.join(parts)
+
+
+def check_equivalence(convert, rounds=2000):
+	"""Compare the conversion with the reference on random inputs"""
+	rng = random.Random(1)
+	alphabet = bytes(range(0xa0, 0xe0)) + b'\x0a\x0c\x0d\xfd\xfe\xff\x00\x41\x9f\xe0'
+	for n in range(rounds):
+		length = rng.choice((0, 1, 2, 3, 1024, 1025, 1026, 1027)) + rng.randint(0, 300)
+		content = bytes(rng.choice(alphabet) for _ in range(length))
+		if convert(content) != legacy_convert_bes_to_unicode(content):
+			raise AssertionError(f"Output differs for input {content!r}")
+
+
+def measure(convert, content, repeat):
+	"""Return the best throughput of repeated conversions in MB/s"""
+	best = None
+	for _ in range(repeat):
+		start = time.perf_counter()
+		convert(content)
+		elapsed = time.perf_counter() - start
+		best = elapsed if best is None else min(best, elapsed)
+	return len(content) / (1024 * 1024) / best
+
+
+def main(sizes):
+	sapieConverter = load_module('sapieConverter')
+	check_equivalence(sapieConverter.convert_bes_to_unicode)
+	print("Output identical to the previous implementation on random inputs")
+
+	for size in sizes:
+		content = make_bes(int(size * 1024 * 1024))
+		if sapieConverter.convert_bes_to_unicode(content) != legacy_convert_bes_to_unicode(content):
+			raise AssertionError(f"Output differs for the {size} MB volume")
+		before = measure(legacy_convert_bes_to_unicode, content, 1)
+		after = measure(sapieConverter.convert_bes_to_unicode, content, 5)
+		print(f"{size:6.1f} MB: before {before:8.2f} MB/s, after {after:8.2f} MB/s ({after / before:.0f}x)")
+
+
+if __name__ == '__main__':
+	main([float(arg) for arg in sys.argv[1:]] or [1, 4, 16])
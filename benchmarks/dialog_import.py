@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# Profile of the modules imported when the Sapie dialog is opened
+#
+# Usage: python benchmarks/dialog_import.py [rounds]
+#
+# Each round starts a fresh interpreter with the add-on's lib directory on
+# sys.path, as the global plugin sets it up, and times:
+#
+#   dialog open      import of sapieDialog, i.e. what the user waits for
+#                    before the dialog appears
+#   client warm-up   import of sapieClient with requests, urllib3, bs4 and
+#                    the rest of the networking stack, done in the
+#                    background once the dialog is open
+#
+# NVDA's own modules (wx, gui, config, ...) are already loaded when the
+# dialog is opened, so they are replaced by empty placeholder modules and
+# cost nothing here. The slowest modules of the dialog import are listed
+# from python -X importtime.
+
+import os
+import sys
+import json
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(ROOT_DIR, 'sapieLibrary', 'globalPlugins', 'sapieLibrary')
+
+# Modules provided by NVDA
+NVDA_MODULES = ('wx', 'ui', 'gui', 'config', 'addonHandler', 'globalVars', 'globalPluginHandler')
+
+MEASURE = r'''
+import sys, time, json, types, importlib.abc, importlib.machinery
+
+class Placeholder:
+    def __init__(self, *args, **kwargs):
+        pass
+
+class PlaceholderModule(types.ModuleType):
+    __path__ = []
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Placeholder
+
+class NVDAFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, name, path, target=None):
+        if name.split('.')[0] in {nvda_modules!r}:
+            return importlib.machinery.ModuleSpec(name, self)
+    def create_module(self, spec):
+        return PlaceholderModule(spec.name)
+    def exec_module(self, module):
+        pass
+
+sys.meta_path.insert(0, NVDAFinder())
+sys.path.insert(0, {lib_dir!r})
+package = types.ModuleType('sapieLibrary')
+package.__path__ = [{package_dir!r}]
+sys.modules['sapieLibrary'] = package
+
+start = time.perf_counter()
+import sapieLibrary.{module}
+print(json.dumps(time.perf_counter() - start))
+'''
+
+
+def measure(module, importtime=False):
+	"""
+	Import an add-on module in a fresh interpreter
+
+	Returns:
+		tuple: Seconds the import took, and the -X importtime report
+	"""
+	code = MEASURE.format(
+		nvda_modules=NVDA_MODULES,
+		lib_dir=os.path.join(PACKAGE_DIR, 'lib'),
+		package_dir=PACKAGE_DIR,
+		module=module
+	)
+	args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+	result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+	                        universal_newlines=True)
+	return json.loads(result.stdout), result.stderr
+
+
+def slowest(report, module, count=10):
+	"""
+	Modules imported by a module, by cumulative import time
+
+	Args:
+		report (str): Output of python -X importtime
+		module (str): Name of the importing module
+		count (int): Number of modules to list
+
+	Returns:
+		list: (microseconds, module name) of its direct imports
+	"""
+	entries = []
+	for line in report.splitlines():
+		if not line.startswith('import time:') or 'cumulative' in line:
+			continue
+		self_time, cumulative, name = line[len('import time:'):].split('|')
+		entries.append((len(name) - len(name.lstrip()), int(cumulative), name.strip()))
+
+	# -X importtime lists the imports of a module, indented, just before it
+	for index, (depth, cumulative, name) in enumerate(entries):
+		if name == module:
+			break
+	else:
+		return []
+	children = []
+	for child_depth, cumulative, name in reversed(entries[:index]):
+		if child_depth <= depth:
+			break
+		if child_depth == depth + 2:
+			children.append((cumulative, name))
+	children.sort(reverse=True)
+	return children[:count]
+
+
+def main(rounds):
+	# Warm the .pyc files
+	measure('sapieDialog')
+	measure('sapieClient')
+
+	dialog = min(measure('sapieDialog')[0] for _ in range(rounds))
+	client = min(measure('sapieClient')[0] for _ in range(rounds))
+	print(f"dialog open:    {dialog * 1000:8.1f} ms")
+	print(f"client warm-up: {client * 1000:8.1f} ms")
+
+	print()
+	print("Slowest imports of sapieDialog (cumulative):")
+	for cumulative, name in slowest(measure('sapieDialog', importtime=True)[1], 'sapieLibrary.sapieDialog'):
+		print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
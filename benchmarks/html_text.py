@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Benchmark of the text extraction from DAISY content files
+#
+# Usage: python benchmarks/html_text.py [file] [rounds]
+#
+# file is an HTML content file or a DAISY ZIP/EXE archive, whose largest
+# HTML member is used. Without it a DAISY 2.02 content file of about
+# 4 MB is generated: headings linked from the NCC and paragraphs of
+# sentences in <span id> elements, with a few character references.
+#
+# "previous" is the extraction as it was done before, with a separate
+# re.sub pass for scripts, styles, each kind of line break, the tags and
+# each entity. "current" is daisyConverter._extract_text_from_html. Peak
+# is the memory allocated during one extraction, from tracemalloc.
+
+import os
+import re
+import sys
+import time
+import types
+import zipfile
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(ROOT_DIR, 'sapieLibrary', 'globalPlugins', 'sapieLibrary')
+
+
+def load_converter():
+	"""Import daisyConverter without NVDA (sapieLibrary/__init__.py needs it)"""
+	package = types.ModuleType('sapieLibrary')
+	package.__path__ = [PACKAGE_DIR]
+	sys.modules['sapieLibrary'] = package
+	from sapieLibrary import daisyConverter
+	return daisyConverter
+
+
+def previous_extract(html_text):
+	"""Extraction before the single-pass markup removal"""
+	text = re.sub(r'<script[^>]*>.*?</script>', '', html_text, flags=re.IGNORECASE | re.DOTALL)
+	text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.IGNORECASE | re.DOTALL)
+	text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
+	text = re.sub(r'</p>', '\n', text, flags=re.IGNORECASE)
+	text = re.sub(r'</div>', '\n', text, flags=re.IGNORECASE)
+	text = re.sub(r'<[^>]+>', '', text)
+	text = re.sub(r'&nbsp;', ' ', text)
+	text = re.sub(r'&lt;', '<', text)
+	text = re.sub(r'&gt;', '>', text)
+	text = re.sub(r'&amp;', '&', text)
+	text = re.sub(r'&quot;', '"', text)
+	text = re.sub(r'&#(\d+);', lambda m: chr(int(m.group(1))), text)
+	lines = text.split('\n')
+	lines = [line.strip() for line in lines]
+	lines = [line for line in lines if line]
+	return '\n'.join(lines)
+
+
+def generate_content(size=4 * 1024 * 1024):
+	"""Generate a DAISY 2.02 content file of about size characters"""
+	parts = ['<?xml version="1.0" encoding="utf-8"?>\n<html><head><title>ベンチマーク</title>'
+	         '<style type="text/css">p { margin: 0; }</style></head><body>\n']
+	length = len(parts[0])
+	heading = 0
+	while length < size:
+		part = [f'<h2 id="h{heading}"><a href="c{heading}.smil#t{heading}">第{heading}章</a></h2>\n']
+		for paragraph in range(8):
+			part.append(f'<p id="p{heading}_{paragraph}">')
+			for sentence in range(4):
+				part.append(f'<span class="sentence" id="s{heading}_{paragraph}_{sentence}">'
+				            f'これは{heading}章{paragraph}段落の{sentence}文目の本文です。</span>')
+			if paragraph == 0:
+				part.append('<br />\n（注&nbsp;&#12354;&amp;&#x3044;）')
+			part.append('</p>\n')
+		part = ''.join(part)
+		parts.append(part)
+		length += len(part)
+		heading += 1
+	parts.append('</body></html>\n')
+	return ''.join(parts)
+
+
+def read_content(path, converter):
+	"""Read an HTML file, or the largest HTML member of a DAISY archive"""
+	if zipfile.is_zipfile(path):
+		with zipfile.ZipFile(path) as zf:
+			members = [info for info in zf.infolist() if info.filename.lower().endswith(('.html', '.htm'))]
+			info = max(members, key=lambda info: info.file_size)
+			return converter._TextDecoder().decode(zf.read(info))
+	with open(path, 'rb') as f:
+		return converter._TextDecoder().decode(f.read())
+
+
+def measure(extract, text, rounds):
+	"""Best time of several extractions in milliseconds, and the peak memory in MB"""
+	times = []
+	for _ in range(rounds):
+		start = time.perf_counter()
+		extract(text)
+		times.append(time.perf_counter() - start)
+	tracemalloc.start()
+	extract(text)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	return min(times) * 1000, peak / (1024 * 1024)
+
+
+def main(args):
+	converter = load_converter()
+	rounds = 5
+	if args and args[-1].isdigit():
+		rounds = int(args.pop())
+	text = read_content(args[0], converter) if args else generate_content()
+	print(f"content: {len(text) / (1024 * 1024):.1f} M characters")
+
+	for name, extract in (('previous', previous_extract), ('current', converter._extract_text_from_html)):
+		elapsed, peak = measure(extract, text, rounds)
+		print(f"{name + ':':10}{elapsed:8.1f} ms  peak {peak:6.1f} MB")
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Benchmark of the TenjiTexter import and its first conversion
+#
+# Usage: python benchmarks/tenji_import.py [rounds]
+#
+# Each round starts a fresh interpreter, so the numbers include loading the
+# modules from their .pyc files as NVDA would. "import" is the cost paid by
+# anything importing TenjiTexter; "first conversion" adds loading the
+# generated tables. "source tables" is what the import cost when the
+# inverted tables were built from the OrderedDict sources at import time.
+
+import os
+import sys
+import json
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGIN_DIR = os.path.join(ROOT_DIR, 'sapieLibrary', 'globalPlugins')
+
+# sapieLibrary/__init__.py needs NVDA, so the package is created bare
+MEASURE = r'''
+import sys, time, json, types, collections
+package = types.ModuleType('sapieLibrary')
+package.__path__ = [{package_dir!r}]
+sys.modules['sapieLibrary'] = package
+start = time.perf_counter()
+if {mode!r} == 'source':
+    from sapieLibrary.TenjiTexter import Japanese_Table, Info_Table, English_Table
+    for module in (Japanese_Table, Info_Table, English_Table):
+        for name in dir(module):
+            table = getattr(module, name)
+            if isinstance(table, collections.OrderedDict):
+                collections.OrderedDict([(v, k) for k, v in table.items()])
+    imported = time.perf_counter()
+    converted = imported
+else:
+    from sapieLibrary import TenjiTexter
+    imported = time.perf_counter()
+    TenjiTexter.KanaConverter().convert("⠁⠃⠉")
+    converted = time.perf_counter()
+print(json.dumps([imported - start, converted - start]))
+'''
+
+
+def run(mode):
+	"""Time one import in a fresh interpreter"""
+	code = MEASURE.format(package_dir=os.path.join(PLUGIN_DIR, 'sapieLibrary'), mode=mode)
+	return json.loads(subprocess.check_output([sys.executable, '-c', code]))
+
+
+def best(mode, rounds):
+	"""Best times of several rounds, in milliseconds"""
+	times = [run(mode) for _ in range(rounds)]
+	return [min(t[i] for t in times) * 1000 for i in range(2)]
+
+
+def main(rounds):
+	# Warm the .pyc files
+	run('compiled')
+	run('source')
+
+	source_import, _ = best('source', rounds)
+	compiled_import, compiled_first = best('compiled', rounds)
+	print(f"source tables:    {source_import:7.2f} ms")
+	print(f"import:           {compiled_import:7.2f} ms")
+	print(f"first conversion: {compiled_first:7.2f} ms (import included)")
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
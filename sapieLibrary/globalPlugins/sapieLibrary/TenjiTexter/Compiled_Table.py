@@ -0,0 +1,964 @@
+# -----------------------------------------------------------------------------
+#  TenjiTexter
+#  Generated by tools/generate_tenji_tables.py - do not edit.
+#  Edit Japanese_Table.py, Info_Table.py or English_Table.py and run the
+#  script again.
+# -----------------------------------------------------------------------------
+
+SOURCE_DIGEST = 'ba3302415b98c249a02f31ea2a79223c4f977ef4'
+
+
+j01 = {
+    '⠁': 'あ',
+    '⠃': 'い',
+    '⠉': 'う',
+    '⠋': 'え',
+    '⠊': 'お',
+    '⠡': 'か',
+    '⠣': 'き',
+    '⠩': 'く',
+    '⠫': 'け',
+    '⠪': 'こ',
+    '⠱': 'さ',
+    '⠳': 'し',
+    '⠹': 'す',
+    '⠻': 'せ',
+    '⠺': 'そ',
+    '⠕': 'た',
+    '⠗': 'ち',
+    '⠝': 'つ',
+    '⠟': 'て',
+    '⠞': 'と',
+    '⠅': 'な',
+    '⠇': 'に',
+    '⠍': 'ぬ',
+    '⠏': 'ね',
+    '⠎': 'の',
+    '⠥': 'は',
+    '⠧': 'ひ',
+    '⠭': 'ふ',
+    '⠯': 'へ',
+    '⠮': 'ほ',
+    '⠵': 'ま',
+    '⠷': 'み',
+    '⠽': 'む',
+    '⠿': 'め',
+    '⠾': 'も',
+    '⠌': 'や',
+    '⠬': 'ゆ',
+    '⠜': 'よ',
+    '⠑': 'ら',
+    '⠓': 'り',
+    '⠙': 'る',
+    '⠛': 'れ',
+    '⠚': 'ろ',
+    '⠄': 'わ',
+    '⠆': '',
+    '⠢': '！',
+    '⠔': 'を',
+    '⠴': 'ん',
+    '⠒': 'ー',
+    '⠰': '、',
+    '⠲': '。',
+    '⠶': '｜',
+    '⠂': 'っ',
+    '⠤': '＿',
+    '⠀': '\u3000',
+    '\r': '\r',
+    '\n': '\n',
+}
+
+
+j02 = {
+    '⠐⠉': 'ゔ',
+    '⠐⠡': 'が',
+    '⠐⠣': 'ぎ',
+    '⠐⠩': 'ぐ',
+    '⠐⠫': 'げ',
+    '⠐⠪': 'ご',
+    '⠐⠱': 'ざ',
+    '⠐⠳': 'じ',
+    '⠐⠹': 'ず',
+    '⠐⠻': 'ぜ',
+    '⠐⠺': 'ぞ',
+    '⠐⠕': 'だ',
+    '⠐⠗': 'ぢ',
+    '⠐⠝': 'づ',
+    '⠐⠟': 'で',
+    '⠐⠞': 'ど',
+    '⠐⠥': 'ば',
+    '⠐⠧': 'び',
+    '⠐⠭': 'ぶ',
+    '⠐⠯': 'べ',
+    '⠐⠮': 'ぼ',
+    '⠐⠵': '○',
+    '⠐⠿': '×',
+    '⠐⠤': '【',
+    '⠐⠀': '・',
+}
+
+
+j03 = {
+    '⠠⠥': 'ぱ',
+    '⠠⠧': 'ぴ',
+    '⠠⠭': 'ぷ',
+    '⠠⠯': 'ぺ',
+    '⠠⠮': 'ぽ',
+}
+
+
+j04 = {
+    '⠈⠋': 'いぇ',
+    '⠈⠡': 'きゃ',
+    '⠈⠩': 'きゅ',
+    '⠈⠫': 'きぇ',
+    '⠈⠪': 'きょ',
+    '⠈⠱': 'しゃ',
+    '⠈⠳': 'すぃ',
+    '⠈⠹': 'しゅ',
+    '⠈⠻': 'しぇ',
+    '⠈⠺': 'しょ',
+    '⠈⠕': 'ちゃ',
+    '⠈⠗': 'てぃ',
+    '⠈⠝': 'ちゅ',
+    '⠈⠟': 'ちぇ',
+    '⠈⠞': 'ちょ',
+    '⠈⠅': 'にゃ',
+    '⠈⠍': 'にゅ',
+    '⠈⠏': 'にぇ',
+    '⠈⠎': 'にょ',
+    '⠈⠥': 'ひゃ',
+    '⠈⠭': 'ひゅ',
+    '⠈⠯': 'ひぇ',
+    '⠈⠮': 'ひょ',
+    '⠈⠵': 'みゃ',
+    '⠈⠽': 'みゅ',
+    '⠈⠿': 'めぇ',
+    '⠈⠾': 'みょ',
+    '⠈⠑': 'りゃ',
+    '⠈⠙': 'りゅ',
+    '⠈⠛': 'りぇ',
+    '⠈⠚': 'りょ',
+}
+
+
+j05 = {
+    '⠘⠡': 'ぎゃ',
+    '⠘⠩': 'ぎゅ',
+    '⠘⠫': 'ぎぇ',
+    '⠘⠪': 'ぎょ',
+    '⠘⠱': 'じゃ',
+    '⠘⠳': 'ずぃ',
+    '⠘⠹': 'じゅ',
+    '⠘⠻': 'じぇ',
+    '⠘⠺': 'じょ',
+    '⠘⠕': 'ぢゃ',
+    '⠘⠗': 'でぃ',
+    '⠘⠝': 'ぢゅ',
+    '⠘⠟': 'ぢぇ',
+    '⠘⠞': 'ぢょ',
+    '⠘⠥': 'びゃ',
+    '⠘⠭': 'びゅ',
+    '⠘⠯': 'びぇ',
+    '⠘⠮': 'びょ',
+}
+
+
+j06 = {
+    '⠨⠝': 'てゅ',
+    '⠨⠥': 'ぴゃ',
+    '⠨⠭': 'ぴゅ',
+    '⠨⠮': 'ぴょ',
+    '⠨⠬': 'ふゅ',
+    '⠨⠜': 'ふょ',
+}
+
+
+j07 = {
+    '⠸⠝': 'でゅ',
+    '⠸⠬': 'ゔゅ',
+    '⠸⠜': 'ゔょ',
+}
+
+
+j08 = {
+    '⠢⠁': 'うぁ',
+    '⠢⠃': 'うぃ',
+    '⠢⠋': 'うぇ',
+    '⠢⠊': 'うぉ',
+    '⠢⠡': 'くぁ',
+    '⠢⠣': 'くぃ',
+    '⠢⠫': 'くぇ',
+    '⠢⠪': 'くぉ',
+    '⠢⠕': 'つぁ',
+    '⠢⠗': 'つぃ',
+    '⠢⠝': 'とぅ',
+    '⠢⠟': 'つぇ',
+    '⠢⠞': 'つぉ',
+    '⠢⠥': 'ふぁ',
+    '⠢⠧': 'ふぃ',
+    '⠢⠯': 'ふぇ',
+    '⠢⠮': 'ふぉ',
+}
+
+
+j09 = {
+    '⠲⠡': 'ぐぁ',
+    '⠲⠣': 'ぐぃ',
+    '⠲⠫': 'ぐぇ',
+    '⠲⠪': 'ぐぉ',
+    '⠲⠕': 'づぁ',
+    '⠲⠗': 'づぃ',
+    '⠲⠝': 'どぅ',
+    '⠲⠟': 'づぇ',
+    '⠲⠞': 'づぉ',
+    '⠲⠥': 'ゔぁ',
+    '⠲⠧': 'ゔぃ',
+    '⠲⠯': 'ゔぇ',
+    '⠲⠮': 'ゔぉ',
+}
+
+
+j10 = {
+    '⠁': '１',
+    '⠃': '２',
+    '⠉': '３',
+    '⠋': '６',
+    '⠊': '９',
+    '⠑': '５',
+    '⠓': '８',
+    '⠙': '４',
+    '⠛': '７',
+    '⠚': '０',
+    '⠂': '．',
+    '⠼': '、',
+    '⠀': '\u3000',
+}
+
+
+j11 = {
+    '⠁': 'Ａ',
+    '⠃': 'Ｂ',
+    '⠉': 'Ｃ',
+    '⠙': 'Ｄ',
+    '⠑': 'Ｅ',
+    '⠋': 'Ｆ',
+    '⠛': 'Ｇ',
+    '⠓': 'Ｈ',
+    '⠊': 'Ｉ',
+    '⠚': 'Ｊ',
+    '⠅': 'Ｋ',
+    '⠇': 'Ｌ',
+    '⠍': 'Ｍ',
+    '⠝': 'Ｎ',
+    '⠕': 'Ｏ',
+    '⠏': 'Ｐ',
+    '⠟': 'Ｑ',
+    '⠗': 'Ｒ',
+    '⠎': 'Ｓ',
+    '⠞': 'Ｔ',
+    '⠥': 'Ｕ',
+    '⠧': 'Ｖ',
+    '⠺': 'Ｗ',
+    '⠭': 'Ｘ',
+    '⠽': 'Ｙ',
+    '⠵': 'Ｚ',
+    '\r': '\r',
+    '\n': '\n',
+    '⠰': '',
+}
+
+
+j12 = {
+    '⠁': 'ａ',
+    '⠃': 'ｂ',
+    '⠉': 'ｃ',
+    '⠙': 'ｄ',
+    '⠑': 'ｅ',
+    '⠋': 'ｆ',
+    '⠛': 'ｇ',
+    '⠓': 'ｈ',
+    '⠊': 'ｉ',
+    '⠚': 'ｊ',
+    '⠅': 'ｋ',
+    '⠇': 'ｌ',
+    '⠍': 'ｍ',
+    '⠝': 'ｎ',
+    '⠕': 'ｏ',
+    '⠏': 'ｐ',
+    '⠟': 'ｑ',
+    '⠗': 'ｒ',
+    '⠎': 'ｓ',
+    '⠞': 'ｔ',
+    '⠥': 'ｕ',
+    '⠧': 'ｖ',
+    '⠺': 'ｗ',
+    '⠭': 'ｘ',
+    '⠽': 'ｙ',
+    '⠵': 'ｚ',
+    '\r': '\r',
+    '\n': '\n',
+    '⠰': '',
+}
+
+
+i01 = {
+    '⠁': 'A',
+    '⠃': 'B',
+    '⠉': 'C',
+    '⠙': 'D',
+    '⠑': 'E',
+    '⠋': 'F',
+    '⠛': 'G',
+    '⠓': 'H',
+    '⠊': 'I',
+    '⠚': 'J',
+    '⠅': 'K',
+    '⠇': 'L',
+    '⠍': 'M',
+    '⠝': 'N',
+    '⠕': 'O',
+    '⠏': 'P',
+    '⠟': 'Q',
+    '⠗': 'R',
+    '⠎': 'S',
+    '⠞': 'T',
+    '⠥': 'U',
+    '⠧': 'V',
+    '⠺': 'W',
+    '⠭': 'X',
+    '⠽': 'Y',
+    '⠵': 'Z',
+    '⠀': '\u3000',
+    '\r': '\r',
+    '\n': '\n',
+    '⠂': ',',
+    '⠲': '.',
+    '⠆': ';',
+    '⠖': '!',
+    '⠪': '@',
+    '⠩': '#',
+    '⠫': '\\',
+    '⠹': '$',
+    '⠻': '%',
+    '⠯': '&',
+    '⠡': '*',
+    '⠳': '|',
+    '⠬': '+',
+    '⠤': '-',
+    '⠌': '/',
+    '⠶': '"',
+    '⠄': "'",
+    '⠘': '^',
+    '⠦': '(',
+    '⠴': ')',
+    '⠣': '{',
+    '⠜': '}',
+    '⠷': '[',
+    '⠾': ']',
+    '⠐⠂': ':',
+    '⠐⠦': '?',
+    '⠒⠒': '=',
+    '⠔⠔': '<',
+    '⠢⠢': '>',
+    '⠐⠑': '`',
+    '⠐⠤': '_',
+    '⠐⠉': '~',
+}
+
+
+i02 = {
+    '⠁': 'a',
+    '⠃': 'b',
+    '⠉': 'c',
+    '⠙': 'd',
+    '⠑': 'e',
+    '⠋': 'f',
+    '⠛': 'g',
+    '⠓': 'h',
+    '⠊': 'i',
+    '⠚': 'j',
+    '⠅': 'k',
+    '⠇': 'l',
+    '⠍': 'm',
+    '⠝': 'n',
+    '⠕': 'o',
+    '⠏': 'p',
+    '⠟': 'q',
+    '⠗': 'r',
+    '⠎': 's',
+    '⠞': 't',
+    '⠥': 'u',
+    '⠧': 'v',
+    '⠺': 'w',
+    '⠭': 'x',
+    '⠽': 'y',
+    '⠵': 'z',
+    '⠀': '\u3000',
+    '\n': '',
+    '\n⠀': '\r\n\u3000',
+    '⠂': ',',
+    '⠲': '.',
+    '⠆': ';',
+    '⠖': '!',
+    '⠪': '@',
+    '⠩': '#',
+    '⠫': '\\',
+    '⠹': '$',
+    '⠻': '%',
+    '⠯': '&',
+    '⠡': '*',
+    '⠳': '|',
+    '⠬': '+',
+    '⠤': '-',
+    '⠌': '/',
+    '⠶': '"',
+    '⠄': "'",
+    '⠘': '^',
+    '⠦': '(',
+    '⠴': ')',
+    '⠣': '{',
+    '⠜': '}',
+    '⠷': '[',
+    '⠾': ']',
+    '⠐⠂': ':',
+    '⠐⠦': '?',
+    '⠒⠒': '=',
+    '⠔⠔': '<',
+    '⠢⠢': '>',
+    '⠐⠑': '`',
+    '⠐⠤': '_',
+    '⠐⠉': '~',
+}
+
+
+i03 = {
+    '⠁': '1',
+    '⠃': '2',
+    '⠉': '3',
+    '⠙': '4',
+    '⠑': '5',
+    '⠋': '6',
+    '⠛': '7',
+    '⠓': '8',
+    '⠊': '9',
+    '⠚': '0',
+    '⠂': '．',
+}
+
+
+i04 = {
+    '⠂': ',',
+    '⠲': '.',
+    '⠐⠂': ':',
+    '⠆': ';',
+    '⠖': '!',
+    '⠐⠦': '?',
+    '⠪': '@',
+    '⠩': '#',
+    '⠫': '\\',
+    '⠹': '$',
+    '⠻': '%',
+    '⠯': '&',
+    '⠡': '*',
+    '⠳': '|',
+    '⠬': '+',
+    '⠤': '-',
+    '⠌': '/',
+    '⠒⠒': '=',
+    '⠔⠔': '<',
+    '⠢⠢': '>',
+    '⠶': '"',
+    '⠄': "'",
+    '⠘': '^',
+    '⠐⠑': '`',
+    '⠐⠤': '_',
+    '⠐⠉': '~',
+    '⠦': '(',
+    '⠴': ')',
+    '⠣': '{',
+    '⠜': '}',
+    '⠷': '[',
+    '⠾': ']',
+}
+
+
+i05 = {
+    '⠁': 'ｱ',
+    '⠃': 'ｲ',
+    '⠉': 'ｳ',
+    '⠋': 'ｴ',
+    '⠊': 'ｵ',
+    '⠡': 'ｶ',
+    '⠣': 'ｷ',
+    '⠩': 'ｸ',
+    '⠫': 'ｹ',
+    '⠪': 'ｺ',
+    '⠱': 'ｻ',
+    '⠳': 'ｼ',
+    '⠹': 'ｽ',
+    '⠻': 'ｾ',
+    '⠺': 'ｿ',
+    '⠕': 'ﾀ',
+    '⠗': 'ﾁ',
+    '⠝': 'ﾂ',
+    '⠟': 'ﾃ',
+    '⠞': 'ﾄ',
+    '⠅': 'ﾅ',
+    '⠇': 'ﾆ',
+    '⠍': 'ﾇ',
+    '⠏': 'ﾈ',
+    '⠎': 'ﾉ',
+    '⠥': 'ﾊ',
+    '⠧': 'ﾋ',
+    '⠭': 'ﾌ',
+    '⠯': 'ﾍ',
+    '⠮': 'ﾎ',
+    '⠵': 'ﾏ',
+    '⠷': 'ﾐ',
+    '⠽': 'ﾑ',
+    '⠿': 'ﾒ',
+    '⠾': 'ﾓ',
+    '⠌': 'ﾔ',
+    '⠬': 'ﾕ',
+    '⠜': 'ﾖ',
+    '⠑': 'ﾗ',
+    '⠓': 'ﾘ',
+    '⠙': 'ﾙ',
+    '⠛': 'ﾚ',
+    '⠚': 'ﾛ',
+    '⠄': 'ﾜ',
+    '⠴': 'ﾝ',
+    '⠔': 'ｦ',
+    '⠂': 'ﾞ',
+    '⠆': 'ﾟ',
+    '⠘⠁': 'ｧ',
+    '⠘⠃': 'ｨ',
+    '⠘⠉': 'ｩ',
+    '⠘⠋': 'ｪ',
+    '⠘⠊': 'ｫ',
+    '⠘⠌': 'ｬ',
+    '⠘⠬': 'ｭ',
+    '⠘⠜': 'ｮ',
+    '⠘⠝': 'ｯ',
+}
+
+
+i06 = {
+    '⠠': '＜単独大文字符＞',
+    '⠰': '＜小文字フラグ＞',
+    '⠼': '＜数字フラグ＞',
+    '⠨': '＜仮名フラグ＞',
+    '⠠⠠': '＜連続大文字符＞',
+    '⠐': '＜仮名記号遷移符＞',
+}
+
+
+e01 = {
+    '⠁': 'A',
+    '⠃': 'B',
+    '⠉': 'C',
+    '⠙': 'D',
+    '⠑': 'E',
+    '⠋': 'F',
+    '⠛': 'G',
+    '⠓': 'H',
+    '⠊': 'I',
+    '⠚': 'J',
+    '⠅': 'K',
+    '⠇': 'L',
+    '⠍': 'M',
+    '⠝': 'N',
+    '⠕': 'O',
+    '⠏': 'P',
+    '⠟': 'Q',
+    '⠗': 'R',
+    '⠎': 'S',
+    '⠞': 'T',
+    '⠥': 'U',
+    '⠧': 'V',
+    '⠺': 'W',
+    '⠭': 'X',
+    '⠽': 'Y',
+    '⠵': 'Z',
+    '\r': '\r',
+    '\n': '\n',
+}
+
+
+e02 = {
+    '⠁': 'a',
+    '⠃': 'b',
+    '⠉': 'c',
+    '⠙': 'd',
+    '⠑': 'e',
+    '⠋': 'f',
+    '⠛': 'g',
+    '⠓': 'h',
+    '⠊': 'i',
+    '⠚': 'j',
+    '⠅': 'k',
+    '⠇': 'l',
+    '⠍': 'm',
+    '⠝': 'n',
+    '⠕': 'o',
+    '⠏': 'p',
+    '⠟': 'q',
+    '⠗': 'r',
+    '⠎': 's',
+    '⠞': 't',
+    '⠥': 'u',
+    '⠧': 'v',
+    '⠺': 'w',
+    '⠭': 'x',
+    '⠽': 'y',
+    '⠵': 'z',
+    '\r': '\r',
+    '\n': '\n',
+}
+
+
+e03 = {
+    '⠀': ' ',
+    '⠂': ',',
+    '⠆': ';',
+    '⠒': ':',
+    '⠲': '.',
+    '⠖': '!',
+    '⠶': '|',
+    '⠦': '?',
+    '⠔': '*',
+    '⠄': "'",
+    '⠤': '-',
+}
+
+
+e04 = {
+    '⠷': 'à',
+    '⠡': 'â',
+    '⠜': 'ä/æ',
+    '⠯': 'ç',
+    '⠮': 'è',
+    '⠿': 'é',
+    '⠣': 'ê',
+    '⠫': 'ë',
+    '⠌': 'ì',
+    '⠩': 'î',
+    '⠻': 'ï',
+    '⠬': 'ò',
+    '⠹': 'ô',
+    '⠪': 'ö/œ',
+    '⠾': 'ù',
+    '⠱': 'û',
+    '⠳': 'ü',
+}
+
+
+e05 = {
+    '⠰': '文字',
+    '⠠': '大文字',
+    '⠼': '数',
+    '⠈': '数見出',
+    '⠘': '文見',
+    '⠨': '斜体',
+}
+
+
+e06 = {
+    '⠃': 'but',
+    '⠉': 'can',
+    '⠙': 'do',
+    '⠑': 'every',
+    '⠋': 'from',
+    '⠛': 'go',
+    '⠓': 'have',
+    '⠚': 'just',
+    '⠅': 'knowledge',
+    '⠇': 'like',
+    '⠍': 'more',
+    '⠝': 'not',
+    '⠏': 'people',
+    '⠟': 'quite',
+    '⠗': 'rather',
+    '⠎': 'so',
+    '⠞': 'that',
+    '⠥': 'us',
+    '⠧': 'very',
+    '⠺': 'will',
+    '⠭': 'it',
+    '⠽': 'you',
+    '⠵': 'as',
+    '⠯': 'and',
+    '⠿': 'for',
+    '⠷': 'of',
+    '⠮': 'the',
+    '⠾': 'with',
+    '⠡': 'child/ch',
+    '⠣': 'gh',
+    '⠩': 'shall/sh',
+    '⠹': 'this/th',
+    '⠱': 'which/wh',
+    '⠫': 'ed',
+    '⠻': 'er',
+    '⠳': 'out/ou',
+    '⠪': 'ow',
+    '⠆': 'bb',
+    '⠒': 'cc',
+    '⠲': 'dd',
+    '⠶': 'gg/were',
+    '⠢': 'en',
+    '⠔': 'in',
+    '⠌': 'st',
+    '⠬': 'ing',
+    '⠜': 'ar',
+}
+
+
+e07 = {
+    '⠸⠉': 'cannot',
+    '⠐⠙': 'day',
+    '⠨⠙': 'ound',
+    '⠐⠑': 'ever',
+    '⠨⠑': 'ance',
+    '⠰⠑': 'ence',
+    '⠐⠋': 'father',
+    '⠰⠛': 'ong',
+    '⠐⠓': 'here',
+    '⠸⠓': 'had',
+    '⠐⠅': 'know',
+    '⠐⠇': 'lord',
+    '⠰⠇': 'ful',
+    '⠐⠍': 'mother',
+    '⠸⠍': 'many',
+    '⠐⠝': 'name',
+    '⠨⠝': 'sion',
+    '⠰⠝': 'tion',
+    '⠠⠝': 'ation',
+    '⠐⠕': 'one',
+    '⠐⠏': 'part',
+    '⠐⠟': 'question',
+    '⠐⠗': 'right',
+    '⠐⠎': 'some',
+    '⠨⠎': 'less',
+    '⠰⠎': 'ness',
+    '⠸⠎': 'spirit',
+    '⠐⠞': 'time',
+    '⠨⠞': 'ount',
+    '⠰⠞': 'ment',
+    '⠐⠥': 'under',
+    '⠘⠥': 'upon',
+    '⠐⠺': 'work',
+    '⠘⠺': 'word',
+    '⠸⠺': 'world',
+    '⠐⠽': 'young',
+    '⠰⠽': 'ity',
+    '⠠⠽': 'ally',
+    '⠐⠮': 'there',
+    '⠰⠮': 'these',
+    '⠸⠮': 'their',
+    '⠐⠡': 'character',
+    '⠐⠹': 'through',
+    '⠘⠹': 'those',
+    '⠐⠱': 'where',
+    '⠘⠱': 'whose',
+    '⠐⠳': 'ought',
+}
+
+
+PAIR_TABLES = {
+    '⠐': {
+        '⠉': 'ゔ',
+        '⠡': 'が',
+        '⠣': 'ぎ',
+        '⠩': 'ぐ',
+        '⠫': 'げ',
+        '⠪': 'ご',
+        '⠱': 'ざ',
+        '⠳': 'じ',
+        '⠹': 'ず',
+        '⠻': 'ぜ',
+        '⠺': 'ぞ',
+        '⠕': 'だ',
+        '⠗': 'ぢ',
+        '⠝': 'づ',
+        '⠟': 'で',
+        '⠞': 'ど',
+        '⠥': 'ば',
+        '⠧': 'び',
+        '⠭': 'ぶ',
+        '⠯': 'べ',
+        '⠮': 'ぼ',
+        '⠵': '○',
+        '⠿': '×',
+        '⠤': '【',
+        '⠀': '・',
+    },
+    '⠠': {
+        '⠥': 'ぱ',
+        '⠧': 'ぴ',
+        '⠭': 'ぷ',
+        '⠯': 'ぺ',
+        '⠮': 'ぽ',
+    },
+    '⠈': {
+        '⠋': 'いぇ',
+        '⠡': 'きゃ',
+        '⠩': 'きゅ',
+        '⠫': 'きぇ',
+        '⠪': 'きょ',
+        '⠱': 'しゃ',
+        '⠳': 'すぃ',
+        '⠹': 'しゅ',
+        '⠻': 'しぇ',
+        '⠺': 'しょ',
+        '⠕': 'ちゃ',
+        '⠗': 'てぃ',
+        '⠝': 'ちゅ',
+        '⠟': 'ちぇ',
+        '⠞': 'ちょ',
+        '⠅': 'にゃ',
+        '⠍': 'にゅ',
+        '⠏': 'にぇ',
+        '⠎': 'にょ',
+        '⠥': 'ひゃ',
+        '⠭': 'ひゅ',
+        '⠯': 'ひぇ',
+        '⠮': 'ひょ',
+        '⠵': 'みゃ',
+        '⠽': 'みゅ',
+        '⠿': 'めぇ',
+        '⠾': 'みょ',
+        '⠑': 'りゃ',
+        '⠙': 'りゅ',
+        '⠛': 'りぇ',
+        '⠚': 'りょ',
+    },
+    '⠘': {
+        '⠡': 'ぎゃ',
+        '⠩': 'ぎゅ',
+        '⠫': 'ぎぇ',
+        '⠪': 'ぎょ',
+        '⠱': 'じゃ',
+        '⠳': 'ずぃ',
+        '⠹': 'じゅ',
+        '⠻': 'じぇ',
+        '⠺': 'じょ',
+        '⠕': 'ぢゃ',
+        '⠗': 'でぃ',
+        '⠝': 'ぢゅ',
+        '⠟': 'ぢぇ',
+        '⠞': 'ぢょ',
+        '⠥': 'びゃ',
+        '⠭': 'びゅ',
+        '⠯': 'びぇ',
+        '⠮': 'びょ',
+    },
+    '⠨': {
+        '⠝': 'てゅ',
+        '⠥': 'ぴゃ',
+        '⠭': 'ぴゅ',
+        '⠮': 'ぴょ',
+        '⠬': 'ふゅ',
+        '⠜': 'ふょ',
+    },
+    '⠸': {
+        '⠝': 'でゅ',
+        '⠬': 'ゔゅ',
+        '⠜': 'ゔょ',
+    },
+    '⠢': {
+        '⠁': 'うぁ',
+        '⠃': 'うぃ',
+        '⠋': 'うぇ',
+        '⠊': 'うぉ',
+        '⠡': 'くぁ',
+        '⠣': 'くぃ',
+        '⠫': 'くぇ',
+        '⠪': 'くぉ',
+        '⠕': 'つぁ',
+        '⠗': 'つぃ',
+        '⠝': 'とぅ',
+        '⠟': 'つぇ',
+        '⠞': 'つぉ',
+        '⠥': 'ふぁ',
+        '⠧': 'ふぃ',
+        '⠯': 'ふぇ',
+        '⠮': 'ふぉ',
+    },
+    '⠲': {
+        '⠡': 'ぐぁ',
+        '⠣': 'ぐぃ',
+        '⠫': 'ぐぇ',
+        '⠪': 'ぐぉ',
+        '⠕': 'づぁ',
+        '⠗': 'づぃ',
+        '⠝': 'どぅ',
+        '⠟': 'づぇ',
+        '⠞': 'づぉ',
+        '⠥': 'ゔぁ',
+        '⠧': 'ゔぃ',
+        '⠯': 'ゔぇ',
+        '⠮': 'ゔぉ',
+    },
+}
+
+
+J01_TRANSLATION = {
+    10241: 'あ',
+    10243: 'い',
+    10249: 'う',
+    10251: 'え',
+    10250: 'お',
+    10273: 'か',
+    10275: 'き',
+    10281: 'く',
+    10283: 'け',
+    10282: 'こ',
+    10289: 'さ',
+    10291: 'し',
+    10297: 'す',
+    10299: 'せ',
+    10298: 'そ',
+    10261: 'た',
+    10263: 'ち',
+    10269: 'つ',
+    10271: 'て',
+    10270: 'と',
+    10245: 'な',
+    10247: 'に',
+    10253: 'ぬ',
+    10255: 'ね',
+    10254: 'の',
+    10277: 'は',
+    10279: 'ひ',
+    10285: 'ふ',
+    10287: 'へ',
+    10286: 'ほ',
+    10293: 'ま',
+    10295: 'み',
+    10301: 'む',
+    10303: 'め',
+    10302: 'も',
+    10252: 'や',
+    10284: 'ゆ',
+    10268: 'よ',
+    10257: 'ら',
+    10259: 'り',
+    10265: 'る',
+    10267: 'れ',
+    10266: 'ろ',
+    10244: 'わ',
+    10246: '',
+    10274: '！',
+    10260: 'を',
+    10292: 'ん',
+    10258: 'ー',
+    10288: '、',
+    10290: '。',
+    10294: '｜',
+    10242: 'っ',
+    10276: '＿',
+    10240: '\u3000',
+    13: '\r',
+    10: '\n',
+}
@@ -1,42 +1,418 @@
 import os
+import re
 import sys
-import collections
-
-from . import English_Table
-from . import Info_Table
-from . import Japanese_Table
-from . import nabcc
-
-
-""" DocumentsViewer """
-
-j01 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j01.items()])
-j02 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j02.items()])
-j03 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j03.items()])
-j04 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j04.items()])
-j05 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j05.items()])
-j06 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j06.items()])
-j07 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j07.items()])
-j08 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j08.items()])
-j09 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j09.items()])
-j10 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j10.items()])
-j11 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j11.items()])
-j12 = collections.OrderedDict([(v, k) for k, v in Japanese_Table.j12.items()])
-
-i01 = collections.OrderedDict([(v, k) for k, v in Info_Table.i01.items()])
-i02 = collections.OrderedDict([(v, k) for k, v in Info_Table.i02.items()])
-i03 = collections.OrderedDict([(v, k) for k, v in Info_Table.i03.items()])
-i04 = collections.OrderedDict([(v, k) for k, v in Info_Table.i04.items()])
-i05 = collections.OrderedDict([(v, k) for k, v in Info_Table.i05.items()])
-i06 = collections.OrderedDict([(v, k) for k, v in Info_Table.i06.items()])
-
-e01 = collections.OrderedDict([(v, k) for k, v in English_Table.e01.items()])
-e02 = collections.OrderedDict([(v, k) for k, v in English_Table.e02.items()])
-e03 = collections.OrderedDict([(v, k) for k, v in English_Table.e03.items()])
-e04 = collections.OrderedDict([(v, k) for k, v in English_Table.e04.items()])
-e05 = collections.OrderedDict([(v, k) for k, v in English_Table.e05.items()])
-e06 = collections.OrderedDict([(v, k) for k, v in English_Table.e06.items()])
-e07 = collections.OrderedDict([(v, k) for k, v in English_Table.e07.items()])
+
+
+""" tables """
+
+# 点字 -> カナの表は tools/generate_tenji_tables.py で Compiled_Table.py に生成しておき、
+# 最初の変換で読み込む
+TABLE_NAMES = (
+    "j01", "j02", "j03", "j04", "j05", "j06", "j07", "j08", "j09", "j10", "j11", "j12",
+    "i01", "i02", "i03", "i04", "i05", "i06",
+    "e01", "e02", "e03", "e04", "e05", "e06", "e07",
+    "J01_TRANSLATION", "PAIR_TABLES", "SPECIAL_PATTERN",
+)
+
+# 点字の区切り
+SEPARATORS = ("⠀", "⠤", "\r", "\n")
+
+# 2マス目が表にないときの出力
+PAIR_FALLBACKS = {'⠲': "。", '⠢': "？", '⠐': "ッ", '⠸': "", '⠨': "", '⠘': "", '⠈': ""}
+
+# 外国語引用符の終わり
+ENG_END_MARKS = ("⠴⠀", "⠴\n", "⠴\r", "⠴⠤")
+
+_tables_loaded = False
+
+
+def load_tables():
+    """ 変換表を読み込んでモジュールの変数にする (2回目以降は何もしない) """
+    global _tables_loaded
+    if _tables_loaded:
+        return
+    from . import Compiled_Table
+    tables = {name: getattr(Compiled_Table, name) for name in TABLE_NAMES[:-1]}
+    # 一括変換できない点字 (数符、外字符、外国語引用符など)
+    tables["SPECIAL_PATTERN"] = re.compile("[⠼⠰⠦⠤⠠" + "".join(PAIR_FALLBACKS) + "]")
+    globals().update(tables)
+    _tables_loaded = True
+
+
+def __getattr__(name):
+    # TenjiTexter.j01 などを参照したときも表を読み込む
+    if name in TABLE_NAMES:
+        load_tables()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+""" KanaConverter """
+
+
+class NeedMoreBraille(Exception):
+
+    """ 変換を続けるには次の点字が必要 """
+
+
+class KanaConverter():
+
+    """
+    点字をカナに変換する
+
+    特別な処理のない点字の並びは J01_TRANSLATION で一括変換し、
+    数符・外字符・外国語引用符などは1回の走査で処理する。
+    出力はリストに追加し、最後に1回だけ連結する。
+
+    feed() で点字を分割して渡すこともできる。途中で切れた記号は
+    次の点字が届くまで保留するので、結果は一括変換と同じになる。
+    """
+
+    def __init__(self):
+        load_tables()
+        self.buff = ""
+        self.n = 0
+        self.out = []
+        self.pos = 0
+        self.final = True
+        # 保留した記号を再変換する点字の長さ
+        self.retry_at = 0
+
+    def convert(self, buff):
+        self.__init__()
+        ret = self.feed(buff, True)
+        self.__init__()
+        return ret
+
+    def feed(self, text, final=False):
+        self.buff = self.buff + text
+        self.n = len(self.buff)
+        self.final = final
+        if not final and self.n < self.retry_at:
+            return ""
+
+        self.pos = self._run(self.pos)
+
+        # 変換済みの点字を捨てる (外国語引用符のために直前の1マスは残す)
+        drop = min(self.pos, self.n) - 1
+        if drop > 0:
+            self.buff = self.buff[drop:]
+            self.n = self.n - drop
+            self.pos = self.pos - drop
+            self.retry_at = self.retry_at - drop
+        ret = "".join(self.out)
+        self.out = []
+        return ret
+
+    """ 範囲の確認 """
+
+    def _more(self, pos):
+        if pos < self.n:
+            return True
+        if self.final:
+            return False
+        raise NeedMoreBraille()
+
+    def _char(self, pos):
+        if pos < self.n or self.final:
+            return self.buff[pos]
+        raise NeedMoreBraille()
+
+    def _slice(self, start, end):
+        if end <= self.n or self.final:
+            return self.buff[start:end]
+        raise NeedMoreBraille()
+
+    """ 本文 """
+
+    def _run(self, pos):
+        buff = self.buff
+        out = self.out
+        handlers = {
+            '⠼': self._numeric,
+            '⠰': self._roma_mark,
+            '⠦': self._eng_mark,
+            '⠤': self._line_mark,
+            '⠠': self._capital_mark,
+        }
+        while pos < self.n:
+            m = SPECIAL_PATTERN.search(buff, pos)
+            end = m.start() if m else self.n
+            if end > pos:
+                out.append(buff[pos:end].translate(J01_TRANSLATION))
+            if m is None:
+                pos = end
+                break
+            ch = buff[end]
+            handler = handlers.get(ch, self._pair)
+            mark = len(out)
+            try:
+                pos = handler(end) + 1
+            except NeedMoreBraille:
+                # 記号の途中で点字が切れたので、保留中の点字が倍になってから再変換する
+                del out[mark:]
+                pos = end
+                self.retry_at = 2 * self.n - end
+                break
+        return pos
+
+    def _pair(self, pos):
+        ch = self.buff[pos]
+        value = PAIR_TABLES[ch].get(self._slice(pos + 1, pos + 2))
+        if value is not None:
+            self.out.append(value)
+            return pos + 1
+        if PAIR_FALLBACKS[ch]:
+            self.out.append(PAIR_FALLBACKS[ch])
+        return pos
+
+    def _roma_mark(self, pos):
+        ch = self._char(pos + 1)
+        if ch == '⠄':
+            self.out.append("＜")
+            pos = pos + 1
+        elif ch in SEPARATORS:
+            if ch == '⠤':
+                self.out.append("『")
+                pos = pos + 1
+            else:
+                self.out.append(j01['⠰'])
+        return self._roma(pos)
+
+    def _eng_mark(self, pos):
+        if pos == 0 and not self.final:
+            # 先頭の引用符は最後の1マスを参照するので、全体が揃うまで待つ
+            raise NeedMoreBraille()
+        return self._eng(pos, self._char(pos - 1))    # 外国語引用符処理へ
+
+    def _line_mark(self, pos):
+        ch = self._char(pos + 1)
+        if ch == '⠆':
+            self.out.append("』")
+            return pos + 1
+        elif ch == '⠂':
+            self.out.append("】")
+            return pos + 1
+        self.out.append(j01['⠤'])
+        return pos
+
+    def _capital_mark(self, pos):
+        ch = self._char(pos + 1)
+        if ch == '⠦':
+            return self._info(pos)
+        elif ch == '⠆':
+            self.out.append("＞")
+            return pos + 1
+        value = PAIR_TABLES['⠠'].get(ch)
+        if value is not None:
+            self.out.append(value)
+            return pos + 1
+        return pos
+
+    """ 数符 """
+
+    def _numeric(self, pos):
+        out = self.out
+        pos = pos + 1
+        while self._more(pos):
+            ch = self.buff[pos]
+            if ch == '⠼':
+                out.append("、")
+                break
+            if ch == "\r":
+                out.append("\r\n")
+                return pos + 1
+            value = j10.get(ch)
+            if value is None:
+                return pos - 1
+            out.append(value)
+            pos = pos + 1
+        return pos
+
+    def _numeric2(self, pos):
+        out = self.out
+        pos = pos + 1
+        while self._more(pos):
+            ch = self.buff[pos]
+            # 数符がきた場合の処理
+            if ch == '⠼':
+                out.append(",")     # カンマを出力
+            else:
+                if ch == "\r":
+                    out.append("\r\n")
+                    return pos + 1
+                value = i03.get(ch)
+                if value is None:
+                    return pos - 1
+                out.append(value)
+            pos = pos + 1
+        return pos
+
+    """ 外字符 """
+
+    def _roma(self, pos):
+        out = self.out
+        f_oomoji = 0
+        pos = pos + 1
+        while self._more(pos):
+            ch = self.buff[pos]
+            if ch == '⠠':
+                if self._char(pos + 1) == '⠠':
+                    f_oomoji = 1
+                elif f_oomoji != 1:
+                    f_oomoji = 2
+            else:
+                if ch not in j11:
+                    return pos - 1
+                if f_oomoji == 0:
+                    if ch in j12:
+                        out.append(j12[ch])
+                else:
+                    out.append(j11[ch])
+                    if f_oomoji == 2:
+                        f_oomoji = 0
+            pos = pos + 1
+        return pos
+
+    """ 情報処理用点字 """
+
+    def _info(self, pos):
+        buff = self.buff
+        out = self.out
+        f_oomoji = 0
+        pos = pos + 1  # ヘッダーコード分進める。
+        while self._more(pos):
+            ch = buff[pos]
+            if ch == '⠠':
+                ch = self._char(pos + 1)
+                if ch == '⠴':
+                    out.append(")")
+                    return pos + 1
+                elif ch == '⠠':
+                    f_oomoji = 1    # 大文字連続
+                elif f_oomoji != 1:
+                    f_oomoji = 2    # 大文字単独フラグ
+                elif ch == '⠨':
+                    f_oomoji = 3    # カナフラグ
+            elif ch == '⠼':
+                pos = self._numeric2(pos)
+            elif f_oomoji == 0:
+                x = pos
+                while self._more(x):
+                    ch = buff[x]
+                    if ch == '⠴':
+                        out.append(i02[ch])
+                        return x + 1
+                    elif ch == '⠼':
+                        x = self._numeric2(x) + 1
+                    else:
+                        value = i02.get(self._slice(x, x + 2))
+                        if value is not None:
+                            out.append(value)
+                            x = x + 2
+                        elif ch in i02:
+                            out.append(i02[ch])
+                            x = x + 1
+                        else:
+                            pos = x
+                            break
+                    pos = x
+            elif f_oomoji == 1:
+                x = pos
+                while self._more(x):
+                    ch = buff[x]
+                    if ch == '⠼':
+                        next_x = self._numeric2(x)
+                        if next_x == x:
+                            # 数字が続かない数符で先に進まない場合は終わる
+                            pos = x
+                            break
+                        x = next_x
+                    elif ch in i01:
+                        out.append(i01[ch])
+                        x = x + 1
+                    else:
+                        pos = x
+                        break
+                    pos = x
+            elif f_oomoji == 2:
+                x = pos
+                if self._more(x):   # 1回のみ
+                    ch = buff[x]
+                    if ch == '⠼':
+                        x = self._numeric2(x)
+                    elif ch in i01:
+                        out.append(i01[ch])
+                        x = x + 1
+                    pos = x
+                f_oomoji = 0
+            elif f_oomoji == 3:
+                f_oomoji = 0
+            pos = pos + 1
+        return pos
+
+    """ 外国語引用符 """
+
+    def _eng(self, pos, s_c):
+        buff = self.buff
+        out = self.out
+        xxx = "⠴"
+        if j01.get(s_c) in ("＿", "｜", "　"):
+            xxx = xxx + s_c
+        if len(xxx) == 1:
+            end_marks = (xxx,)
+        else:
+            end_marks = (xxx,) + ENG_END_MARKS
+        pos = pos + 1
+        out.append("￣")
+        if self._char(pos) == "⠠":
+            f_oomoji = 2
+            pos = pos + 1
+        else:
+            f_oomoji = 0
+        while self._more(pos):
+            ch = buff[pos]
+            if ch == '⠴':
+                if self._slice(pos, pos + len(xxx)) in end_marks:
+                    out.append("￣")
+                    return pos
+            elif f_oomoji == 0:
+                x = pos
+                while self._more(x):
+                    if self._slice(x, x + len(xxx)) in end_marks:
+                        out.append("￣")
+                        return x
+                    ch = buff[x]
+                    if ch == "⠠":
+                        f_oomoji = 2     # 大文字単独フラグ
+                        pos = x
+                        break
+                    elif ch == "⠼":
+                        x = self._numeric2(x)
+                    elif ch in e03:
+                        out.append(e03[ch])
+                    elif ch in e02:
+                        out.append(e02[ch])
+                    x = x + 1
+                    pos = x
+            elif f_oomoji == 2:
+                x = pos
+                if self._more(x):   # 一回のみ。
+                    if self._slice(x, x + len(xxx)) in end_marks:
+                        out.append("￣")
+                        return x
+                    ch = buff[x]
+                    if ch != "⠠":
+                        if ch == "⠼":
+                            x = self._numeric2(x)
+                        elif ch in e03:
+                            out.append(e03[ch])
+                        elif ch in e01:
+                            out.append(e01[ch])
+                        f_oomoji = 0
+                    pos = x
+            pos = pos + 1
+        return pos
 
 
 """
@@ -72,17 +448,66 @@ print("j12",len(j12),len(Japanese_Table.j12))
 """
 
 
+""" KanaStream """
+
+
+class KanaStream():
+
+    """
+    点字を分割して受け取り、後処理 (Cxx, Cxx2, Cxx3) まで済んだカナを順に返す
+
+    後処理の結果が次の点字で変わり得る末尾 (ッ と改行の並び) だけを保留し、
+    それより前は変換できた分からすぐに返す。
+    """
+
+    def __init__(self):
+        self.converter = KanaConverter()
+        # 後処理が確定していないカナ
+        self.tail = ""
+        # 最後に返したカナの1文字 (…ッ の判定に使う)
+        self.last = ""
+
+    def feed(self, text, final=False):
+        kana = self.tail + self.converter.feed(text, final)
+        if final:
+            cut = len(kana)
+        else:
+            cut = len(kana.rstrip("ッ\r\n"))
+        self.tail = kana[cut:]
+        if cut == 0:
+            return ""
+
+        ret = self.post_process(self.last + kana[:cut])[len(self.last):]
+        self.last = kana[cut - 1]
+        return ret
+
+    def abort(self):
+        """ 変換をやめ、まだ返していない部分を返す (残りの点字はそのまま) """
+        kana = self.post_process(self.last + self.tail)[len(self.last):]
+        rest = self.converter.buff[self.converter.pos:]
+        self.__init__()
+        return kana + rest
+
+    def post_process(self, kana):
+        kana = kana.replace("ッッ", "……").replace("…ッ", "……")   # Cxx
+        kana = kana.replace("\r\n", "\n")                        # Cxx2
+        kana = kana.replace("\n\n", "\n　　　\n")                  # Cxx3
+        return kana
+
+
 class DocumentsViewer():
 
     """ init """
 
     def __init__(self):
+        load_tables()
         self.m_Separator = ["⠀", "⠤", "\r", "\n"]
         self.buff = ""
 
     """ test """
 
     def test(self):
+        from . import English_Table
         for i in English_Table.e01.keys():
             print(i, English_Table.e01[i])
         for i in English_Table.e02.keys():
@@ -149,6 +574,7 @@ class DocumentsViewer():
     """ .BSE """
 
     def op2(self, FileName):
+        from . import nabcc
         ret = ""
         with open(FileName, mode='rb') as fin:
             content = fin.read()
@@ -255,445 +681,7 @@ class DocumentsViewer():
         return ret
 
     def katakana_conv(self):
-        pos = 0
-        wbuff = ""
-        while pos < len(self.buff):
-            ch = self.buff[pos]
-            if ch == '⠼':
-                ret, pos = self.numeric_conv(pos)
-                wbuff = wbuff + ret
-            elif ch == '⠰':
-                if self.buff[pos+1] == '⠄':
-                    wbuff = wbuff + "＜"
-                    pos = pos+1
-                elif self.buff[pos+1] in self.m_Separator:
-                    if self.buff[pos+1] == '⠤':
-                        wbuff = wbuff + "『"
-                        pos = pos+1
-                    else:
-                        if self.buff[pos] in j01:
-                            wbuff = wbuff + j01[self.buff[pos]]
-                ret, pos = self.roma_conv(pos)
-                wbuff = wbuff + ret
-            elif ch == '⠦':
-                ret, pos = self.eng_conv(pos, self.buff[pos-1])    # 外国語引用符処理へ
-                wbuff = wbuff + ret
-                # ret,pos = self.eng_conv2(pos,self.buff[pos-1])  # 外国語引用符処理へ
-            elif ch == '⠤':
-                if self.buff[pos+1] == '⠆':
-                    wbuff = wbuff + "』"
-                    pos = pos + 1
-                elif self.buff[pos+1] == '⠂':
-                    wbuff = wbuff + "】"
-                    pos = pos + 1
-                else:
-                    wbuff = wbuff + j01[self.buff[pos]]
-            elif ch == '⠒':
-                if self.buff[pos:pos+1] == '⠂':
-                    wbuff = wbuff + "ー・"
-                    pos = pos + 1
-                else:
-                    wbuff = wbuff + j01[self.buff[pos]]
-            elif ch == '⠲':
-                if self.buff[pos:pos+2] in j09:
-                    wbuff = wbuff + j09[self.buff[pos:pos+2]]
-                    pos = pos + 1
-                else:
-                    wbuff = wbuff + "。"
-            elif ch == '⠢':
-                if self.buff[pos:pos+2] in j08:
-                    wbuff = wbuff + j08[self.buff[pos:pos+2]]
-                    pos = pos + 1
-                else:
-                    wbuff = wbuff + "？"
-            elif ch == '⠸':
-                if self.buff[pos:pos+2] in j07:
-                    wbuff = wbuff + j07[self.buff[pos:pos+2]]
-                    pos = pos + 1
-            elif ch == '⠨':
-                if self.buff[pos:pos+2] in j06:
-                    wbuff = wbuff + j06[self.buff[pos:pos+2]]
-                    pos = pos + 1
-            elif ch == '⠘':
-                if self.buff[pos:pos+2] in j05:
-                    wbuff = wbuff + j05[self.buff[pos:pos+2]]
-                    pos = pos + 1
-            elif ch == '⠈':
-                if self.buff[pos:pos+2] in j04:
-                    wbuff = wbuff + j04[self.buff[pos:pos+2]]
-                    pos = pos + 1
-            elif ch == '⠠':
-                if self.buff[pos+1] == '⠦':
-                    ret, pos = self.info_conv(pos)
-                    wbuff = wbuff + ret
-                elif self.buff[pos+1] == '⠆':
-                    wbuff = wbuff + "＞"
-                    pos = pos + 1
-                elif self.buff[pos:pos+2] in j03:
-                    wbuff = wbuff + j03[self.buff[pos:pos+2]]
-                    pos = pos + 1
-            elif ch == '⠐':
-                if self.buff[pos:pos+2] in j02:
-                    wbuff = wbuff + j02[self.buff[pos:pos+2]]
-                    pos = pos + 1
-                else:
-                    wbuff = wbuff + "ッ"
-            elif self.buff[pos] in j01:
-                wbuff = wbuff + j01[self.buff[pos]]
-            else:
-                wbuff = wbuff + self.buff[pos]
-            pos = pos + 1
-        return wbuff
-
-    def numeric_conv(self, pos):
-        wbuff = ""
-        pos = pos+1
-        while(pos < len(self.buff)):
-            ch = self.buff[pos]
-            if ch == '⠼':
-                wbuff = wbuff + "、"
-                break
-            if self.buff[pos] == "\r":
-                pos = pos + 1
-                wbuff = wbuff + "\r\n"
-                return wbuff, pos
-            if self.buff[pos] not in j10:
-                pos = pos - 1
-                return wbuff, pos
-            else:
-                wbuff = wbuff + j10[self.buff[pos]]
-            pos = pos + 1
-        return wbuff, pos
-
-    def numeric2_conv(self, pos):
-        wbuff = ""
-        f_hankaku = True
-        pos = pos + 1
-        while(pos < len(self.buff)):
-            ch = self.buff[pos]
-            # 数符がきた場合の処理
-            if ch == '⠼':
-                if f_hankaku:
-                    wbuff = wbuff + ","     # カンマを出力
-                else:
-                    wbuff = wbuff + "、"    # カンマを出力
-            else:
-                if self.buff[pos] == "\r":
-                    pos = pos + 1
-                    wbuff = wbuff+"\r\n"
-                    return wbuff, pos
-                elif self.buff[pos] not in i03:
-                    pos = pos - 1
-                    return wbuff, pos
-                if f_hankaku:
-                    if self.buff[pos] in i03:
-                        wbuff = wbuff + i03[self.buff[pos]]
-                else:
-                    if self.buff[pos] in j10:
-                        wbuff = wbuff + j10[self.buff[pos]]
-            pos = pos + 1
-        return wbuff, pos
-
-    def roma_conv(self, pos):
-        wbuff = ""
-        f_oomoji = 0
-        pos = pos + 1
-        while(pos < len(self.buff)):
-            ch = self.buff[pos]
-            if ch == '⠠':
-                if self.buff[pos+1] == '⠠':
-                    f_oomoji = 1
-                elif f_oomoji != 1:
-                    f_oomoji = 2
-            else:
-                if self.buff[pos] not in j11:
-                    pos = pos - 1
-                    return wbuff, pos
-                if f_oomoji == 0:
-                    if self.buff[pos] in j12:
-                        wbuff = wbuff + j12[self.buff[pos]]
-                elif f_oomoji == 1:
-                    if self.buff[pos] in j11:
-                        wbuff = wbuff + j11[self.buff[pos]]
-                elif f_oomoji == 2:
-                    if self.buff[pos] in j11:
-                        wbuff = wbuff + j11[self.buff[pos]]
-                    f_oomoji = 0
-            pos = pos + 1
-        return wbuff, pos
-
-    def info_conv(self, pos):
-        wbuff = ""
-        f_oomoji = 0
-        pos = pos + 1  # ヘッダーコード分進める。
-        while(pos < len(self.buff)):
-            ch = self.buff[pos]
-            if ch == '⠠':
-                if self.buff[pos+1] == '⠴':
-                    pos = pos + 1
-                    wbuff = wbuff + ")"
-                    return wbuff, pos
-                elif self.buff[pos+1] == '⠠':
-                    f_oomoji = 1    # 大文字連続
-                elif f_oomoji != 1:
-                    f_oomoji = 2    # 大文字単独フラグ
-                elif self.buff[pos+1] == '⠨':
-                    f_oomoji = 3    # カナフラグ
-            elif ch == '⠼':
-                ret, pos = self.numeric2_conv(pos)
-                wbuff = wbuff + ret
-            else:
-                if f_oomoji == 0:
-                    x = pos
-                    # for x in range(pos,len(self.buff)):
-                    while(x < len(self.buff)):
-                        if self.buff[x:x+1] == "⠠⠴":
-                            pos = x - 1
-                            # break
-                        elif self.buff[x] == '⠴':
-                            wbuff = wbuff + i02[self.buff[x]]
-                            x = x + 1
-                            pos = x
-                            return wbuff, pos
-                        elif self.buff[x] == "⠼":
-                            ret, x = self.numeric2_conv(x)
-                            wbuff = wbuff + ret
-                            x = x + 1
-                        elif self.buff[x:x+2] in i02:
-                            wbuff = wbuff + i02[self.buff[x:x+2]]  # '⠂'
-                            x = x + 2
-                        elif self.buff[x:x+1] in i02:
-                            wbuff = wbuff + i02[self.buff[x:x+1]]  # '⠂'
-                            x = x + 1
-                        elif self.buff[x] in i02:
-                            wbuff = wbuff + i02[self.buff[x]]
-                        else:
-                            pos = x
-                            break
-                        pos = x
-
-                elif f_oomoji == 1:
-                    x = pos
-                    # for x in range(pos,len(self.buff)):
-                    while(x < len(self.buff)):
-                        if self.buff[x:x+1] == "⠠⠴":
-                            pos = x - 1
-                            break
-                        elif self.buff[x] == "⠼":
-                            ret, x = self.numeric2_conv(x)
-                            wbuff = wbuff + ret
-                        elif self.buff[x:x+1] in i01:
-                            wbuff = wbuff + i01[self.buff[x:x+1]]
-                            x = x + 1
-                        elif self.buff[x] in i01:
-                            wbuff = wbuff + i01[self.buff[x]]
-                        else:
-                            pos = x
-                            break
-                        pos = x
-
-                elif f_oomoji == 2:
-                    x = pos
-                    # for x in range(pos,len(self.buff)):
-                    while(x < len(self.buff)):
-                        if self.buff[x:x+1] == "⠠⠴":
-                            pos = x - 1
-                            break
-                        elif self.buff[x] == "⠼":
-                            ret, x = self.numeric2_conv(x)
-                            wbuff = wbuff + ret
-                        elif self.buff[x:x+1] in i01:
-                            wbuff = wbuff + i01[self.buff[x:x+1]]
-                            x = x + 1
-                        elif self.buff[x] in i01:
-                            wbuff = wbuff + i01[self.buff[x]]
-                        else:
-                            pos = x
-                            break
-                        pos = x
-                        break  # 1回のみ
-                    f_oomoji = 0
-                elif f_oomoji == 3:
-                    f_oomoji = 0
-            pos = pos + 1
-        return wbuff, pos
-
-    def eng_conv(self, pos, s_c):
-        wbuff = ""
-        f_oomoji = 0
-        xxx = "⠴"
-        if s_c in j01:
-            ch = j01[s_c]
-            if ch == "＿":
-                xxx = xxx + s_c
-            elif ch == "｜":
-                xxx = xxx + s_c
-            elif ch == "　":
-                xxx = xxx + s_c
-        pos = pos + 1
-        wbuff = wbuff + "￣"
-        if self.buff[pos:pos+1] == "⠠⠠":
-            f_oomoji = 1
-            pos = pos + 2
-        elif self.buff[pos] == "⠠":
-            f_oomoji = 2
-            pos = pos + 1
-        else:
-            f_oomoji = 0
-        while(pos < len(self.buff)):
-            ch = self.buff[pos]
-            if ch == '⠴':
-                if self.buff[pos:pos+len(xxx)] == xxx:
-                    wbuff = wbuff + "￣"
-                    return wbuff, pos
-                elif self.buff[pos:pos+len(xxx)] == "⠴⠀":
-                    wbuff = wbuff + "￣"
-                    return wbuff, pos
-                elif self.buff[pos:pos+len(xxx)] == "⠴\n":
-                    wbuff = wbuff + "￣"
-                    return wbuff, pos
-                elif self.buff[pos:pos+len(xxx)] == "⠴\r":
-                    wbuff = wbuff + "￣"
-                    return wbuff, pos
-                elif self.buff[pos:pos+len(xxx)] == "⠴⠤":
-                    wbuff = wbuff + "￣"
-                    return wbuff, pos
-            else:
-                if f_oomoji == 0:
-                    x = pos
-                    while(x < len(self.buff)):
-                        if self.buff[x:x+len(xxx)] == xxx:
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:pos+len(xxx)] == "⠴⠀":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴\n":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴\r":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴⠤":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-
-                        if self.buff[x:x+1] == "⠠⠠":
-                            f_oomoji = 1  # 大文字連続
-                            x = x + 1
-                            pos = x
-                            break
-                        elif self.buff[x] == "⠠":
-                            f_oomoji = 2     # 大文字単独フラグ
-                            pos = x
-                            break
-                        elif self.buff[x] == "⠼":
-                            ret, x = self.numeric2_conv(x)
-                            wbuff = wbuff + ret
-                        elif self.buff[x] in e03:
-                            wbuff = wbuff + e03[self.buff[x]]
-                        elif self.buff[x] in e02:
-                            wbuff = wbuff + e02[self.buff[x]]
-                        x = x + 1
-                        pos = x
-                        # break #1回のみ
-                elif f_oomoji == 1:
-                    x = pos
-                    while(x < len(self.buff)):
-                        if self.buff[x:x+len(xxx)] == xxx:
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴⠀":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴\n":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴\r":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴⠤":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-
-                        if self.buff[x:x+1] == "⠠⠠":
-                            f_oomoji = 1  # 大文字連続
-                            x = x + 1
-                            pos = x
-                            break
-                        elif self.buff[x] == "⠠":
-                            f_oomoji = 2     # 大文字単独フラグ
-                            pos = x
-                            break
-                        elif self.buff[x] == "⠼":
-                            ret, x = self.numeric2_conv(x)
-                            wbuff = wbuff + ret
-                        elif self.buff[x] in e03:
-                            wbuff = wbuff + e03[self.buff[x]]
-                        elif self.buff[x] in e01:
-                            wbuff = wbuff + e01[self.buff[x]]
-                        f_oomoji = 0
-                        x = x + 1
-                        pos = x
-                        # break # 一回のみ。
-                elif f_oomoji == 2:
-                    x = pos
-                    while(x < len(self.buff)):
-                        if self.buff[x:x+len(xxx)] == xxx:
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴⠀":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴\n":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴\r":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-                        elif self.buff[x:x+len(xxx)] == "⠴⠤":
-                            pos = x
-                            wbuff = wbuff + "￣"
-                            return wbuff, pos
-
-                        if self.buff[x:x+1] == "⠠⠠":
-                            f_oomoji = 1  # 大文字連続
-                            x = x + 1
-                            pos = x
-                            break
-                        elif self.buff[x] == "⠠":
-                            f_oomoji = 2     # 大文字単独フラグ
-                            pos = x
-                            break
-                        elif self.buff[x] == "⠼":
-                            ret, x = self.numeric2_conv(x)
-                            wbuff = wbuff + ret
-                        elif self.buff[x] in e03:
-                            wbuff = wbuff + e03[self.buff[x]]
-                        elif self.buff[x] in e01:
-                            wbuff = wbuff + e01[self.buff[x]]
-                        f_oomoji = 0
-                        pos = x
-                        break  # 一回のみ。
-                else:
-                    f_oomoji = 0
-                # break
-            pos = pos + 1
-        return wbuff, pos
+        return KanaConverter().convert(self.buff)
 
     def eng_conv2(self, pos, s_c):
         wbuff = ""
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# Sapie Library - Index of the members of a downloaded book archive
+
+import os
+import zipfile
+import logging
+import threading
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+# Supported braille file extensions
+BRAILLE_EXTENSIONS = ('.BES', '.BET', '.BMT', '.BSE', '.NAB', '.BRL')
+
+# Book types
+DAISY_202 = "2.02"
+DAISY_3 = "3"
+DAISY = "daisy"
+BRAILLE = "braille"
+UNKNOWN = "unknown"
+
+# Number of archive indexes kept in memory
+INDEX_CACHE_SIZE = 8
+
+
+def decode_filename(filename):
+	"""Decode a ZIP member name stored in cp932 (or UTF-8)"""
+	try:
+		return filename.encode('cp437').decode('cp932')
+	except:
+		try:
+			return filename.encode('cp437').decode('utf-8')
+		except:
+			return filename
+
+
+class ArchiveIndex:
+	"""
+	Members of a ZIP/EXE archive, listed once
+
+	Everything the add-on needs to know about an archive before reading a
+	member comes from a single infolist() pass: decoded names, a case
+	insensitive path map, member sizes and the type of the book.
+	"""
+
+	def __init__(self, zf):
+		"""
+		Index an open archive
+
+		Args:
+			zf (zipfile.ZipFile): Archive to index
+		"""
+		# ZipInfo of the members, in archive order
+		self.members = [info for info in zf.infolist() if not info.is_dir()]
+		# Internal name -> decoded name
+		self.names = {}
+		# Lowercase internal name -> internal name (first one wins)
+		self.paths = {}
+		# Internal name -> uncompressed size
+		self.sizes = {}
+		# (display_name, internal_name) of the braille files, in archive order
+		self.braille_files = []
+		self.ncc_name = None
+		self.has_opf = False
+		self.has_smil = False
+
+		for info in self.members:
+			filename = info.filename
+			name_lower = filename.lower()
+			decoded = decode_filename(filename)
+			self.names[filename] = decoded
+			self.paths.setdefault(name_lower, filename)
+			self.sizes[filename] = info.file_size
+
+			if self.ncc_name is None and 'ncc.htm' in name_lower:
+				self.ncc_name = filename
+			elif name_lower.endswith('.opf'):
+				self.has_opf = True
+			elif name_lower.endswith('.smil'):
+				self.has_smil = True
+
+			name, ext = os.path.splitext(decoded)
+			if ext.upper() in BRAILLE_EXTENSIONS:
+				self.braille_files.append((name, filename))
+
+	@property
+	def daisy_type(self):
+		"""DAISY_202, DAISY_3, or None if the archive has neither an NCC nor an OPF"""
+		if self.ncc_name:
+			return DAISY_202
+		if self.has_opf:
+			return DAISY_3
+		return None
+
+	@property
+	def is_daisy(self):
+		"""Check if the archive holds a DAISY book (NCC, OPF or SMIL files)"""
+		return bool(self.ncc_name or self.has_opf or self.has_smil)
+
+	@property
+	def book_type(self):
+		"""DAISY, BRAILLE or UNKNOWN"""
+		if self.is_daisy:
+			return DAISY
+		if self.braille_files:
+			return BRAILLE
+		return UNKNOWN
+
+	def find(self, path):
+		"""
+		Look up a member by path, ignoring case
+
+		Args:
+			path (str): Member path with '/' separators
+
+		Returns:
+			str or None: Internal name of the member
+		"""
+		return self.paths.get(path.lower())
+
+	def with_extension(self, *extensions):
+		"""
+		Get the members with one of the given extensions
+
+		Args:
+			*extensions (str): Lowercase extensions including the dot
+
+		Returns:
+			list: ZipInfo of the matching members, in archive order
+		"""
+		return [info for info in self.members if info.filename.lower().endswith(extensions)]
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_index(file_path, zf=None):
+	"""
+	Get the index of an archive
+
+	Indexes are kept for the last few archives and rebuilt when the file
+	changes, so checking the type of a book and then opening it lists the
+	archive only once.
+
+	Args:
+		file_path (str): Path of the ZIP/EXE archive
+		zf (zipfile.ZipFile): The archive, if it is already open
+
+	Returns:
+		ArchiveIndex: Index of the archive
+
+	Raises:
+		OSError, zipfile.BadZipFile: If the archive cannot be read
+	"""
+	stat = os.stat(file_path)
+	key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime)
+	with _cache_lock:
+		index = _cache.get(key)
+		if index is not None:
+			_cache.move_to_end(key)
+			return index
+
+	if zf is not None:
+		index = ArchiveIndex(zf)
+	else:
+		with zipfile.ZipFile(file_path, mode='r', allowZip64=True) as zf:
+			index = ArchiveIndex(zf)
+
+	with _cache_lock:
+		_cache[key] = index
+		while len(_cache) > INDEX_CACHE_SIZE:
+			_cache.popitem(last=False)
+	return index
@@ -19,8 +19,8 @@ except:
 
 log = logging.getLogger(__name__)
 
-# Supported braille file extensions
-BRAILLE_EXTENSIONS = ('.BES', '.BET', '.BMT', '.BSE', '.NAB', '.BRL')
+# Converted text of recently opened books (textCache.TextCache), created on first use
+_text_cache = None
 
 
 def is_daisy_file(file_path):
@@ -32,20 +32,18 @@ def is_daisy_file(file_path):
 def is_braille_file(file_path):
 	"""Check if a file contains braille data"""
 	try:
-		from . import sapieConverter
-		braille_files = sapieConverter.list_braille_files(file_path)
-		return len(braille_files) > 0
+		from . import archiveIndex
+		return len(archiveIndex.get_index(file_path).braille_files) > 0
 	except:
 		return False
 
 
 def get_book_type(file_path):
 	"""Determine the type of book (braille or daisy)"""
-	if is_daisy_file(file_path):
-		return "daisy"
-	elif is_braille_file(file_path):
-		return "braille"
-	else:
+	try:
+		from . import archiveIndex
+		return archiveIndex.get_index(file_path).book_type
+	except:
 		return "unknown"
 
 
@@ -77,7 +75,7 @@ def open_book(file_path, viewer_method=None, convert_to_kana=None, parent=None):
 
 		if len(braille_files) == 1:
 			# Only one file, convert directly
-			text_content, book_title = sapieConverter.extract_and_convert_bes(file_path, convert_to_kana)
+			selected = None
 		else:
 			# Multiple files, show selection dialog
 			dlg = VolumeSelectionDialog(parent, braille_files)
@@ -86,20 +84,19 @@ def open_book(file_path, viewer_method=None, convert_to_kana=None, parent=None):
 				if not selected:
 					dlg.Destroy()
 					return False
-				text_content, book_title = sapieConverter.extract_and_convert_selected_bes(
-					file_path, selected, convert_to_kana
-				)
 			else:
 				dlg.Destroy()
 				return False
 			dlg.Destroy()
 
-		if not text_content:
-			ui.message(_("読み取れるコンテンツがありません"))
-			return False
+		# Converted text is written to the file as it is produced
+		text_content = _iter_book_text(file_path, selected, convert_to_kana, braille_files)
+		book_title = sapieConverter.get_book_title(file_path, selected)
 
 		# Open in Notepad
-		_open_in_external_editor(text_content, book_title, is_braille=not convert_to_kana)
+		if not _open_in_external_editor(text_content, book_title, is_braille=not convert_to_kana):
+			ui.message(_("読み取れるコンテンツがありません"))
+			return False
 
 		return True
 	except Exception as e:
@@ -108,8 +105,57 @@ def open_book(file_path, viewer_method=None, convert_to_kana=None, parent=None):
 		return False
 
 
+def _get_text_cache():
+	"""Get the cache of converted text shared by all opened books"""
+	global _text_cache
+	if _text_cache is None:
+		from . import textCache
+		_text_cache = textCache.TextCache()
+	return _text_cache
+
+
+def _iter_book_text(file_path, selected, convert_to_kana, braille_files):
+	"""
+	Get the text of a book from the cache, or convert and cache it
+
+	Args:
+		file_path (str): Path of the ZIP/EXE archive
+		selected (list): Internal names of the selected volumes, None for the only one
+		convert_to_kana (bool): Whether to convert to kana
+		braille_files (list): (display_name, internal_filename) of the archive
+
+	Returns:
+		iterator: Pieces of the text
+	"""
+	from . import sapieConverter
+	from . import textCache
+
+	pieces = sapieConverter.iter_book_text(file_path, selected, convert_to_kana)
+	try:
+		cache = _get_text_cache()
+		members = selected or [internal_name for name, internal_name in braille_files]
+		key = cache.make_key(file_path, members, textCache.KANA if convert_to_kana else textCache.BRAILLE)
+		cached = cache.get(key)
+		if cached is not None:
+			log.info(f"Opening cached text of {os.path.basename(file_path)}")
+			return cached
+		return cache.store(key, pieces)
+	except Exception as e:
+		log.warning(f"Text cache unavailable: {e}")
+		return pieces
+
+
 def _open_in_external_editor(text_content, book_title, is_braille=False):
-	"""Save text to temp file and open in notepad"""
+	"""Save text to temp file and open in notepad
+
+	Args:
+		text_content: Text, or an iterable of text pieces written as they arrive
+		book_title: Title used for the file name
+		is_braille: Whether the text is unconverted braille
+
+	Returns:
+		bool: False if there was no text to open
+	"""
 	# Use notepad for converted text (kana/unicode braille)
 	editor_path = "notepad.exe"
 
@@ -119,10 +165,21 @@ def _open_in_external_editor(text_content, book_title, is_braille=False):
 	suffix = "_braille" if is_braille else "_kana"
 	file_path = os.path.join(temp_dir, f"{safe_title}{suffix}.txt")
 
+	if isinstance(text_content, str):
+		text_content = (text_content,)
+
+	written = False
 	with open(file_path, 'w', encoding='utf-8') as f:
-		f.write(text_content)
+		for text in text_content:
+			if text:
+				f.write(text)
+				written = True
+
+	if not written:
+		return False
 
 	subprocess.Popen([editor_path, file_path], shell=True)
+	return True
 
 
 class VolumeSelectionDialog(wx.Dialog):
@@ -215,27 +272,23 @@ def open_in_braille_editor(file_path, parent=None):
 		temp_dir = tempfile.gettempdir()
 		extracted_files = []  # List of tuples (display_name, file_path)
 
+		from . import archiveIndex
+
 		with zipfile.ZipFile(file_path, mode='r', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
-			for info in zf.infolist():
-				try:
-					filename = info.filename.encode('cp437').decode('cp932')
-				except:
-					filename = info.filename
-
-				name, ext = os.path.splitext(filename)
-
-				if ext.upper() in BRAILLE_EXTENSIONS:
-					# Extract braille file to temp directory
-					braille_content = zf.read(info.filename)
-					safe_name = "".join(c if c.isalnum() or c in " -_" else "_" for c in name)[:50]
-					# Preserve original extension
-					braille_path = os.path.join(temp_dir, f"{safe_name}{ext.lower()}")
-
-					with open(braille_path, 'wb') as f:
-						f.write(braille_content)
-
-					# Use original name for display
-					extracted_files.append((name, braille_path))
+			index = archiveIndex.get_index(file_path, zf)
+			for name, internal_name in index.braille_files:
+				ext = os.path.splitext(index.names[internal_name])[1]
+				# Extract braille file to temp directory
+				braille_content = zf.read(internal_name)
+				safe_name = "".join(c if c.isalnum() or c in " -_" else "_" for c in name)[:50]
+				# Preserve original extension
+				braille_path = os.path.join(temp_dir, f"{safe_name}{ext.lower()}")
+
+				with open(braille_path, 'wb') as f:
+					f.write(braille_content)
+
+				# Use original name for display
+				extracted_files.append((name, braille_path))
 
 		if not extracted_files:
 			ui.message(_("点字ファイルが見つかりませんでした"))
@@ -2,30 +2,123 @@
 # DAISY Converter - Extract and convert DAISY books
 
 import os
+import json
+import shutil
+import bisect
+import codecs
 import zipfile
+import functools
 import tempfile
 import logging
 import re
+import html
+import posixpath
+import threading
+import urllib.parse
 import webbrowser
+import xml.sax
+import xml.sax.handler
+from html.entities import name2codepoint
+from collections import OrderedDict
+
+from . import archiveIndex
 
 log = logging.getLogger(__name__)
 
+# Section texts a DaisyBook keeps in memory
+SECTION_CACHE_SIZE = 64
+
+# Content files a DaisyBook keeps decoded while extracting sections
+CONTENT_FILE_CACHE_SIZE = 4
+
+# NCC headings: level, href, fragment and title
+NCC_HEADING_PATTERN = re.compile(r'<h(\d)[^>]*>.*?<a[^>]*href=["\']([^"\'#]+)(?:#([^"\']*))?["\'][^>]*>([^<]*)</a>.*?</h\1>', re.IGNORECASE | re.DOTALL)
+
+# Elements ending a line of HTML text
+HTML_BREAK_PATTERN = re.compile(r'<(?:br\b[^>]*|/(?:p|div)\s*)>', re.IGNORECASE)
+
+# Markup dropped from HTML text: scripts and styles with their content, comments and tags
+HTML_MARKUP_PATTERN = re.compile(r'<(?:(script|style)\b[^>]*>.*?</\1\s*>|!--.*?-->|[^>]+>)', re.IGNORECASE | re.DOTALL)
+
+# Character references, as matched by html.unescape
+HTML_ENTITY_PATTERN = re.compile(r'&(?:#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)')
+
+# Distinct character references kept decoded
+ENTITY_CACHE_SIZE = 1024
+
+# Sections per part file of a progressive page
+HTML_PART_SECTIONS = 20
+
+# Script of a progressive page: loads part0.js, part1.js, ... in turn,
+# retrying a part that has not been written yet
+PROGRESSIVE_HTML_SCRIPT = """(function () {
+	var base = PARTS_URL;
+	var next = 0;
+	window.sapieDaisyFill = function (first, contents, last) {
+		for (var i = 0; i < contents.length; i++) {
+			var div = document.getElementById("content" + (first + i));
+			if (!div) { continue; }
+			if (contents[i]) { div.textContent = contents[i]; } else { div.parentNode.removeChild(div); }
+			div.removeAttribute("id");
+		}
+		next++;
+		if (!last) { load(0); return; }
+		var pending = document.querySelectorAll("div.content[id]");
+		for (var j = 0; j < pending.length; j++) { pending[j].textContent = "（読み込めませんでした）"; }
+		document.getElementById("loading").textContent = "本文の読み込みが完了しました";
+	};
+	function load(delay) {
+		setTimeout(function () {
+			var script = document.createElement("script");
+			script.src = base + next + ".js?" + new Date().getTime();
+			script.onerror = function () { script.parentNode.removeChild(script); load(500); };
+			document.body.appendChild(script);
+		}, delay);
+	}
+	load(0);
+})();"""
+
+# Encodings tried, in order, for files declaring none
+FALLBACK_ENCODINGS = ('utf-8', 'shift_jis', 'cp932', 'euc_jp', 'iso2022_jp')
+
+# Declared encodings read with a superset: books declaring Shift_JIS are
+# usually written in cp932 and use its NEC and IBM extension characters
+DECLARED_ENCODING_SUBSTITUTES = {'shift_jis': 'cp932'}
+
+# Byte order marks and the codec decoding what follows them
+ENCODING_BOMS = (
+	(codecs.BOM_UTF8, 'utf-8'),
+	(codecs.BOM_UTF16_LE, 'utf-16-le'),
+	(codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+# Bytes searched for an encoding declaration
+ENCODING_SNIFF_SIZE = 4096
+
+# Bytes handed to charset_normalizer when no encoding fits
+ENCODING_GUESS_SIZE = 64 * 1024
+
+# <?xml ... encoding="..."?> and <meta charset="..."> / <meta content="...; charset=...">
+XML_ENCODING_PATTERN = re.compile(r'<\?xml[^>]*?\bencoding\s*=\s*["\']([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_PATTERN = re.compile(r'<meta[^>]*?\bcharset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# Characters of DTBook XML handed to the parser at a time
+DTBOOK_CHUNK_SIZE = 64 * 1024
+
+# DTBook heading elements (h1..h6, and hd for <level>)
+DTBOOK_HEADING_PATTERN = re.compile(r'(?:h[1-6]|hd)$')
+
+# DTBook elements ending a line of section text
+DTBOOK_BLOCK_ELEMENTS = frozenset((
+	'p', 'div', 'li', 'lic', 'line', 'dt', 'dd', 'tr', 'caption', 'blockquote',
+	'pagenum', 'author', 'byline', 'dateline', 'doctitle', 'docauthor', 'bridgehead'
+))
+
 
 def is_daisy_file(file_path):
 	"""Check if a file is a DAISY book"""
 	try:
-		with zipfile.ZipFile(file_path, mode='r') as zf:
-			names = [n.lower() for n in zf.namelist()]
-			# DAISY 2.02: ncc.html
-			if any('ncc.html' in n or 'ncc.htm' in n for n in names):
-				return True
-			# DAISY 3: .opf file
-			if any(n.endswith('.opf') for n in names):
-				return True
-			# Check for SMIL files (common in DAISY)
-			if any(n.endswith('.smil') for n in names):
-				return True
-		return False
+		return archiveIndex.get_index(file_path).is_daisy
 	except:
 		return False
 
@@ -33,13 +126,7 @@ def is_daisy_file(file_path):
 def get_daisy_type(file_path):
 	"""Determine DAISY type (2.02 or 3)"""
 	try:
-		with zipfile.ZipFile(file_path, mode='r') as zf:
-			names = [n.lower() for n in zf.namelist()]
-			if any('ncc.html' in n or 'ncc.htm' in n for n in names):
-				return "2.02"
-			if any(n.endswith('.opf') for n in names):
-				return "3"
-		return None
+		return archiveIndex.get_index(file_path).daisy_type
 	except:
 		return None
 
@@ -56,16 +143,10 @@ def extract_daisy_content(file_path):
 	}
 
 	try:
-		with zipfile.ZipFile(file_path, mode='r', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
-			daisy_type = get_daisy_type(file_path)
-
-			if daisy_type == "2.02":
-				result = _extract_daisy_202(zf, result)
-			elif daisy_type == "3":
-				result = _extract_daisy_3(zf, result)
-			else:
-				# Try to extract any HTML/text content
-				result = _extract_generic_content(zf, result)
+		with DaisyBook(file_path) as book:
+			result['title'] = book.title
+			for section in book.iter_sections():
+				result['sections'].append(section)
 
 	except Exception as e:
 		log.error(f"Error extracting DAISY content: {e}")
@@ -73,129 +154,582 @@ def extract_daisy_content(file_path):
 	return result
 
 
-def _decode_filename(filename):
-	"""Decode filename from ZIP"""
-	try:
-		return filename.encode('cp437').decode('cp932')
-	except:
-		try:
-			return filename.encode('cp437').decode('utf-8')
-		except:
-			return filename
+class DaisyBook:
+	"""
+	DAISY book whose section texts are extracted on demand
 
+	Opening the book only parses its navigation: the headings of the NCC
+	(DAISY 2.02) or the level headings of the DTBook files (DAISY 3). The
+	text of a section is extracted the first time it is asked for and
+	kept in a bounded LRU cache, so a viewer can show the table of
+	contents at once and fill in the sections as they are loaded.
+	"""
 
-def _extract_daisy_202(zf, result):
-	"""Extract content from DAISY 2.02 format"""
-	# Find ncc.html for navigation
-	ncc_content = None
-	ncc_name = None
+	def __init__(self, file_path, cache_size=SECTION_CACHE_SIZE):
+		"""
+		Open a book and read its navigation
+
+		Args:
+			file_path (str): Path of the ZIP/EXE archive
+			cache_size (int): Number of section texts kept in memory
+
+		Raises:
+			OSError, zipfile.BadZipFile: If the archive cannot be read
+		"""
+		self.file_path = file_path
+		self.title = os.path.splitext(os.path.basename(file_path))[0]
+		# {'level', 'title'} of each section, in reading order
+		self.sections = []
+		self.cache_size = cache_size
+		# Section number -> text, least recently used first
+		self._cache = OrderedDict()
+		# Section number -> function extracting its text
+		self._loaders = []
+		# DAISY 2.02: content files, (href, fragment) of each heading, and
+		# where the headings start once located
+		self._files = None
+		self._links = []
+		self._located = None
+		self._starts = {}
+		# DAISY 3: name of the last parsed DTBook file and its section texts
+		self._dtbook_texts = (None, [])
+		self._decoder = _TextDecoder()
+		self._zf = zipfile.ZipFile(file_path, mode='r', compression=zipfile.ZIP_STORED, allowZip64=True)
 
-	for info in zf.infolist():
-		name_lower = info.filename.lower()
-		if 'ncc.html' in name_lower or 'ncc.htm' in name_lower:
-			ncc_name = info.filename
-			ncc_content = zf.read(info.filename)
-			break
+		try:
+			self.index = archiveIndex.get_index(file_path, self._zf)
+			daisy_type = self.index.daisy_type
+			if daisy_type == archiveIndex.DAISY_202:
+				self._read_ncc()
+			elif daisy_type == archiveIndex.DAISY_3:
+				self._read_dtbook_headings()
+
+			# If no sections found, try to extract from HTML files directly
+			if not self.sections:
+				self._read_html_files()
+		except Exception:
+			self._zf.close()
+			raise
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def close(self):
+		"""Close the archive"""
+		self._zf.close()
+		self._cache.clear()
+		self._dtbook_texts = (None, [])
+
+	def get_content(self, number):
+		"""
+		Get the text of a section
+
+		Args:
+			number (int): Index of the section in self.sections
+
+		Returns:
+			str: Text of the section, empty if it could not be read
+		"""
+		content = self._cache.get(number)
+		if content is not None:
+			self._cache.move_to_end(number)
+			return content
 
-	if ncc_content:
-		# Parse NCC to get structure and content files
-		ncc_text = _try_decode(ncc_content)
-		result['title'] = _extract_title(ncc_text) or result['title']
+		try:
+			content = self._loaders[number]()
+		except Exception as e:
+			log.debug(f"Could not read section {number}: {e}")
+			content = ""
+		self._store(number, content)
+		return content
+
+	def iter_sections(self):
+		"""
+		Load the sections in reading order
+
+		Yields:
+			dict: level, title and content of each section
+		"""
+		for number, section in enumerate(self.sections):
+			yield dict(section, content=self.get_content(number))
+
+	def _store(self, number, content):
+		"""Put a section text in the cache"""
+		self._cache[number] = content
+		self._cache.move_to_end(number)
+		while len(self._cache) > self.cache_size:
+			self._cache.popitem(last=False)
+
+	def _add_section(self, level, title, loader):
+		"""Add a section to the navigation"""
+		self.sections.append({'level': level, 'title': title})
+		self._loaders.append(loader)
+
+	def _read_ncc(self):
+		"""Read the headings of a DAISY 2.02 NCC"""
+		ncc_name = self.index.ncc_name
+		ncc_content = self._zf.read(ncc_name)
+		if not ncc_content:
+			return
 
-		# Extract headings and content references
-		heading_pattern = re.compile(r'<h(\d)[^>]*>.*?<a[^>]*href=["\']([^"\'#]+)[^"\']*["\'][^>]*>([^<]*)</a>.*?</h\1>', re.IGNORECASE | re.DOTALL)
+		# Parse NCC to get structure and content files
+		ncc_text = self._decoder.decode(ncc_content)
+		self.title = _extract_title(ncc_text) or self.title
 
-		for match in heading_pattern.finditer(ncc_text):
+		# Headings with the content references they link to
+		self._files = _ContentFiles(self._zf, self.index, posixpath.dirname(ncc_name), self._decoder)
+		for match in NCC_HEADING_PATTERN.finditer(ncc_text):
 			level = int(match.group(1))
-			href = match.group(2)
-			title = _clean_html(match.group(3))
-
-			# Try to read the referenced content file
-			content = ""
+			title = _clean_html(match.group(4))
+			loader = functools.partial(self._load_ncc_section, len(self._links))
+			self._links.append((match.group(2), match.group(3)))
+			self._add_section(level, title, loader)
+
+	def _locate_ncc_sections(self):
+		"""Find where the text of every NCC heading starts, on first use"""
+		self._located = []
+		for href, fragment in self._links:
+			member, start = None, None
 			try:
-				# Resolve relative path
-				if ncc_name:
-					base_dir = os.path.dirname(ncc_name)
-					content_path = os.path.join(base_dir, href).replace('\\', '/')
-				else:
-					content_path = href
-
-				# Find the file in archive
-				for info in zf.infolist():
-					if info.filename.lower() == content_path.lower() or info.filename.lower().endswith('/' + href.lower()):
-						content_bytes = zf.read(info.filename)
-						content = _extract_text_from_html(_try_decode(content_bytes))
-						break
+				member, start = self._files.locate(href, fragment)
 			except Exception as e:
 				log.debug(f"Could not read content file {href}: {e}")
+			self._located.append((member, start))
+
+		# Start positions of the headings in each content file, so a
+		# heading's text can end where the next one in the file starts
+		starts = {}
+		for member, start in self._located:
+			if start is not None:
+				starts.setdefault(member, set()).add(start)
+		self._starts = {member: sorted(positions) for member, positions in starts.items()}
+
+	def _load_ncc_section(self, number):
+		"""Extract the text of an NCC heading"""
+		if self._located is None:
+			self._locate_ncc_sections()
+		member, start = self._located[number]
+		if member is None:
+			return ""
+		return self._files.section_text(member, start, self._starts.get(member, []))
+
+	def _dtbook_files(self):
+		"""XML files of a DAISY 3 book, sorted by name (ptk00001.xml, ptk00002.xml, ...)"""
+		xml_files = self.index.with_extension('.xml')
+		xml_files.sort(key=lambda x: x.filename.lower())
+		return xml_files
+
+	def _read_dtbook(self, filename):
+		"""Read a DTBook file, or None if the XML file is not DTBook"""
+		xml_text = self._decoder.decode(self._zf.read(filename))
+		xml_lower = xml_text.lower()
+		# Check if it's DTBook format
+		if 'dtbook' in xml_lower or '<level' in xml_lower or '<book' in xml_lower:
+			return xml_text
+		return None
+
+	def _read_dtbook_headings(self):
+		"""Read the level headings of the DTBook files of a DAISY 3 book"""
+		for info in self._dtbook_files():
+			try:
+				xml_text = self._read_dtbook(info.filename)
+				if xml_text is None:
+					continue
+
+				if not self.title:
+					self.title = _dtbook_title(xml_text) or self.title
+				first = len(self.sections)
+				for section in _dtbook_sections(xml_text, with_content=False):
+					loader = functools.partial(self._load_dtbook_sections, info.filename, first, len(self.sections))
+					self._add_section(section['level'], section['title'], loader)
+			except Exception as e:
+				log.debug(f"Error processing {info.filename}: {e}")
+				continue
+
+	def _load_dtbook_sections(self, filename, first, number):
+		"""Extract the text of a section of a DTBook file"""
+		if self._dtbook_texts[0] != filename:
+			# The texts of the whole file are kept until another file is read,
+			# so the file is parsed once however many of its sections the LRU
+			# cache holds
+			sections = _dtbook_sections(self._read_dtbook(filename), with_content=True)
+			self._dtbook_texts = (filename, [section['content'] for section in sections])
+		return self._dtbook_texts[1][number - first]
+
+	def _read_html_files(self):
+		"""Use the HTML/HTM files as sections when structure is unknown"""
+		# Skip ncc.html
+		html_files = [info for info in self.index.with_extension('.html', '.htm') if 'ncc.' not in info.filename.lower()]
+
+		# Sort by filename
+		html_files.sort(key=lambda x: x.filename.lower())
+
+		for info in html_files:
+			try:
+				html_text = self._decoder.decode(self._zf.read(info.filename))
+
+				# Extract title from this file
+				title = _extract_title(html_text)
+				if not title:
+					title = os.path.splitext(self.index.names[info.filename])[0]
+
+				# Extract text content
+				content = _extract_text_from_html(html_text)
+
+				if content.strip():
+					self._add_section(1, title, lambda content=content: content)
+			except Exception as e:
+				log.debug(f"Error reading {info.filename}: {e}")
+
+
+class _ContentFiles:
+	"""
+	Content files referenced from a DAISY 2.02 NCC
+
+	Each referenced path is resolved once and each file is scanned for
+	anchors once, however many headings point into it. Decoded files are
+	kept for the few most recently used.
+	"""
+
+	ANCHOR_PATTERN = re.compile(r'<[a-z][^>]*?\b(?:id|name)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+	SMIL_TEXT_PATTERN = re.compile(r'<text\b[^>]*?\bsrc\s*=\s*["\']([^"\'#]+)(?:#([^"\']*))?["\']', re.IGNORECASE)
+
+	def __init__(self, zf, index, base_dir, decoder):
+		"""
+		Initialize the cache
+
+		Args:
+			zf (zipfile.ZipFile): Open archive
+			index (archiveIndex.ArchiveIndex): Index of the archive
+			base_dir (str): Directory of the NCC inside the archive
+			decoder (_TextDecoder): Decoder of the archive's text files
+		"""
+		self.zf = zf
+		self.index = index
+		self.base_dir = base_dir
+		self.decoder = decoder
+		# (base_dir, href) -> internal name or None
+		self._resolved = {}
+		# Internal name -> decoded text of recently used files
+		self._texts = OrderedDict()
+		# Internal name -> {anchor id: offset of its tag}
+		self._anchors = {}
+		# (internal name, start, end) and text of the last extracted section
+		self._last_section = (None, None)
+
+	def resolve(self, href, base_dir=None):
+		"""
+		Find the member an href refers to
+
+		Args:
+			href (str): Path without fragment, relative to base_dir
+			base_dir (str): Directory the path is relative to, the NCC's by default
+
+		Returns:
+			str or None: Internal name of the member
+		"""
+		if base_dir is None:
+			base_dir = self.base_dir
+		key = (base_dir, href)
+		if key in self._resolved:
+			return self._resolved[key]
+
+		content_path = posixpath.normpath(posixpath.join(base_dir, href.replace('\\', '/')))
+		member = self.index.find(content_path)
+		if member is None:
+			# Same fallback as before: any member ending with the href
+			suffix = '/' + href.lower()
+			member = next((info.filename for info in self.index.members if info.filename.lower().endswith(suffix)), None)
+		self._resolved[key] = member
+		return member
+
+	def text(self, member):
+		"""Get the decoded text of a member"""
+		text = self._texts.get(member)
+		if text is None:
+			text = self.decoder.decode(self.zf.read(member))
+			self._texts[member] = text
+			while len(self._texts) > CONTENT_FILE_CACHE_SIZE:
+				self._texts.popitem(last=False)
+		else:
+			self._texts.move_to_end(member)
+		return text
+
+	def anchors(self, member):
+		"""Get the offsets of the elements with an id (or name) in a member"""
+		anchors = self._anchors.get(member)
+		if anchors is None:
+			anchors = {}
+			for match in self.ANCHOR_PATTERN.finditer(self.text(member)):
+				anchors.setdefault(match.group(1), match.start())
+			self._anchors[member] = anchors
+		return anchors
+
+	def locate(self, href, fragment):
+		"""
+		Find where a heading's text starts
+
+		A reference to a SMIL file is followed to the text element of the
+		referenced par, as the NCC of most books points into SMIL files.
+
+		Args:
+			href (str): Path of the NCC link
+			fragment (str): Fragment of the NCC link, or None
+
+		Returns:
+			tuple: (internal name, offset) of the text; the offset is None
+				if the link has no fragment or it was not found
+		"""
+		member = self.resolve(href)
+		if member is None:
+			return None, None
+
+		if member.lower().endswith('.smil') and fragment:
+			target = self._follow_smil(member, fragment)
+			if target:
+				member, fragment = target
+
+		if not fragment:
+			return member, None
+		return member, self.anchors(member).get(fragment)
+
+	def section_text(self, member, start, starts):
+		"""
+		Extract the text of a heading
+
+		Args:
+			member (str): Internal name of the content file
+			start (int): Offset of the heading, None for the whole file
+			starts (list): Sorted offsets of all headings in the file
+
+		Returns:
+			str: Text from the heading to the next heading in the file; the
+				first heading of a file also gets the text before it
+		"""
+		if start is None:
+			begin, end = 0, None
+		else:
+			position = bisect.bisect_right(starts, start)
+			begin = 0 if position == 1 else start
+			end = starts[position] if position < len(starts) else None
+
+		# Consecutive headings without a fragment share the whole file
+		key = (member, begin, end)
+		if self._last_section[0] == key:
+			return self._last_section[1]
+		content = _extract_text_from_html(self.text(member)[begin:end])
+		self._last_section = (key, content)
+		return content
+
+	def _follow_smil(self, member, fragment):
+		"""Get (content member, fragment) of the text element of a SMIL par"""
+		start = self.anchors(member).get(fragment)
+		if start is None:
+			return None
+		match = self.SMIL_TEXT_PATTERN.search(self.text(member), start)
+		if not match:
+			return None
+		target = self.resolve(match.group(1), posixpath.dirname(member))
+		if target is None:
+			return None
+		return target, match.group(2)
+
+
+def _dtbook_title(xml_text):
+	"""Extract the title of a DTBook file from dc:Title meta or doctitle"""
+	title_match = re.search(r'<meta[^>]*name=["\']dc:Title["\'][^>]*content=["\']([^"\']+)["\']', xml_text, re.IGNORECASE)
+	if title_match:
+		return _clean_html(title_match.group(1))
+	title_match = re.search(r'<doctitle[^>]*>([^<]*)</doctitle>', xml_text, re.IGNORECASE)
+	if title_match:
+		return _clean_html(title_match.group(1))
+	return None
+
+
+def _dtbook_sections(xml_text, with_content=True):
+	"""
+	Parse the level sections of a DTBook file
 
-			result['sections'].append({
+	The file is read in a single pass with a SAX parser, so nested levels
+	become sections of their own and no element tree is kept in memory.
+	Files that are not well-formed XML are parsed with regexes instead.
+
+	Args:
+		xml_text (str): DTBook XML
+		with_content (bool): Whether to extract the section texts; without
+			them only the headings are read
+
+	Returns:
+		list: {level, title, content} of each section in document order,
+			content being None when not extracted
+	"""
+	handler = _DTBookHandler(with_content)
+	parser = xml.sax.make_parser()
+	parser.setContentHandler(handler)
+	# Never fetch the DTD
+	parser.setFeature(xml.sax.handler.feature_external_ges, False)
+	parser.setFeature(xml.sax.handler.feature_external_pes, False)
+	try:
+		for start in range(0, len(xml_text), DTBOOK_CHUNK_SIZE):
+			parser.feed(xml_text[start:start + DTBOOK_CHUNK_SIZE])
+		parser.close()
+	except xml.sax.SAXException as e:
+		log.debug(f"DTBook is not well-formed, falling back to regex parsing: {e}")
+		return _dtbook_sections_regex(xml_text, with_content)
+	return [section for section in handler.sections if section is not None]
+
+
+class _DTBookHandler(xml.sax.handler.ContentHandler):
+	"""SAX handler collecting the level sections of a DTBook file"""
+
+	def __init__(self, with_content):
+		super().__init__()
+		self.with_content = with_content
+		# Sections in the order their level starts; None for the ones dropped
+		self.sections = []
+		# Levels being read, innermost last
+		self._open = []
+		# Text of the heading being read, or None
+		self._heading = None
+
+	def startElement(self, name, attrs):
+		name = _local_name(name)
+		level = _dtbook_level(name, attrs, len(self._open))
+		if level:
+			if self._open:
+				self._text('\n')
+			self._open.append({
+				'slot': len(self.sections),
 				'level': level,
-				'title': title,
-				'content': content
+				'title': None,
+				'parts': [],
+				'has_text': False
 			})
+			self.sections.append(None)
+		elif name == 'br':
+			self._text('\n')
+		elif DTBOOK_HEADING_PATTERN.match(name) and self._open and self._open[-1]['title'] is None:
+			self._heading = []
+
+	def endElement(self, name):
+		name = _local_name(name)
+		if _dtbook_level(name, None, 0):
+			if self._open:
+				self._close_level()
+		elif DTBOOK_HEADING_PATTERN.match(name) and self._heading is not None:
+			# First line of the heading text (nested <sent>, <span>, ... included)
+			title = _join_lines(''.join(self._heading)).split('\n')[0]
+			self._open[-1]['title'] = title
+			self._heading = None
+			self._text('\n')
+		elif name in DTBOOK_BLOCK_ELEMENTS:
+			self._text('\n')
+
+	def characters(self, content):
+		self._text(content)
+
+	def skippedEntity(self, name):
+		# HTML entities (&nbsp; ...) are declared in the DTD, which is not read
+		codepoint = name2codepoint.get(name)
+		if codepoint is not None:
+			self._text(' ' if name == 'nbsp' else chr(codepoint))
+
+	def _text(self, content):
+		"""Add text to the innermost level"""
+		if not self._open:
+			return
+		section = self._open[-1]
+		if self._heading is not None:
+			self._heading.append(content)
+		if self.with_content:
+			section['parts'].append(content)
+		elif not section['has_text'] and not content.isspace():
+			section['has_text'] = True
+
+	def _close_level(self):
+		"""Finish the innermost level"""
+		section = self._open.pop()
+		title = section['title']
+		if title is None:
+			title = "セクション"
+
+		content = None
+		if self.with_content:
+			content = _join_lines(''.join(section['parts']))
+			has_text = bool(content)
+		else:
+			has_text = section['has_text']
 
-	# If no sections found, try to extract from HTML files directly
-	if not result['sections']:
-		result = _extract_generic_content(zf, result)
+		# Skip untitled empty sections
+		if title or has_text:
+			self.sections[section['slot']] = {
+				'level': section['level'],
+				'title': title if title else "（無題）",
+				'content': content
+			}
 
-	return result
 
+def _local_name(name):
+	"""Element name without namespace prefix, in lowercase"""
+	return name.rpartition(':')[2].lower()
 
-def _extract_daisy_3(zf, result):
-	"""Extract content from DAISY 3 (ANSI/NISO Z39.86) format"""
-	# Collect all XML files
-	xml_files = []
-	for info in zf.infolist():
-		name_lower = info.filename.lower()
-		if name_lower.endswith('.xml'):
-			xml_files.append(info)
 
-	# Sort XML files by filename (ptk00001.xml, ptk00002.xml, ...)
-	xml_files.sort(key=lambda x: x.filename.lower())
+def _dtbook_level(name, attrs, depth):
+	"""
+	Get the level of a DTBook level element
 
-	# Process ALL XML files
-	for info in xml_files:
-		try:
-			xml_content = zf.read(info.filename)
-			xml_text = _try_decode(xml_content)
+	Args:
+		name (str): Local element name
+		attrs: Attributes of the element, or None
+		depth (int): Number of levels containing the element
 
-			# Check if it's DTBook format
-			if 'dtbook' in xml_text.lower() or '<level' in xml_text.lower() or '<book' in xml_text.lower():
-				result = _parse_dtbook(xml_text, result)
-		except Exception as e:
-			log.debug(f"Error processing {info.filename}: {e}")
-			continue
+	Returns:
+		int: 1-6 for level1..level6, the depth attribute or nesting depth
+			for <level>, 0 for any other element
+	"""
+	if name == 'level':
+		if attrs is not None:
+			try:
+				return int(attrs.get('depth'))
+			except (TypeError, ValueError):
+				pass
+		return min(depth + 1, 6)
+	if len(name) == 6 and name.startswith('level') and name[5] in '123456':
+		return int(name[5])
+	return 0
 
-	# If no sections found, try generic extraction
-	if not result['sections']:
-		result = _extract_generic_content(zf, result)
 
-	return result
+def _dtbook_sections_regex(xml_text, with_content=True):
+	"""
+	Parse the top-level level sections of a DTBook file with regexes
 
+	Used when the file is not well-formed XML. Nested levels stay in the
+	text of the level containing them.
 
-def _parse_dtbook(xml_text, result):
-	"""Parse DTBook XML format - extracts content from a single XML file"""
-	# Extract title from dc:Title meta or doctitle
-	if not result.get('title') or result['title'] == os.path.splitext(os.path.basename(result.get('_filepath', '')))[0]:
-		title_match = re.search(r'<meta[^>]*name=["\']dc:Title["\'][^>]*content=["\']([^"\']+)["\']', xml_text, re.IGNORECASE)
-		if title_match:
-			result['title'] = _clean_html(title_match.group(1))
-		else:
-			title_match = re.search(r'<doctitle[^>]*>([^<]*)</doctitle>', xml_text, re.IGNORECASE)
-			if title_match:
-				result['title'] = _clean_html(title_match.group(1))
+	Args:
+		xml_text (str): DTBook XML
+		with_content (bool): Whether to extract the section texts; without
+			them only the headings are read
+
+	Returns:
+		list: {level, title, content} of each section, content being None
+			when not extracted
+	"""
+	sections = []
 
 	# Extract headings and content from level elements
 	# DTBook uses level1, level2, level3, etc.
 	level_pattern = re.compile(r'<level(\d)[^>]*>(.*?)</level\1>', re.IGNORECASE | re.DOTALL)
+	heading_pattern = re.compile(r'<h(\d)[^>]*>(.*?)</h\1>', re.IGNORECASE | re.DOTALL)
 
 	for level_match in level_pattern.finditer(xml_text):
 		level = int(level_match.group(1))
 		section_content = level_match.group(2)
 
 		# Find heading in this section (h1, h2, etc. or text in <sent> tags)
-		heading_pattern = re.compile(r'<h(\d)[^>]*>(.*?)</h\1>', re.IGNORECASE | re.DOTALL)
 		heading_match = heading_pattern.search(section_content)
 
 		if heading_match:
@@ -207,67 +741,117 @@ def _parse_dtbook(xml_text, result):
 		else:
 			title = f"セクション"
 
-		# Extract text content from paragraphs
-		content = _extract_text_from_html(section_content)
+		# Extract text content from paragraphs (needed to skip untitled empty sections)
+		content = None
+		if with_content or not title:
+			content = _extract_text_from_html(section_content)
 
 		if title or content.strip():
-			result['sections'].append({
+			sections.append({
 				'level': level,
 				'title': title if title else "（無題）",
 				'content': content
 			})
 
-	return result
+	return sections
 
 
-def _extract_generic_content(zf, result):
-	"""Extract content from HTML/HTM files when structure is unknown"""
-	html_files = []
+class _TextDecoder:
+	"""
+	Decoder of the text files of one archive
 
-	for info in zf.infolist():
-		name_lower = info.filename.lower()
-		if name_lower.endswith('.html') or name_lower.endswith('.htm'):
-			# Skip ncc.html
-			if 'ncc.' not in name_lower:
-				html_files.append(info)
+	The encoding of a file is taken from its BOM, XML declaration or
+	<meta charset>, looked for in its first few KB. Files declaring
+	nothing are tried with the encoding found for the previous files of
+	the archive first, so a Shift_JIS book decodes each file once instead
+	of failing a UTF-8 decode on every one of them.
+	"""
 
-	# Sort by filename
-	html_files.sort(key=lambda x: x.filename.lower())
+	def __init__(self):
+		# Encoding that last decoded a file of the archive
+		self.encoding = None
+		# Declared encoding -> encoding that decoded the files declaring it
+		# when the declaration was wrong
+		self._substitutes = {}
+
+	def decode(self, content_bytes):
+		"""
+		Decode a file of the archive
+
+		Args:
+			content_bytes (bytes): Content of the file
+
+		Returns:
+			str: Decoded text
+		"""
+		declared, bom_length = _sniff_encoding(content_bytes)
+		encoding = self._substitutes.get(declared, declared)
+		if encoding:
+			text = _decode_as(content_bytes[bom_length:], encoding)
+			if text is not None:
+				self.encoding = encoding
+				return text
+
+		tried = {None, encoding}
+		for candidate in (self.encoding,) + FALLBACK_ENCODINGS:
+			if candidate in tried:
+				continue
+			tried.add(candidate)
+			text = _decode_as(content_bytes, candidate)
+			if text is not None:
+				self.encoding = candidate
+				if declared:
+					# Later files with the same declaration are decoded once
+					self._substitutes[declared] = candidate
+				return text
+
+		encoding = _guess_encoding(content_bytes[:ENCODING_GUESS_SIZE]) or 'latin-1'
+		log.debug(f"Undeclared encoding, decoding as {encoding}")
+		return content_bytes.decode(encoding, errors='replace')
+
+
+def _sniff_encoding(content_bytes):
+	"""
+	Find the encoding a file declares
+
+	Args:
+		content_bytes (bytes): Content of the file
+
+	Returns:
+		tuple: (codec name or None, length of the BOM)
+	"""
+	for bom, encoding in ENCODING_BOMS:
+		if content_bytes.startswith(bom):
+			return encoding, len(bom)
 
-	for info in html_files:
+	head = content_bytes[:ENCODING_SNIFF_SIZE].decode('latin-1')
+	match = XML_ENCODING_PATTERN.search(head) or META_CHARSET_PATTERN.search(head)
+	if match:
 		try:
-			content_bytes = zf.read(info.filename)
-			html_text = _try_decode(content_bytes)
-
-			# Extract title from this file
-			title = _extract_title(html_text)
-			if not title:
-				title = os.path.splitext(_decode_filename(info.filename))[0]
-
-			# Extract text content
-			content = _extract_text_from_html(html_text)
-
-			if content.strip():
-				result['sections'].append({
-					'level': 1,
-					'title': title,
-					'content': content
-				})
-		except Exception as e:
-			log.debug(f"Error reading {info.filename}: {e}")
+			encoding = codecs.lookup(match.group(1)).name
+			return DECLARED_ENCODING_SUBSTITUTES.get(encoding, encoding), 0
+		except LookupError:
+			log.debug(f"Unknown encoding declared: {match.group(1)}")
+	return None, 0
 
-	return result
+
+def _decode_as(content_bytes, encoding):
+	"""Decode bytes, or None if they are not valid in the encoding"""
+	try:
+		return content_bytes.decode(encoding)
+	except (UnicodeDecodeError, LookupError):
+		return None
 
 
-def _try_decode(content_bytes):
-	"""Try to decode bytes to string with various encodings"""
-	encodings = ['utf-8', 'shift_jis', 'cp932', 'euc-jp', 'iso-2022-jp', 'latin-1']
-	for encoding in encodings:
-		try:
-			return content_bytes.decode(encoding)
-		except:
-			continue
-	return content_bytes.decode('utf-8', errors='replace')
+def _guess_encoding(sample):
+	"""Guess the encoding of a sample with the bundled charset_normalizer"""
+	try:
+		from charset_normalizer import from_bytes
+		match = from_bytes(sample).best()
+		return match.encoding if match else None
+	except Exception as e:
+		log.debug(f"Could not guess encoding: {e}")
+		return None
 
 
 def _extract_title(html_text):
@@ -280,33 +864,35 @@ def _extract_title(html_text):
 
 def _extract_text_from_html(html_text):
 	"""Extract plain text from HTML, preserving some structure"""
-	# Remove script and style
-	text = re.sub(r'<script[^>]*>.*?</script>', '', html_text, flags=re.IGNORECASE | re.DOTALL)
-	text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.IGNORECASE | re.DOTALL)
+	# <br>, </p> and </div> become line breaks, then scripts, styles,
+	# comments and the remaining tags go in one pass
+	text = HTML_BREAK_PATTERN.sub('\n', html_text)
+	text = HTML_MARKUP_PATTERN.sub('', text)
 
-	# Convert br and p to newlines
-	text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-	text = re.sub(r'</p>', '\n', text, flags=re.IGNORECASE)
-	text = re.sub(r'</div>', '\n', text, flags=re.IGNORECASE)
+	# Decode character references (named, decimal and hex)
+	if '&' in text:
+		text = HTML_ENTITY_PATTERN.sub(_replace_entity, text)
+
+	return _join_lines(text)
+
+
+def _replace_entity(match):
+	"""Replacement of a character reference"""
+	return _unescape_entity(match.group())
 
-	# Remove all other tags
-	text = re.sub(r'<[^>]+>', '', text)
 
-	# Decode HTML entities
-	text = re.sub(r'&nbsp;', ' ', text)
-	text = re.sub(r'&lt;', '<', text)
-	text = re.sub(r'&gt;', '>', text)
-	text = re.sub(r'&amp;', '&', text)
-	text = re.sub(r'&quot;', '"', text)
-	text = re.sub(r'&#(\d+);', lambda m: chr(int(m.group(1))), text)
+@functools.lru_cache(maxsize=ENTITY_CACHE_SIZE)
+def _unescape_entity(entity):
+	"""Decode one character reference as html.unescape does, &nbsp; giving a plain space"""
+	return html.unescape(entity).replace('\xa0', ' ')
 
-	# Clean up whitespace - strip each line and remove multiple empty lines
+
+def _join_lines(text):
+	"""Strip each line and remove the empty ones"""
 	lines = text.split('\n')
 	lines = [line.strip() for line in lines]  # Remove leading/trailing spaces from each line
 	lines = [line for line in lines if line]  # Remove empty lines
-	text = '\n'.join(lines)
-
-	return text
+	return '\n'.join(lines)
 
 
 def _clean_html(text):
@@ -320,7 +906,123 @@ def generate_html(daisy_content):
 	"""Generate navigable HTML from DAISY content"""
 	title = daisy_content.get('title', 'DAISY図書')
 	sections = daisy_content.get('sections', [])
+	return '\n'.join(iter_html(title, sections, sections))
+
+
+def iter_html(title, toc, sections):
+	"""
+	Generate navigable HTML line by line
+
+	The table of contents comes first, so it can be written before any
+	section text has been extracted.
+
+	Args:
+		title (str): Title of the book
+		toc (list): {level, title} of each section
+		sections (iterable): {level, title, content} of each section, in order
+
+	Yields:
+		str: Lines of the HTML document
+	"""
+	yield from _iter_html_head(title, toc)
+
+	# Generate content sections
+	for i, section in enumerate(sections):
+		level = min(section.get('level', 1), 6)
+		section_title = section.get('title', f'セクション {i+1}')
+		content = section.get('content', '')
+
+		yield f'<div class="section" id="section{i}">'
+		yield f'<h{level}>{section_title}</h{level}>'
+		if content:
+			# Escape HTML in content
+			content = content.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+			yield f'<div class="content">{content}</div>'
+		yield '</div>'
+
+	yield '</body>'
+	yield '</html>'
+
+
+def iter_progressive_html(title, toc, parts_url):
+	"""
+	Generate a page showing the table of contents and headings at once
+
+	Each section has a placeholder that a small script fills in from the
+	part files written by write_html_parts(), loading part0.js, part1.js,
+	... as they appear.
 
+	Args:
+		title (str): Title of the book
+		toc (list): {level, title} of each section
+		parts_url (str): URL of the part files directory, relative to the page
+
+	Yields:
+		str: Lines of the HTML document
+	"""
+	yield from _iter_html_head(title, toc)
+	yield '<p id="loading" role="status">本文を読み込み中...</p>'
+
+	for i, section in enumerate(toc):
+		level = min(section.get('level', 1), 6)
+		section_title = section.get('title', f'セクション {i+1}')
+		yield f'<div class="section" id="section{i}">'
+		yield f'<h{level}>{section_title}</h{level}>'
+		yield f'<div class="content" id="content{i}">読み込み中...</div>'
+		yield '</div>'
+
+	yield '<script>'
+	yield PROGRESSIVE_HTML_SCRIPT.replace('PARTS_URL', json.dumps(parts_url + '/part'))
+	yield '</script>'
+	yield '</body>'
+	yield '</html>'
+
+
+def write_html_parts(book, parts_dir):
+	"""
+	Extract the sections of a book into the part files of a progressive page
+
+	Parts are written in reading order, each one atomically, so the page
+	never loads a half-written part. The last part tells the page that
+	loading has finished, also when extraction failed.
+
+	Args:
+		book (DaisyBook): Open book, closed when done
+		parts_dir (str): Directory of the part files
+	"""
+	number = 0
+	first = 0
+	try:
+		contents = []
+		for section in book.iter_sections():
+			contents.append(section['content'])
+			if len(contents) == HTML_PART_SECTIONS:
+				_write_html_part(parts_dir, number, first, contents, False)
+				number += 1
+				first += len(contents)
+				contents = []
+		_write_html_part(parts_dir, number, first, contents, True)
+	except Exception as e:
+		log.error(f"Error extracting DAISY sections: {e}", exc_info=True)
+		try:
+			_write_html_part(parts_dir, number, first, [], True)
+		except OSError:
+			pass
+	finally:
+		book.close()
+
+
+def _write_html_part(parts_dir, number, first, contents, last):
+	"""Write one part file of a progressive page"""
+	path = os.path.join(parts_dir, f'part{number}.js')
+	script = f'sapieDaisyFill({first}, {json.dumps(contents, ensure_ascii=False)}, {json.dumps(last)});\n'
+	with open(path + '.tmp', 'w', encoding='utf-8') as f:
+		f.write(script)
+	os.replace(path + '.tmp', path)
+
+
+def _iter_html_head(title, toc):
+	"""Generate the head, title and table of contents of a book page"""
 	html_parts = [
 		'<!DOCTYPE html>',
 		'<html lang="ja">',
@@ -347,11 +1049,11 @@ def generate_html(daisy_content):
 	]
 
 	# Generate table of contents
-	if sections:
+	if toc:
 		html_parts.append('<nav>')
 		html_parts.append('<h2>目次</h2>')
 		html_parts.append('<ul>')
-		for i, section in enumerate(sections):
+		for i, section in enumerate(toc):
 			level = section.get('level', 1)
 			section_title = section.get('title', f'セクション {i+1}')
 			indent = '　' * (level - 1)
@@ -359,52 +1061,48 @@ def generate_html(daisy_content):
 		html_parts.append('</ul>')
 		html_parts.append('</nav>')
 
-	# Generate content sections
-	for i, section in enumerate(sections):
-		level = min(section.get('level', 1), 6)
-		section_title = section.get('title', f'セクション {i+1}')
-		content = section.get('content', '')
-
-		html_parts.append(f'<div class="section" id="section{i}">')
-		html_parts.append(f'<h{level}>{section_title}</h{level}>')
-		if content:
-			# Escape HTML in content
-			content = content.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-			html_parts.append(f'<div class="content">{content}</div>')
-		html_parts.append('</div>')
-
-	html_parts.extend([
-		'</body>',
-		'</html>'
-	])
-
-	return '\n'.join(html_parts)
+	return html_parts
 
 
 def open_daisy_in_browser(file_path):
-	"""Extract DAISY content and open in browser"""
-	try:
-		# Extract content
-		content = extract_daisy_content(file_path)
-
-		if not content['sections']:
-			return False, "DAISYコンテンツを抽出できませんでした"
-
-		# Generate HTML
-		html = generate_html(content)
-
-		# Save to temp file
-		temp_dir = tempfile.gettempdir()
-		safe_title = "".join(c if c.isalnum() or c in " -_" else "_" for c in content['title'])[:50]
-		html_path = os.path.join(temp_dir, f"{safe_title}_daisy.html")
-
-		with open(html_path, 'w', encoding='utf-8') as f:
-			f.write(html)
+	"""Extract DAISY content and open in browser
 
-		# Open in default browser
-		webbrowser.open(f'file:///{html_path.replace(os.sep, "/")}')
+	The page with the table of contents and every heading is written and
+	opened at once. The section texts are then extracted in the
+	background and filled into the open page as they are written.
+	"""
+	try:
+		book = DaisyBook(file_path)
+		try:
+			if not book.sections:
+				book.close()
+				return False, "DAISYコンテンツを抽出できませんでした"
+
+			# Save to temp files
+			temp_dir = tempfile.gettempdir()
+			safe_title = "".join(c if c.isalnum() or c in " -_" else "_" for c in book.title)[:50]
+			html_path = os.path.join(temp_dir, f"{safe_title}_daisy.html")
+			parts_name = f"{safe_title}_daisy_files"
+			parts_dir = os.path.join(temp_dir, parts_name)
+
+			# Parts of an earlier opening would be loaded before the new ones
+			shutil.rmtree(parts_dir, ignore_errors=True)
+			os.makedirs(parts_dir, exist_ok=True)
+
+			with open(html_path, 'w', encoding='utf-8') as f:
+				f.write('\n'.join(iter_progressive_html(book.title, book.sections, urllib.parse.quote(parts_name))))
+		except Exception:
+			book.close()
+			raise
+
+		# Open in default browser, then fill in the sections
+		try:
+			webbrowser.open(f'file:///{html_path.replace(os.sep, "/")}')
+		finally:
+			thread = threading.Thread(target=write_html_parts, args=(book, parts_dir), daemon=True)
+			thread.start()
 
-		return True, content['title']
+		return True, book.title
 
 	except Exception as e:
 		log.error(f"Error opening DAISY: {e}", exc_info=True)
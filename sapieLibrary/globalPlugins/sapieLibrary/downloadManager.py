@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+# Sapie Library - Queue of book downloads run by a pool of worker threads
+
+import os
+import json
+import time
+import logging
+import threading
+
+from . import resultCache
+
+log = logging.getLogger(__name__)
+
+# Number of books downloaded at the same time over the client's session
+DOWNLOAD_WORKERS = 2
+
+# Seconds stop() waits for the workers to leave their downloads
+STOP_TIMEOUT = 5.0
+
+# States of a queued download
+QUEUED = 'queued'
+DOWNLOADING = 'downloading'
+DONE = 'done'
+FAILED = 'failed'
+
+QUEUE_FILE_VERSION = 1
+
+
+class DownloadItem:
+	"""One book in the download queue"""
+
+	# Attributes written to the queue file
+	FIELDS = ('book_id', 'title', 'download_path', 'book_format', 's00202', 's00215',
+	          'status', 'file_path', 'error', 'added')
+
+	def __init__(self, book_id, title, download_path, book_format='BRL', s00202=None, s00215=None,
+	             status=QUEUED, file_path=None, error=None, added=None):
+		"""
+		Initialize a queued download
+
+		Args:
+			book_id (str): ID of the book to download (S00224 value)
+			title (str): Title of the book
+			download_path (str): Directory to save the file
+			book_format (str): Format of the book - 'BRL' (braille) or 'DAISY'
+			s00202 (str): Actual S00202 value from search results
+			s00215 (str): Actual S00215 value from search results
+			status (str): QUEUED, DOWNLOADING, DONE or FAILED
+			file_path (str): Path of the downloaded file
+			error (str): Error message of a failed download
+			added (float): Time the item was queued
+		"""
+		self.book_id = book_id
+		self.title = title
+		self.download_path = download_path
+		self.book_format = book_format
+		self.s00202 = s00202
+		self.s00215 = s00215
+		self.status = status
+		self.file_path = file_path
+		self.error = error
+		self.added = added or time.time()
+		# Progress of a running download (not written to the queue file)
+		self.received = 0
+		self.total = None
+		self.speed = 0.0
+		self.eta = None
+
+	@property
+	def key(self):
+		"""Key identifying the same book and data type across the queue"""
+		return f"{self.book_id}_{self.s00202 or ''}"
+
+	@property
+	def fraction(self):
+		"""Part of the book downloaded, from 0 to 1, or None if the length is unknown"""
+		if self.status == DONE:
+			return 1.0
+		if self.status == DOWNLOADING and self.total:
+			return min(self.received / self.total, 1.0)
+		if self.status == DOWNLOADING:
+			return None
+		return 0.0
+
+	@property
+	def finished(self):
+		"""Check if the download has completed or failed"""
+		return self.status in (DONE, FAILED)
+
+	@classmethod
+	def from_book(cls, book, download_path):
+		"""
+		Create a queued download from a search result
+
+		Args:
+			book (dict): Book dictionary from the client
+			download_path (str): Directory to save the file
+
+		Returns:
+			DownloadItem: Queued download
+		"""
+		return cls(
+			book.get('id', ''),
+			book.get('title', ''),
+			download_path,
+			book.get('format', 'BRL'),
+			book.get('s00202', None),
+			book.get('s00215', None)
+		)
+
+	def to_dict(self):
+		"""Get the attributes written to the queue file"""
+		return {field: getattr(self, field) for field in self.FIELDS}
+
+	@classmethod
+	def from_dict(cls, data):
+		"""Create an item from the attributes read from the queue file"""
+		return cls(**{field: data.get(field) for field in cls.FIELDS if field in data})
+
+
+class DownloadManager:
+	"""
+	Downloads queued books with a bounded pool of worker threads
+
+	All workers share one SapieClient, and therefore its session and
+	connection pool. Unfinished items are written to a queue file, so a
+	batch interrupted by closing the dialog or restarting NVDA is picked
+	up again the next time a manager is created.
+	"""
+
+	def __init__(self, client, workers=DOWNLOAD_WORKERS, queue_path=None, on_update=None):
+		"""
+		Initialize the manager
+
+		Args:
+			client: Logged in SapieClient instance
+			workers (int): Maximum number of concurrent downloads
+			queue_path (str): Queue file, defaults to downloads.json in the cache directory
+			on_update (callable): Called from worker threads with (item, progress)
+				whenever an item changes state or reports download progress;
+				progress is get_progress()
+		"""
+		self.client = client
+		self.workers = max(1, workers)
+		self.queue_path = queue_path or os.path.join(resultCache.get_cache_dir(), 'downloads.json')
+		self.on_update = on_update
+		self.items = []
+		self._cond = threading.Condition()
+		self._threads = []
+		self._stopped = False
+		# Set by stop() to cut off the downloads in progress
+		self._cancel = threading.Event()
+		self._load()
+
+	def add(self, books, download_path):
+		"""
+		Queue books for download
+
+		Books already waiting or being downloaded are not queued twice.
+		Items of an earlier batch that has finished are dropped first, so
+		the aggregate progress counts the new batch only.
+
+		Args:
+			books (list): Book dictionaries from the client
+			download_path (str): Directory to save the files
+
+		Returns:
+			list: Newly queued DownloadItem objects
+		"""
+		added = []
+		with self._cond:
+			if all(item.finished for item in self.items):
+				self.items = []
+
+			pending = {item.key for item in self.items if not item.finished}
+			for book in books:
+				item = DownloadItem.from_book(book, download_path)
+				if item.key in pending:
+					log.info(f"Already queued: {item.title}")
+					continue
+				pending.add(item.key)
+				self.items.append(item)
+				added.append(item)
+
+			if added:
+				self._save()
+				self._cond.notify_all()
+
+		log.info(f"Queued {len(added)} downloads")
+		self.start()
+		return added
+
+	def start(self):
+		"""Start worker threads for the waiting items, up to the pool size"""
+		with self._cond:
+			if self._stopped:
+				return
+			self._threads = [thread for thread in self._threads if thread.is_alive()]
+			waiting = sum(1 for item in self.items if item.status == QUEUED)
+			while waiting and len(self._threads) < self.workers:
+				thread = threading.Thread(target=self._run, daemon=True)
+				self._threads.append(thread)
+				thread.start()
+				waiting -= 1
+
+	def stop(self, timeout=STOP_TIMEOUT):
+		"""
+		Stop the workers before the client is closed
+
+		Downloads in progress are cut off and go back to QUEUED, keeping
+		their .part files, so they resume with the rest of the queue the
+		next time a manager is created.
+
+		Args:
+			timeout (float): Seconds to wait for the workers to finish
+		"""
+		with self._cond:
+			self._stopped = True
+			self.on_update = None
+			self._cancel.set()
+			self._cond.notify_all()
+			threads = list(self._threads)
+
+		deadline = time.monotonic() + timeout
+		for thread in threads:
+			thread.join(max(0.0, deadline - time.monotonic()))
+			if thread.is_alive():
+				log.warning("Download worker did not stop in time")
+
+	def get_pending(self):
+		"""
+		Get the items that have not finished
+
+		Returns:
+			list: DownloadItem objects waiting or being downloaded
+		"""
+		with self._cond:
+			return [item for item in self.items if not item.finished]
+
+	def get_progress(self):
+		"""
+		Get the aggregate progress of the current batch
+
+		Returns:
+			dict: Number of items in total, done, failed, downloading and
+				queued; 'fraction' of the batch that has finished (failed books
+				count as finished, books of unknown length as not started) and
+				the combined 'speed' in bytes per second
+		"""
+		with self._cond:
+			return self._get_progress()
+
+	def _get_progress(self):
+		"""Count the items by state (lock held)"""
+		progress = {'total': len(self.items), DONE: 0, FAILED: 0, DOWNLOADING: 0, QUEUED: 0}
+		downloaded = 0.0
+		speed = 0.0
+		for item in self.items:
+			progress[item.status] += 1
+			downloaded += 1.0 if item.finished else item.fraction or 0.0
+			if item.status == DOWNLOADING:
+				speed += item.speed
+		progress['fraction'] = downloaded / len(self.items) if self.items else 0.0
+		progress['speed'] = speed
+		return progress
+
+	def _run(self):
+		"""Worker thread: download queued items until the queue is empty"""
+		while True:
+			with self._cond:
+				item = None
+				if not self._stopped:
+					item = next((item for item in self.items if item.status == QUEUED), None)
+				if item is None:
+					return
+				item.status = DOWNLOADING
+				self._save()
+			self._notify(item)
+
+			def onProgress(received, total, speed, eta, item=item):
+				item.received = received
+				item.total = total
+				item.speed = speed
+				item.eta = eta
+				self._notify(item)
+
+			try:
+				log.info(f"Downloading {item.title} ({item.book_id})")
+				success, result = self.client.download_book(
+					item.book_id, item.download_path, item.book_format, item.s00202, item.s00215,
+					progress_callback=onProgress, cancel_event=self._cancel
+				)
+			except Exception as e:
+				log.error(f"Download worker error: {e}", exc_info=True)
+				success, result = False, str(e)
+
+			with self._cond:
+				item.speed = 0.0
+				item.eta = None
+				if success:
+					item.status = DONE
+					item.file_path = result
+				elif self._cancel.is_set():
+					# Cut off by stop(), or by the client closing under it
+					item.status = QUEUED
+				else:
+					item.status = FAILED
+					item.error = result
+				self._save()
+			self._notify(item)
+
+	def _notify(self, item):
+		"""Pass a state change to the update callback"""
+		callback = self.on_update
+		if not callback:
+			return
+		try:
+			callback(item, self.get_progress())
+		except Exception as e:
+			log.error(f"Download update callback error: {e}", exc_info=True)
+
+	def _load(self):
+		"""Read the unfinished items of the queue file"""
+		if not os.path.exists(self.queue_path):
+			return
+
+		try:
+			with open(self.queue_path, 'r', encoding='utf-8') as f:
+				data = json.load(f)
+			if data.get('version') != QUEUE_FILE_VERSION:
+				return
+
+			for entry in data.get('items', []):
+				item = DownloadItem.from_dict(entry)
+				if item.finished:
+					continue
+				# Downloads cut off by a restart resume from their .part file
+				item.status = QUEUED
+				self.items.append(item)
+			if self.items:
+				log.info(f"Restored {len(self.items)} queued downloads")
+		except Exception as e:
+			log.warning(f"Could not read download queue: {e}")
+			self.items = []
+
+	def _save(self):
+		"""Write the queue file atomically (lock held)"""
+		try:
+			data = {
+				'version': QUEUE_FILE_VERSION,
+				'items': [item.to_dict() for item in self.items]
+			}
+			os.makedirs(os.path.dirname(self.queue_path), exist_ok=True)
+			temp_path = self.queue_path + '.tmp'
+			with open(temp_path, 'w', encoding='utf-8') as f:
+				json.dump(data, f, ensure_ascii=False)
+			os.replace(temp_path, self.queue_path)
+		except Exception as e:
+			log.warning(f"Could not write download queue: {e}")
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+# Sapie Library - Single-pass extraction of library pages
+
+import re
+import logging
+from html.parser import HTMLParser
+
+log = logging.getLogger(__name__)
+
+# Tags whose text is not part of the page text
+IGNORED_TEXT_TAGS = ('script', 'style')
+
+# Session tokens the library expects on every request
+SESSION_TOKEN_NAMES = ("S00102", "S00103", "RTNTME")
+
+# Session tokens embedded in pages as hidden inputs or in link query strings
+SESSION_TOKEN_INPUT_PATTERN = re.compile(rb'<input\b[^>]*\b(?:S00102|S00103|RTNTME)\b[^>]*>', re.IGNORECASE)
+SESSION_TOKEN_ATTR_PATTERN = re.compile(
+	rb'\b(name|value)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))',
+	re.IGNORECASE
+)
+SESSION_TOKEN_QUERY_PATTERN = re.compile(rb'[?&;](S00102|S00103|RTNTME)=([^&"\'\s<>]+)')
+
+
+class Cell:
+	"""Text, first link and inputs of one table cell or link"""
+
+	def __init__(self, href=''):
+		self.href = href
+		self.texts = []
+		self.link = None
+		self.inputs = {}
+
+	def get_text(self):
+		"""Text of the element, stripped like BeautifulSoup's get_text(strip=True)"""
+		return ''.join(self.texts)
+
+
+class PageContents:
+	"""Everything the client reads from a library page"""
+
+	def __init__(self):
+		# Rows of the first table.FULL, each a list of td cells
+		self.result_rows = []
+		# Links inside the first ul.pager (Cell with href and text)
+		self.pager_links = []
+		# (name, value) of every hidden input, in document order
+		self.hidden_inputs = []
+		# (th text, td text) of every table row that has both
+		self.detail_rows = []
+		self._texts = []
+
+	@property
+	def text(self):
+		"""Text of the whole page, like BeautifulSoup's get_text()"""
+		return ''.join(self._texts)
+
+
+class PageParser(HTMLParser):
+	"""
+	Streaming parser collecting results, pager links, hidden inputs and
+	detail rows in one pass, without building a document tree
+
+	Only the elements the client reads are materialised. Text is gathered
+	per element in the same way BeautifulSoup's get_text(strip=True) does.
+	"""
+
+	def __init__(self):
+		super().__init__(convert_charrefs=True)
+		self.page = PageContents()
+		# Open elements of interest as (tag, Cell or row dict)
+		self._open = []
+		self._rows = []
+		self._pending = []
+		self._ignoredDepth = 0
+		self._resultsTableDepth = 0
+		self._resultsTableDone = False
+		self._pagerDepth = 0
+		self._pagerDone = False
+
+	def handle_starttag(self, tag, attrs):
+		self._flush()
+		attrs = dict(attrs)
+
+		if tag in IGNORED_TEXT_TAGS:
+			self._ignoredDepth += 1
+		elif tag == 'table':
+			if self._resultsTableDepth:
+				self._resultsTableDepth += 1
+			elif not self._resultsTableDone and 'FULL' in (attrs.get('class') or '').split():
+				self._resultsTableDepth = 1
+		elif tag == 'ul':
+			if self._pagerDepth:
+				self._pagerDepth += 1
+			elif not self._pagerDone and 'pager' in (attrs.get('class') or '').split():
+				self._pagerDepth = 1
+		elif tag == 'tr':
+			row = {'th': None, 'td': None, 'cells': None}
+			self._rows.append(row)
+			if self._resultsTableDepth:
+				row['cells'] = []
+				self.page.result_rows.append(row['cells'])
+			self._open.append(('tr', row))
+		elif tag in ('th', 'td'):
+			self._startCell(tag)
+		elif tag == 'a':
+			self._startLink(attrs.get('href') or '')
+		elif tag == 'input':
+			self._addInput(attrs)
+
+	def handle_endtag(self, tag):
+		self._flush()
+
+		if tag in IGNORED_TEXT_TAGS:
+			if self._ignoredDepth:
+				self._ignoredDepth -= 1
+		elif tag == 'table':
+			if self._resultsTableDepth:
+				self._resultsTableDepth -= 1
+				if not self._resultsTableDepth:
+					self._resultsTableDone = True
+		elif tag == 'ul':
+			if self._pagerDepth:
+				self._pagerDepth -= 1
+				if not self._pagerDepth:
+					self._pagerDone = True
+
+		# Close the most recent open element with this tag and everything
+		# opened inside it
+		for index in range(len(self._open) - 1, -1, -1):
+			if self._open[index][0] == tag:
+				del self._open[index:]
+				break
+
+	def handle_data(self, data):
+		if not self._ignoredDepth:
+			self._pending.append(data)
+
+	def handle_comment(self, data):
+		self._flush()
+
+	def handle_decl(self, decl):
+		self._flush()
+
+	def handle_pi(self, data):
+		self._flush()
+
+	def close(self):
+		super().close()
+		self._flush()
+		self._open = []
+		self.page.detail_rows = [
+			(row['th'].get_text(), row['td'].get_text())
+			for row in self._rows
+			if row['th'] is not None and row['td'] is not None
+		]
+
+	def _flush(self):
+		"""Pass text collected since the last tag to the page and open elements"""
+		if not self._pending:
+			return
+		data = ''.join(self._pending)
+		self._pending = []
+		self.page._texts.append(data)
+		stripped = data.strip()
+		if stripped:
+			for tag, item in self._open:
+				if isinstance(item, Cell):
+					item.texts.append(stripped)
+
+	def _startCell(self, tag):
+		"""Open a th/td: first cell of its kind per row, and result cells"""
+		cell = Cell()
+		used = False
+		for openTag, item in self._open:
+			if openTag == 'tr' and item[tag] is None:
+				item[tag] = cell
+				used = True
+		if tag == 'td':
+			row = self._innermostRow()
+			if row is not None and row['cells'] is not None:
+				row['cells'].append(cell)
+				used = True
+		if used:
+			self._open.append((tag, cell))
+
+	def _startLink(self, href):
+		"""Open a link inside the pager or inside result cells"""
+		link = Cell(href)
+		used = False
+		if self._pagerDepth:
+			self.page.pager_links.append(link)
+			used = True
+		for tag, item in self._open:
+			if tag == 'td' and isinstance(item, Cell) and item.link is None:
+				item.link = link
+				used = True
+		if used:
+			self._open.append(('a', link))
+
+	def _addInput(self, attrs):
+		"""Record hidden inputs and the first input of each name per cell"""
+		name = attrs.get('name')
+		value = attrs.get('value') or ''
+		if attrs.get('type') == 'hidden':
+			self.page.hidden_inputs.append((name, value))
+		if name:
+			for tag, item in self._open:
+				if tag == 'td' and isinstance(item, Cell):
+					item.inputs.setdefault(name, value)
+
+	def _innermostRow(self):
+		"""Return the most recently opened table row"""
+		for tag, item in reversed(self._open):
+			if tag == 'tr':
+				return item
+		return None
+
+
+def parse_page(html):
+	"""
+	Extract the parts of a library page the client uses in a single pass
+
+	Args:
+		html (str): Decoded HTML of the page
+
+	Returns:
+		PageContents: Result rows, pager links, hidden inputs and detail rows
+	"""
+	parser = PageParser()
+	parser.feed(html)
+	parser.close()
+	return parser.page
+
+
+class LibraryPage:
+	"""
+	A library response that is decoded and parsed at most once
+
+	Every consumer of a response shares this object: the body is decoded
+	on first use, run through PageParser once, and only turned into a
+	BeautifulSoup tree when a caller needs arbitrary lookups.
+	"""
+
+	def __init__(self, response, encoding='shift_jis', errors='replace'):
+		"""
+		Args:
+			response (requests.Response): Response of a library request
+			encoding (str): Encoding of the page body
+			errors (str): How undecodable bytes are handled
+		"""
+		self.response = response
+		self.encoding = encoding
+		self.errors = errors
+		# Result dictionaries of a results page, filled in by the client
+		self.results = None
+		self._html = None
+		self._contents = None
+		self._soup = None
+		self._tokens = None
+
+	@property
+	def url(self):
+		"""Final URL of the response"""
+		return self.response.url
+
+	@property
+	def status_code(self):
+		"""HTTP status code of the response"""
+		return self.response.status_code
+
+	@property
+	def content(self):
+		"""Raw body of the response"""
+		return self.response.content
+
+	@property
+	def is_html(self):
+		"""Check if the response is an HTML page"""
+		content_type = self.response.headers.get('Content-Type', '')
+		return not content_type or 'html' in content_type
+
+	@property
+	def html(self):
+		"""Decoded HTML of the page"""
+		if self._html is None:
+			self._html = str(self.response.content, self.encoding, errors=self.errors)
+		return self._html
+
+	@property
+	def contents(self):
+		"""Parts of the page extracted by PageParser"""
+		if self._contents is None:
+			self._contents = parse_page(self.html)
+		return self._contents
+
+	@property
+	def soup(self):
+		"""Full BeautifulSoup tree of the page, for lookups PageParser does not cover"""
+		if self._soup is None:
+			from bs4 import BeautifulSoup
+			self._soup = BeautifulSoup(self.html, 'html.parser')
+		return self._soup
+
+	@property
+	def tokens(self):
+		"""
+		Session tokens found in the page
+
+		Read with a byte-level scan so that tokens can be harvested from every
+		response without decoding or parsing it.
+		"""
+		if self._tokens is None:
+			content = self.content or b''
+			# Query strings first so that hidden inputs of the form take precedence
+			tokens = {}
+			for name, value in SESSION_TOKEN_QUERY_PATTERN.findall(content):
+				tokens[name.decode('ascii')] = value.decode('ascii', errors='ignore')
+
+			for tag in SESSION_TOKEN_INPUT_PATTERN.findall(content):
+				attrs = {}
+				for attr, *values in SESSION_TOKEN_ATTR_PATTERN.findall(tag):
+					attrs[attr.lower()] = b''.join(values).decode('ascii', errors='ignore')
+				name = attrs.get(b'name')
+				if name in SESSION_TOKEN_NAMES and attrs.get(b'value'):
+					tokens[name] = attrs[b'value']
+			self._tokens = tokens
+		return self._tokens
+
+	@property
+	def text(self):
+		"""Text of the whole page"""
+		return self.contents.text
+
+	@property
+	def result_rows(self):
+		"""Rows of the first table.FULL"""
+		return self.contents.result_rows
+
+	@property
+	def pager_links(self):
+		"""Links inside the first ul.pager"""
+		return self.contents.pager_links
+
+	@property
+	def hidden_inputs(self):
+		"""(name, value) of every hidden input"""
+		return self.contents.hidden_inputs
+
+	@property
+	def detail_rows(self):
+		"""(th text, td text) of every table row that has both"""
+		return self.contents.detail_rows
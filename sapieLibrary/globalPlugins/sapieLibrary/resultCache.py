@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+# Sapie Library - Persistent cache of search results
+
+import os
+import json
+import zlib
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+# Seconds a cached result list stays valid, per client endpoint
+RESULT_CACHE_TTLS = {
+	"search": 6 * 60 * 60,
+	"detailed_search": 6 * 60 * 60,
+	"genre_search": 6 * 60 * 60,
+	"new_arrivals": 60 * 60,
+	"popular_books": 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+
+# Seconds cached book details stay valid
+DETAIL_TTL = 24 * 60 * 60
+
+# Upper bound of the cached results (uncompressed JSON size in bytes)
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+# Result fields that are only valid within one library session
+SESSION_RESULT_FIELDS = ('s00221',)
+
+# Version 2 scopes the keys by account; unscoped version 1 files are dropped
+CACHE_FILE_VERSION = 2
+
+# Seconds between a change and the write of the cache file, so a burst of
+# puts (e.g. prefetched details) is written once
+FLUSH_DELAY = 5.0
+
+
+def get_cache_dir():
+	"""
+	Get the directory for the add-on's cache files
+
+	Returns:
+		str: Directory inside the NVDA user configuration directory, or in the
+			home directory when not running inside NVDA
+	"""
+	try:
+		import globalVars
+		base_dir = globalVars.appArgs.configPath
+	except (ImportError, AttributeError):
+		base_dir = os.path.expanduser('~')
+	return os.path.join(base_dir, 'sapieLibrary')
+
+
+def make_key(endpoint, book_type, params, account=None):
+	"""
+	Build a normalised cache key for a query
+
+	Whitespace in text parameters is trimmed and collapsed, and empty
+	parameters are dropped, so equivalent queries share an entry. The
+	account is part of the key: the cache files are shared by everyone
+	using the NVDA profile.
+
+	Args:
+		endpoint (str): Client endpoint name (e.g. "search")
+		book_type (str): Type of book
+		params (dict): Query parameters
+		account (str): Sapie user ID the results were fetched for
+
+	Returns:
+		str: Cache key
+	"""
+	normalised = {}
+	for name, value in (params or {}).items():
+		if isinstance(value, str):
+			value = ' '.join(value.split())
+		if value is None or value == '':
+			continue
+		normalised[str(name)] = value
+	return json.dumps([account or '', endpoint, book_type or '', normalised], ensure_ascii=False, sort_keys=True)
+
+
+class ResultCache:
+	"""Result lists of recent queries, kept in memory and persisted to disk"""
+
+	def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, ttls=None):
+		"""
+		Initialize the cache
+
+		Args:
+			path (str): Cache file, defaults to results.cache in get_cache_dir()
+			max_bytes (int): Size bound of the cached results
+			ttls (dict): Seconds entries stay valid, per endpoint
+		"""
+		self.path = path or os.path.join(get_cache_dir(), 'results.cache')
+		self.max_bytes = max_bytes
+		self.ttls = dict(RESULT_CACHE_TTLS)
+		if ttls:
+			self.ttls.update(ttls)
+		self.hits = 0
+		self.misses = 0
+		self._lock = threading.Lock()
+		# Serializes writes of the cache file, taken before self._lock
+		self._write_lock = threading.Lock()
+		# key -> [endpoint, created, size, results], least recently used first
+		self._entries = None
+		self._size = 0
+		# Whether the entries changed since the file was written
+		self._dirty = False
+		self._flush_timer = None
+
+	def get(self, endpoint, book_type, params, account=None):
+		"""
+		Look up the cached results of a query
+
+		Args:
+			endpoint (str): Client endpoint name
+			book_type (str): Type of book
+			params (dict): Query parameters
+			account (str): Sapie user ID of the logged in user
+
+		Returns:
+			list or None: Copy of the cached results, or None if not cached or expired
+		"""
+		key = make_key(endpoint, book_type, params, account)
+		with self._lock:
+			self._load()
+			entry = self._entries.get(key)
+			if entry is None:
+				self.misses += 1
+				return None
+
+			if time.time() - entry[1] > self.ttls.get(endpoint, DEFAULT_TTL):
+				self._remove(key)
+				self.misses += 1
+				return None
+
+			self._entries.move_to_end(key)
+			self.hits += 1
+			return [dict(result) for result in entry[3]]
+
+	def put(self, endpoint, book_type, params, results, account=None):
+		"""
+		Store the results of a query
+
+		The cache file is written FLUSH_DELAY seconds later, or by flush().
+
+		Args:
+			endpoint (str): Client endpoint name
+			book_type (str): Type of book
+			params (dict): Query parameters
+			results (list): Result dictionaries
+			account (str): Sapie user ID of the logged in user
+		"""
+		key = make_key(endpoint, book_type, params, account)
+		stored = []
+		for result in results:
+			result = dict(result)
+			for field in SESSION_RESULT_FIELDS:
+				if field in result:
+					result[field] = ''
+			stored.append(result)
+		size = len(json.dumps(stored, ensure_ascii=False).encode('utf-8'))
+		if size > self.max_bytes:
+			log.debug(f"Not caching {endpoint} results: {size} bytes")
+			return
+
+		with self._lock:
+			self._load()
+			self._remove(key)
+			self._entries[key] = [endpoint, time.time(), size, stored]
+			self._size += size
+			self._evict()
+			self._dirty = True
+			if self._flush_timer is None:
+				self._flush_timer = threading.Timer(FLUSH_DELAY, self.flush)
+				self._flush_timer.daemon = True
+				self._flush_timer.start()
+
+	def flush(self):
+		"""
+		Write the cache file if entries changed
+
+		The entries are copied under the lock; serializing, compressing and
+		writing them happen outside it, so lookups are not held up.
+		"""
+		with self._write_lock:
+			with self._lock:
+				self._cancel_flush()
+				if not self._dirty:
+					return
+				self._dirty = False
+				entries = [[key] + entry for key, entry in self._entries.items()]
+			self._save(entries)
+
+	def close(self):
+		"""Write pending changes"""
+		self.flush()
+
+	def clear(self):
+		"""Remove all entries and the cache file"""
+		with self._write_lock:
+			with self._lock:
+				self._cancel_flush()
+				self._entries = OrderedDict()
+				self._size = 0
+				self._dirty = False
+				try:
+					os.remove(self.path)
+				except OSError:
+					pass
+
+	def get_stats(self):
+		"""
+		Get cache statistics
+
+		Returns:
+			dict: Number of entries, their size in bytes, hits and misses
+		"""
+		with self._lock:
+			self._load()
+			return {
+				'entries': len(self._entries),
+				'bytes': self._size,
+				'hits': self.hits,
+				'misses': self.misses
+			}
+
+	def _cancel_flush(self):
+		"""Cancel the scheduled write (lock held)"""
+		if self._flush_timer is not None:
+			self._flush_timer.cancel()
+			self._flush_timer = None
+
+	def _remove(self, key):
+		"""Remove one entry (lock held)"""
+		entry = self._entries.pop(key, None)
+		if entry is not None:
+			self._size -= entry[2]
+
+	def _evict(self):
+		"""Drop least recently used entries until the size bound is met (lock held)"""
+		while self._size > self.max_bytes and self._entries:
+			key, entry = self._entries.popitem(last=False)
+			self._size -= entry[2]
+			log.debug(f"Evicted cached {entry[0]} results")
+
+	def _load(self):
+		"""Read the cache file on first use (lock held)"""
+		if self._entries is not None:
+			return
+
+		self._entries = OrderedDict()
+		self._size = 0
+		if not os.path.exists(self.path):
+			return
+
+		try:
+			with open(self.path, 'rb') as f:
+				data = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+			if data.get('version') != CACHE_FILE_VERSION:
+				return
+
+			now = time.time()
+			for key, endpoint, created, size, results in data.get('entries', []):
+				# Entries that expired while NVDA was not running are dropped
+				if now - created <= self.ttls.get(endpoint, DEFAULT_TTL):
+					self._entries[key] = [endpoint, created, size, results]
+					self._size += size
+			self._evict()
+			log.debug(f"Loaded {len(self._entries)} cached result lists")
+		except Exception as e:
+			log.warning(f"Could not read result cache: {e}")
+			self._entries = OrderedDict()
+			self._size = 0
+
+	def _save(self, entries):
+		"""Write the cache file atomically (write lock held)"""
+		try:
+			data = {
+				'version': CACHE_FILE_VERSION,
+				'entries': entries
+			}
+			payload = zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+			os.makedirs(os.path.dirname(self.path), exist_ok=True)
+			temp_path = self.path + '.tmp'
+			with open(temp_path, 'wb') as f:
+				f.write(payload)
+			os.replace(temp_path, self.path)
+		except Exception as e:
+			log.warning(f"Could not write result cache: {e}")
+
+
+class DetailCache(ResultCache):
+	"""Book details keyed by book ID (S00222), kept in memory and on disk"""
+
+	def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, ttl=DETAIL_TTL):
+		"""
+		Initialize the cache
+
+		Args:
+			path (str): Cache file, defaults to details.cache in get_cache_dir()
+			max_bytes (int): Size bound of the cached details
+			ttl (int): Seconds details stay valid
+		"""
+		super().__init__(
+			path or os.path.join(get_cache_dir(), 'details.cache'),
+			max_bytes,
+			{'book_details': ttl}
+		)
+
+	def get_details(self, s00222, account=None):
+		"""
+		Look up the cached details of a book
+
+		Args:
+			s00222 (str): Book ID
+			account (str): Sapie user ID of the logged in user
+
+		Returns:
+			dict or None: Copy of the cached details, or None if not cached or expired
+		"""
+		results = self.get('book_details', None, {'s00222': s00222}, account)
+		return results[0] if results else None
+
+	def put_details(self, s00222, details, account=None):
+		"""
+		Store the details of a book
+
+		Args:
+			s00222 (str): Book ID
+			details (dict): Detail labels and values
+			account (str): Sapie user ID of the logged in user
+		"""
+		self.put('book_details', None, {'s00222': s00222}, [details], account)
@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 # Sapie Library Client - requests + BeautifulSoup based implementation
 
+import os
+import json
 import time
 import logging
 import re
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import requests and BeautifulSoup
 try:
@@ -12,25 +17,98 @@ try:
 except ImportError as e:
 	raise ImportError(f"Required libraries not found: {e}")
 
+from . import pageParser
+from . import transport
+
 # Set up logging
 log = logging.getLogger(__name__)
 
+# Base URL for relative links found in library pages
+LIBRARY_CGI_URL = "https://library.sapie.or.jp/cgi-bin/"
+
+# Safety limit to prevent runaway pagination
+MAX_RESULT_PAGES = 100
+
+# Number of result pages fetched in parallel over the shared session
+PAGE_FETCH_WORKERS = 4
+
+# Number of popular book rankings fetched in parallel (each one also
+# fetches its pages with PAGE_FETCH_WORKERS)
+RANKING_FETCH_WORKERS = 3
+
+# All popular book rankings: (S00201 value, ranking name, book type)
+POPULAR_RANKINGS = (
+	("3", "デイジーダウンロード", "daisy"),
+	("4", "デイジー再生", "daisy"),
+	("22", "録音オンラインリクエスト", "daisy"),
+	("1", "点字ダウンロード", "braille"),
+	("21", "点字オンラインリクエスト", "braille")
+)
+
+# Number of background threads prefetching book details
+DETAIL_PREFETCH_WORKERS = 2
+
+# Seconds to wait for a detail fetch of the same book that is already running
+DETAIL_WAIT_TIMEOUT = 30
+
+# Bytes read from the network per chunk when downloading a book
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Minimum seconds between two progress reports of a download
+DOWNLOAD_PROGRESS_INTERVAL = 0.5
+
+# Suffixes of unfinished downloads and of their resume information
+PART_SUFFIX = '.part'
+MANIFEST_SUFFIX = '.part.json'
+
+# Messages shown by the library when a query has no results
+NO_RESULTS_MARKERS = ("該当するデータが見つかりませんでした", "検索結果：0件")
+
+# Messages shown by the library when the session tokens are no longer valid
+# (Shift_JIS encoded, as they are matched against the raw response body)
+SESSION_EXPIRED_MARKERS = tuple(
+	marker.encode('shift_jis') for marker in ("セッションが切れ", "タイムアウトしました", "再度ログイン")
+)
+
 class SapieClient:
 	"""Client for accessing Sapie Library using requests"""
 
-	def __init__(self):
-		"""Initialize the Sapie client"""
+	def __init__(self, result_cache=None, detail_cache=None):
+		"""
+		Initialize the Sapie client
+
+		Args:
+			result_cache (resultCache.ResultCache): Optional cache of result lists
+			detail_cache (resultCache.DetailCache): Optional cache of book details
+		"""
 		self.session = requests.Session()
 		self.LOGIN_URL = "https://member.sapie.or.jp/login"
 		self.LIBRARY_BASE_URL = "https://library.sapie.or.jp/cgi-bin/CN1MN1"
 		self.logged_in = False
 		self.session_tokens = {}
 		self.username = None
+		self.result_cache = result_cache
+		self.detail_cache = detail_cache
+
+		# Book IDs whose details are being fetched, to share one request
+		self._detail_lock = threading.Lock()
+		self._detail_fetches = {}
+
+		# Per-thread state of the query being collected
+		self._query_state = threading.local()
+
+		# Session token bookkeeping (tokens are harvested from every page)
+		self._token_lock = threading.Lock()
+		self._tokens_expired = False
+		self.token_stats = {'harvested': 0, 'fetched': 0, 'saved': 0, 'expired': 0}
 
 		# Disable proxy to avoid connection issues
 		self.session.trust_env = False
 		self.session.proxies = {'http': None, 'https': None}
 
+		# Pooled keep-alive connections with timeouts and retries per host
+		self.adapters = transport.configure_session(self.session)
+
 		# Set user agent to avoid being blocked
 		self.session.headers.update({
 			'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -52,16 +130,18 @@ class SapieClient:
 		try:
 			log.info(f"Attempting login for user: {username}")
 
+			# Tokens of a previous session are no longer valid
+			self.session_tokens = {}
+
 			# First, get the login page to extract CSRF token and cookies
-			response = self.session.get(self.LOGIN_URL)
-			response.encoding = 'shift_jis'
+			page = self._get_page(self.LOGIN_URL)
 
-			if response.status_code != 200:
-				log.error(f"Failed to access login page: {response.status_code}")
-				return (False, f"ログインページにアクセスできませんでした: {response.status_code}")
+			if page.status_code != 200:
+				log.error(f"Failed to access login page: {page.status_code}")
+				return (False, f"ログインページにアクセスできませんでした: {page.status_code}")
 
 			# Parse the page to get CSRF token
-			soup = BeautifulSoup(response.text, 'html.parser')
+			soup = page.soup
 
 			# Extract CSRF token (Rails uses authenticity_token)
 			csrf_token = None
@@ -84,15 +164,14 @@ class SapieClient:
 			log.info(f"Submitting login with fields: {list(login_data.keys())}")
 
 			# Submit login form
-			response = self.session.post(self.LOGIN_URL, data=login_data, allow_redirects=True)
-			response.encoding = 'shift_jis'
+			page = self._post_page(self.LOGIN_URL, data=login_data, allow_redirects=True)
 
-			log.info(f"Login response URL: {response.url}")
-			log.info(f"Login response status: {response.status_code}")
+			log.info(f"Login response URL: {page.url}")
+			log.info(f"Login response status: {page.status_code}")
 
 			# Parse the response to check for errors first
-			# Use response.content with explicit encoding to avoid mojibake
-			soup = BeautifulSoup(response.content, 'html.parser', from_encoding='shift_jis')
+			# The page is decoded as Shift_JIS explicitly to avoid mojibake
+			soup = page.soup
 
 			# Check for login error in page title (most reliable check)
 			page_title = soup.find('p', class_='acc')
@@ -120,15 +199,15 @@ class SapieClient:
 
 			# Check if login was successful by checking the final URL
 			# Successful login should redirect to member page or library
-			if "member" in response.url or "library" in response.url:
+			if "member" in page.url or "library" in page.url:
 				self.logged_in = True
 				self.username = username
-				self._extract_session_tokens()
+				self._ensure_session_tokens()
 				log.info("Login successful")
 				return (True, f"ログイン成功: {username}")
 
 			# Check for other error messages in the response
-			if "エラー" in response.text or "error" in response.text.lower():
+			if "エラー" in page.html or "error" in page.html.lower():
 				error_div = soup.find('div', class_='error') or soup.find('div', class_='alert')
 				if error_div:
 					error_text = error_div.get_text(strip=True)
@@ -145,215 +224,273 @@ class SapieClient:
 			log.error(f"Login error: {e}", exc_info=True)
 			return (False, f"ログインエラー: {str(e)}")
 
-	def search(self, book_type="braille", search_params=None):
+	def search(self, book_type="braille", search_params=None, on_page=None):
 		"""
 		Search for books
 
 		Args:
 			book_type (str): Type of book - "braille" or "daisy"
 			search_params (dict): Search parameters (title, author, etc.)
+			on_page (callable): Optional callback receiving the results of each page
 
 		Returns:
 			tuple: (success: bool, results: list or error_message: str)
 		"""
-		if not self.logged_in:
-			return (False, "ログインしてください。")
+		return self._collect_results(
+			self.iter_search(book_type, search_params),
+			"Search", "検索エラー", on_page,
+			("search", book_type, search_params)
+		)
+
+	def iter_search(self, book_type="braille", search_params=None):
+		"""
+		Search for books, yielding results page by page
+
+		Args:
+			book_type (str): Type of book - "braille" or "daisy"
+			search_params (dict): Search parameters (title, author, etc.)
+
+		Yields:
+			list: Results of one page as soon as it has been parsed
+		"""
+		self._require_login()
 
 		if search_params is None:
 			search_params = {}
 
-		try:
-			log.info(f"Searching: type={book_type}, params={search_params}")
+		log.info(f"Searching: type={book_type}, params={search_params}")
 
-			# Extract current session tokens
-			self._extract_session_tokens()
+		# Extract current session tokens
+		self._ensure_session_tokens()
 
-			# Step 1: Navigate to search page
-			if book_type == "braille":
-				search_action = "J01SCH01"  # Braille search
-			else:
-				search_action = "J01SCH08"  # DAISY search
+		# Step 1: Navigate to search page
+		if book_type == "braille":
+			search_action = "J01SCH01"  # Braille search
+		else:
+			search_action = "J01SCH08"  # DAISY search
 
-			search_page_url = f"{self.LIBRARY_BASE_URL}?S00101={search_action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}"
+		search_page_url = f"{self.LIBRARY_BASE_URL}?S00101={search_action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}"
 
-			log.info(f"Navigating to search page: {search_page_url}")
-			response = self.session.get(search_page_url)
-			response.encoding = 'shift_jis'
+		log.info(f"Navigating to search page: {search_page_url}")
+		page = self._get_page(search_page_url)
 
-			# Extract ALL form fields from search page
-			soup = BeautifulSoup(response.text, 'html.parser')
+		# Extract ALL form fields from search page
 
-			# Get all hidden fields from the form
-			search_data = {}
-			for hidden in soup.find_all('input', type='hidden'):
-				name = hidden.get('name')
-				value = hidden.get('value', '')
-				if name:
-					search_data[name] = value
-					self.session_tokens[name] = value
+		# Get all hidden fields from the form
+		search_data = {}
+		for name, value in page.hidden_inputs:
+			if name:
+				search_data[name] = value
+				self.session_tokens[name] = value
 
-			# Add search parameters
-			search_data['S00251'] = search_params.get('title', '')  # Title
-			search_data['S00252'] = search_params.get('author', '')  # Author
-			search_data['S00218'] = search_params.get('category', '')  # Category (種別)
+		# Add search parameters
+		search_data['S00251'] = search_params.get('title', '')  # Title
+		search_data['S00252'] = search_params.get('author', '')  # Author
+		search_data['S00218'] = search_params.get('category', '')  # Category (種別)
 
-			# Include NDL checkbox
-			if search_params.get('include_ndl', True):
-				search_data['S00262'] = '5'
+		# Include NDL checkbox
+		if search_params.get('include_ndl', True):
+			search_data['S00262'] = '5'
 
-			# Log search parameters (safely handle encoding issues)
-			try:
-				title_log = search_data.get('S00251', '').encode('ascii', errors='replace').decode('ascii')
-				author_log = search_data.get('S00252', '').encode('ascii', errors='replace').decode('ascii')
-				log.info(f"Submitting search with title='{title_log}', author='{author_log}'")
-			except:
-				log.info("Submitting search")
-
-			# Encode POST data as Shift_JIS for Japanese text
-			import urllib.parse
-
-			# Manually URL encode with shift_jis to handle encoding errors gracefully
-			encoded_parts = []
-			for key, value in search_data.items():
-				# Encode key and value to shift_jis bytes, ignoring problematic characters
-				if isinstance(key, str):
-					key_bytes = key.encode('shift_jis', errors='ignore')
-				else:
-					key_bytes = str(key).encode('shift_jis', errors='ignore')
+		# Log search parameters (safely handle encoding issues)
+		try:
+			title_log = search_data.get('S00251', '').encode('ascii', errors='replace').decode('ascii')
+			author_log = search_data.get('S00252', '').encode('ascii', errors='replace').decode('ascii')
+			log.info(f"Submitting search with title='{title_log}', author='{author_log}'")
+		except:
+			log.info("Submitting search")
 
-				if isinstance(value, str):
-					value_bytes = value.encode('shift_jis', errors='ignore')
-				else:
-					value_bytes = str(value).encode('shift_jis', errors='ignore')
+		# Encode POST data as Shift_JIS for Japanese text
+		import urllib.parse
 
-				# URL encode the bytes
-				encoded_key = urllib.parse.quote_from_bytes(key_bytes)
-				encoded_value = urllib.parse.quote_from_bytes(value_bytes)
+		# Manually URL encode with shift_jis to handle encoding errors gracefully
+		encoded_parts = []
+		for key, value in search_data.items():
+			# Encode key and value to shift_jis bytes, ignoring problematic characters
+			if isinstance(key, str):
+				key_bytes = key.encode('shift_jis', errors='ignore')
+			else:
+				key_bytes = str(key).encode('shift_jis', errors='ignore')
 
-				encoded_parts.append(f'{encoded_key}={encoded_value}')
+			if isinstance(value, str):
+				value_bytes = value.encode('shift_jis', errors='ignore')
+			else:
+				value_bytes = str(value).encode('shift_jis', errors='ignore')
 
-			# Join all parts with &
-			encoded_body = '&'.join(encoded_parts)
+			# URL encode the bytes
+			encoded_key = urllib.parse.quote_from_bytes(key_bytes)
+			encoded_value = urllib.parse.quote_from_bytes(value_bytes)
 
-			# Send the encoded body as bytes
-			response = self.session.post(
-				self.LIBRARY_BASE_URL,
-				data=encoded_body.encode('ascii'),  # Already URL-encoded, so ASCII is fine
-				headers={'Content-Type': 'application/x-www-form-urlencoded'}
-			)
-			response.encoding = 'shift_jis'
+			encoded_parts.append(f'{encoded_key}={encoded_value}')
 
-			# DEBUG: Save response HTML to file
-			import os
-			debug_file = os.path.join(os.path.expanduser('~'), 'sapie_search_debug.html')
-			try:
-				with open(debug_file, 'w', encoding='shift_jis', errors='ignore') as f:
-					f.write(response.text)
-				log.info(f"DEBUG: Response HTML saved to {debug_file}")
-			except Exception as e:
-				log.warning(f"Could not save debug file: {e}")
+		# Join all parts with &
+		encoded_body = '&'.join(encoded_parts)
 
-			# Parse results from all pages
-			all_results = []
-			current_page = 1
-			max_pages = 100  # Safety limit to prevent infinite loops
+		# Send the encoded body as bytes
+		page = self._post_page(
+			self.LIBRARY_BASE_URL,
+			data=encoded_body.encode('ascii'),  # Already URL-encoded, so ASCII is fine
+			headers={'Content-Type': 'application/x-www-form-urlencoded'}
+		)
 
-			while current_page <= max_pages:
-				soup = BeautifulSoup(response.text, 'html.parser')
+		# DEBUG: Save response HTML to file
+		import os
+		debug_file = os.path.join(os.path.expanduser('~'), 'sapie_search_debug.html')
+		try:
+			with open(debug_file, 'w', encoding='shift_jis', errors='ignore') as f:
+				f.write(page.html)
+			log.info(f"DEBUG: Response HTML saved to {debug_file}")
+		except Exception as e:
+			log.warning(f"Could not save debug file: {e}")
 
-				# Check for "no results" message
-				if "該当するデータが見つかりませんでした" in response.text or "検索結果：0件" in response.text:
-					log.info("No results found")
-					break
+		# Parse results from all pages
+		yield from self._iter_result_pages(page, book_type)
 
-				# Parse search results from current page
-				page_results = self._parse_search_results(soup, book_type)
-				all_results.extend(page_results)
-				log.info(f"Page {current_page}: {len(page_results)} results (total: {len(all_results)})")
+	def _get_page(self, url, errors='replace', **kwargs):
+		"""
+		Send a GET request and wrap the response in a LibraryPage
 
-				# Check if there's a next page
-				next_page_url = self._has_next_page(soup)
-				if not next_page_url:
-					log.info("No more pages")
-					break
+		Args:
+			url (str): Request URL
+			errors (str): How undecodable bytes of the page are handled
+			**kwargs: Arguments passed to requests.Session.get
 
-				# Get next page
-				try:
-					current_page += 1
-					# Construct full URL
-					if next_page_url.startswith('http'):
-						full_url = next_page_url
-					else:
-						# Relative URL, prepend base URL
-						full_url = f"https://library.sapie.or.jp/cgi-bin/{next_page_url}"
+		Returns:
+			pageParser.LibraryPage: The page, shared by all of its consumers
+		"""
+		page = pageParser.LibraryPage(self.session.get(url, **kwargs), errors=errors)
+		self._harvest_session_tokens(page)
+		return page
 
-					log.info(f"Requesting page {current_page}: {full_url}")
+	def _post_page(self, url, errors='replace', **kwargs):
+		"""
+		Send a POST request and wrap the response in a LibraryPage
 
-					# Request next page with GET
-					response = self.session.get(full_url)
-					response.encoding = 'shift_jis'
+		Args:
+			url (str): Request URL
+			errors (str): How undecodable bytes of the page are handled
+			**kwargs: Arguments passed to requests.Session.post
 
-				except Exception as e:
-					log.error(f"Error fetching next page: {e}")
-					break
+		Returns:
+			pageParser.LibraryPage: The page, shared by all of its consumers
+		"""
+		page = pageParser.LibraryPage(self.session.post(url, **kwargs), errors=errors)
+		self._harvest_session_tokens(page)
+		return page
 
-			if all_results:
-				log.info(f"Search successful: {len(all_results)} total results from {current_page} page(s)")
-				return (True, all_results)
-			else:
-				log.info("Search returned no results")
-				return (True, [])
+	def _harvest_session_tokens(self, page):
+		"""
+		Update the session tokens from a page the client has received anyway
 
-		except requests.exceptions.RequestException as e:
-			log.error(f"Network error during search: {e}")
-			return (False, f"ネットワークエラー: {str(e)}")
+		Tokens are read from hidden inputs and from link query strings. A page
+		showing that the session has expired marks the tokens for re-fetching.
+
+		Args:
+			page (pageParser.LibraryPage): Page of a library request
+		"""
+		try:
+			if not page.is_html or not page.content:
+				return
+
+			if self.logged_in and (
+				page.url.startswith(self.LOGIN_URL)
+				or any(marker in page.content for marker in SESSION_EXPIRED_MARKERS)
+			):
+				with self._token_lock:
+					self._tokens_expired = True
+					self.token_stats['expired'] += 1
+				log.warning("Session tokens have expired")
+				return
+
+			tokens = page.tokens
 		except Exception as e:
-			log.error(f"Search error: {e}", exc_info=True)
-			return (False, f"検索エラー: {str(e)}")
+			log.debug(f"Could not read response for session tokens: {e}")
+			return
+
+		if tokens:
+			with self._token_lock:
+				self.session_tokens.update(tokens)
+				self.token_stats['harvested'] += 1
+
+	def _ensure_session_tokens(self):
+		"""
+		Make sure session tokens are available before building a request
+
+		The library page is only fetched when a token is missing or a
+		previous response has shown that the tokens expired; otherwise the
+		tokens harvested from earlier responses are reused.
+		"""
+		with self._token_lock:
+			missing = [name for name in pageParser.SESSION_TOKEN_NAMES if name not in self.session_tokens]
+			expired = self._tokens_expired
+			if not missing and not expired:
+				self.token_stats['saved'] += 1
+				return
+
+		log.debug(f"Refreshing session tokens: missing={missing}, expired={expired}")
+		self._extract_session_tokens()
 
 	def _extract_session_tokens(self):
-		"""Extract session tokens from current page"""
+		"""Extract session tokens from the library top page"""
 		try:
-			# Get current page to extract tokens
-			response = self.session.get(self.LIBRARY_BASE_URL)
-			response.encoding = 'shift_jis'
+			with self._token_lock:
+				self._tokens_expired = False
+				self.token_stats['fetched'] += 1
 
-			soup = BeautifulSoup(response.text, 'html.parser')
+			# Get current page to extract tokens
+			self._get_page(self.LIBRARY_BASE_URL)
 
-			# Find hidden input fields with session tokens
-			for hidden in soup.find_all('input', type='hidden'):
-				name = hidden.get('name')
-				value = hidden.get('value')
-				if name and value:
-					self.session_tokens[name] = value
+			# Tokens the page does not carry are sent empty; remember that so
+			# they are not re-fetched on every call
+			with self._token_lock:
+				for name in pageParser.SESSION_TOKEN_NAMES:
+					self.session_tokens.setdefault(name, '')
 
 			log.debug(f"Extracted session tokens: {list(self.session_tokens.keys())}")
 
 		except Exception as e:
 			log.error(f"Error extracting session tokens: {e}")
 
-	def _has_next_page(self, soup):
+	def get_transport_stats(self):
+		"""
+		Get connection pool statistics per host
+
+		Returns:
+			dict: URL prefix to connections opened, requests sent, requests
+				that reused a connection, and retries
+		"""
+		return {prefix: adapter.get_pool_stats() for prefix, adapter in self.adapters.items()}
+
+	def get_token_stats(self):
+		"""
+		Get session token statistics
+
+		Returns:
+			dict: Number of responses tokens were harvested from, token page
+				fetches, round trips saved by reusing tokens and expiries seen
+		"""
+		with self._token_lock:
+			return dict(self.token_stats)
+
+	def _has_next_page(self, page):
 		"""
 		Check if there's a next page in search results
 
 		Args:
-			soup (BeautifulSoup): Parsed HTML of current search results page
+			page (pageParser.LibraryPage): Current search results page
 
 		Returns:
 			str or None: URL of next page if exists, None otherwise
 		"""
 		try:
 			# Look for "次へ" (Next) link in pager
-			pager = soup.find('ul', class_='pager')
-			if pager:
-				links = pager.find_all('a')
-				for link in links:
-					link_text = link.get_text(strip=True)
-					if '次' in link_text:
-						next_url = link.get('href', '')
-						if next_url:
-							log.info(f"Next page detected: {link_text}")
-							return next_url
+			for link in page.pager_links:
+				link_text = link.get_text()
+				if '次' in link_text:
+					next_url = link.href
+					if next_url:
+						log.info(f"Next page detected: {link_text}")
+						return next_url
 
 			log.info("No next page detected")
 			return None
@@ -362,33 +499,398 @@ class SapieClient:
 			log.warning(f"Error checking for next page: {e}")
 			return None
 
-	def _parse_search_results(self, soup, book_type="braille"):
+	def _iter_result_pages(self, page, book_type="braille"):
+		"""
+		Yield the results of every page of a paginated result list
+
+		Page 1 is parsed from the given page and yielded straight away.
+		The page count and URL pattern are then read from its pager, and the
+		remaining pages are fetched concurrently over the shared session with
+		a bounded worker pool. Pages are yielded in page order as soon as each
+		one has been parsed, without the results of earlier pages; the first
+		page bringing no new results ends the list.
+
+		Args:
+			page (pageParser.LibraryPage): First results page
+			book_type (str): Type of book
+
+		Yields:
+			list: Results of one page
+		"""
+		if self._is_no_results_page(page):
+			log.info("No results found")
+			return
+
+		first_results = self._parse_search_results(page, book_type)
+		log.info(f"Page 1: {len(first_results)} results")
+		seen = set()
+		self._new_results(first_results, seen)
+		yield first_results
+
+		page_size = self._get_page_size(page)
+		page_urls = self._get_page_urls(page, page_size)
+		if not page_urls:
+			# Pager without numbered links - walk "next" links one at a time
+			yield from self._iter_pages_sequentially(page, book_type, seen)
+			return
+
+		scheduled = {1}
+		pending = page_urls
+		page_count = 1
+		futures = []
+
+		executor = ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS)
+		try:
+			while pending:
+				batch = sorted(pending.items())[:MAX_RESULT_PAGES - len(scheduled)]
+				pending = {}
+				scheduled.update(page_number for page_number, url in batch)
+
+				log.info(f"Requesting pages {[page_number for page_number, url in batch]} concurrently")
+				futures = [
+					(page_number, executor.submit(self._fetch_page, url, book_type, page_size))
+					for page_number, url in batch
+				]
+
+				for page_number, future in futures:
+					try:
+						page_results, found_urls = future.result()
+					except Exception as e:
+						log.error(f"Error fetching page {page_number}: {e}")
+						self._query_state.incomplete = True
+						continue
+
+					page_count += 1
+					log.info(f"Page {page_number}: {len(page_results)} results")
+
+					new_results = self._new_results(page_results, seen)
+					if not new_results:
+						# Past the last real page (estimated page count too high)
+						log.info(f"Page {page_number} has no new results, stopping")
+						pending = {}
+						break
+
+					# A windowed pager may reveal pages beyond the ones known so far
+					for found_number, found_url in found_urls.items():
+						if found_number not in scheduled:
+							pending[found_number] = found_url
+
+					yield new_results
+		finally:
+			# Stop queued requests if the consumer stops iterating early
+			for page_number, future in futures:
+				future.cancel()
+			executor.shutdown(wait=False)
+
+		log.info(f"Fetched {page_count} page(s)")
+
+	def _fetch_page(self, url, book_type="braille", page_size=0):
+		"""
+		Fetch and parse a single results page
+
+		Args:
+			url (str): Absolute URL of the page
+			book_type (str): Type of book
+			page_size (int): Number of results on a full page
+
+		Returns:
+			tuple: (results: list, page_urls: dict of page number to URL)
+		"""
+		page = self._get_page(url)
+
+		if self._is_no_results_page(page):
+			return ([], {})
+
+		page_results = self._parse_search_results(page, book_type)
+		return (page_results, self._get_page_urls(page, page_size))
+
+	def _iter_pages_sequentially(self, page, book_type="braille", seen=None):
+		"""
+		Follow "next" links page by page when the pager has no page numbers
+
+		Args:
+			page (pageParser.LibraryPage): First results page
+			book_type (str): Type of book
+			seen (set): Keys of the results already yielded
+
+		Yields:
+			list: Results of the second and following pages
+		"""
+		current_page = 1
+
+		next_page_url = self._has_next_page(page)
+		while next_page_url and current_page < MAX_RESULT_PAGES:
+			current_page += 1
+			full_url = self._absolute_url(next_page_url)
+			log.info(f"Requesting page {current_page}: {full_url}")
+
+			try:
+				page = self._get_page(full_url)
+			except Exception as e:
+				log.error(f"Error fetching next page: {e}")
+				self._query_state.incomplete = True
+				break
+
+			if self._is_no_results_page(page):
+				break
+
+			page_results = self._parse_search_results(page, book_type)
+			log.info(f"Page {current_page}: {len(page_results)} results")
+			new_results = self._new_results(page_results, seen if seen is not None else set())
+			if not new_results:
+				log.info(f"Page {current_page} has no new results, stopping")
+				break
+			yield new_results
+
+			next_page_url = self._has_next_page(page)
+
+	def _collect_results(self, pages, description, error_prefix, on_page=None, cache_query=None):
+		"""
+		Run a streaming query to completion and collect all of its results
+
+		When a result cache is set, cached results of the same query are
+		returned without any network access, and complete result lists are
+		stored in the cache.
+
+		Args:
+			pages (iterator): Page results yielded by one of the iter_* methods
+			description (str): Name of the query for log messages
+			error_prefix (str): Prefix of the error message returned on failure
+			on_page (callable): Optional callback called with the results of
+				each page as soon as it arrives
+			cache_query (tuple): (endpoint, book_type, params) identifying the
+				query in the result cache
+
+		Returns:
+			tuple: (success: bool, results: list or error_message: str)
+		"""
+		if not self.logged_in:
+			return (False, "ログインしてください。")
+
+		if cache_query and self.result_cache:
+			cached_results = self.result_cache.get(*cache_query, account=self.username)
+			if cached_results is not None:
+				pages.close()
+				log.info(f"{description} served from cache: {len(cached_results)} results")
+				if on_page:
+					on_page(cached_results)
+				return (True, cached_results)
+
+		try:
+			self._query_state.incomplete = False
+			all_results = []
+			for page_results in pages:
+				all_results.extend(page_results)
+				if on_page:
+					on_page(page_results)
+
+			if all_results:
+				log.info(f"{description} successful: {len(all_results)} total results")
+				# Result lists with missing pages are not cached
+				if cache_query and self.result_cache and not self._query_state.incomplete:
+					self.result_cache.put(*cache_query, all_results, account=self.username)
+			else:
+				log.info(f"{description} returned no results")
+			return (True, all_results)
+
+		except requests.exceptions.RequestException as e:
+			log.error(f"Network error during {description.lower()}: {e}")
+			return (False, f"ネットワークエラー: {str(e)}")
+		except Exception as e:
+			log.error(f"{description} error: {e}", exc_info=True)
+			return (False, f"{error_prefix}: {str(e)}")
+
+	def _require_login(self):
+		"""Raise if the client is not logged in (used by the iter_* methods)"""
+		if not self.logged_in:
+			raise RuntimeError("ログインしてください。")
+
+	def _get_page_urls(self, page, page_size):
+		"""
+		Read page numbers and their URLs from the pager
+
+		Pages hidden by a windowed pager are filled in from the URL pattern
+		of the numbered links when the total result count is shown.
+
+		Args:
+			page (pageParser.LibraryPage): Results page
+			page_size (int): Number of results on a full page
+
+		Returns:
+			dict: Page number (int) to absolute URL, excluding page 1
+		"""
+		page_urls = {}
+
+		for link in page.pager_links:
+			link_text = link.get_text()
+			href = link.href
+			if href and link_text.isdigit() and int(link_text) > 1:
+				page_urls[int(link_text)] = self._absolute_url(href)
+
+		page_count = self._get_page_count(page, page_size)
+		if page_urls and page_count > max(page_urls):
+			make_url = self._get_page_url_pattern(page_urls)
+			if make_url:
+				for page_number in range(2, min(page_count, MAX_RESULT_PAGES) + 1):
+					page_urls.setdefault(page_number, make_url(page_number))
+
+		return page_urls
+
+	def _get_page_size(self, page):
+		"""
+		Get the number of rows on a full results page
+
+		Rows are counted before _parse_search_results drops any, so a page
+		with unusable rows does not make the page count come out too high.
+
+		Args:
+			page (pageParser.LibraryPage): First results page
+
+		Returns:
+			int: Number of result rows, header excluded
+		"""
+		return max(len(page.result_rows) - 1, 0)
+
+	def _new_results(self, page_results, seen):
+		"""
+		Drop the results already yielded by earlier pages
+
+		Args:
+			page_results (list): Results of one page
+			seen (set): Keys of the results yielded so far, updated in place
+
+		Returns:
+			list: Results not seen before, in page order
+		"""
+		new_results = []
+		for result in page_results:
+			key = (result.get('id'), result.get('s00202'), result.get('s00222'), result.get('title'), result.get('author'))
+			if key not in seen:
+				seen.add(key)
+				new_results.append(result)
+		return new_results
+
+	def _get_page_count(self, page, page_size):
+		"""
+		Estimate the number of result pages from the total result count
+
+		Args:
+			page (pageParser.LibraryPage): Results page
+			page_size (int): Number of results on a full page
+
+		Returns:
+			int: Number of pages, or 0 if the total count is not shown
+		"""
+		if not page_size:
+			return 0
+
+		match = re.search(r'検索結果：\s*([\d,]+)\s*件', page.text)
+		if not match:
+			return 0
+
+		total = int(match.group(1).replace(',', ''))
+		return math.ceil(total / page_size)
+
+	def _get_page_url_pattern(self, page_urls):
+		"""
+		Work out how the page number is encoded in pager URLs
+
+		The query parameter whose value changes linearly with the page number
+		(page number or result offset) is located by comparing two links.
+
+		Args:
+			page_urls (dict): Page number to URL of known pager links
+
+		Returns:
+			callable or None: Function building the URL for a page number
+		"""
+		if len(page_urls) < 2:
+			return None
+
+		numbers = sorted(page_urls)
+		first, last = numbers[0], numbers[-1]
+		base, first_params = self._split_query(page_urls[first])
+		last_base, last_params = self._split_query(page_urls[last])
+
+		if base != last_base or [k for k, v in first_params] != [k for k, v in last_params]:
+			return None
+
+		for index, ((key, first_value), (_key, last_value)) in enumerate(zip(first_params, last_params)):
+			if first_value == last_value or not (first_value.isdigit() and last_value.isdigit()):
+				continue
+
+			step, remainder = divmod(int(last_value) - int(first_value), last - first)
+			if remainder or not step:
+				continue
+			offset = int(first_value) - step * first
+
+			# Every known link must follow the same pattern
+			if any(self._split_query(page_urls[n])[1][index][1] != str(step * n + offset) for n in numbers):
+				continue
+
+			def make_url(page_number, index=index, step=step, offset=offset):
+				params = list(first_params)
+				params[index] = (params[index][0], str(step * page_number + offset))
+				return base + '?' + '&'.join(f'{k}={v}' for k, v in params)
+
+			return make_url
+
+		return None
+
+	def _split_query(self, url):
+		"""
+		Split a URL into its base and raw query parameters
+
+		Values are kept percent-encoded so Shift_JIS parameters survive as-is.
+
+		Args:
+			url (str): URL to split
+
+		Returns:
+			tuple: (base: str, params: list of (key, value) tuples)
+		"""
+		base, _sep, query = url.partition('?')
+		params = []
+		for part in query.split('&'):
+			if part:
+				key, _sep, value = part.partition('=')
+				params.append((key, value))
+		return (base, params)
+
+	def _absolute_url(self, url):
+		"""Make a library link absolute"""
+		if url.startswith('http'):
+			return url
+		return f"{LIBRARY_CGI_URL}{url}"
+
+	def _is_no_results_page(self, page):
+		"""Check if a page shows the "no results" message"""
+		return any(marker in page.html for marker in NO_RESULTS_MARKERS)
+
+	def _parse_search_results(self, page, book_type="braille"):
 		"""
 		Parse search results from HTML
 
 		Args:
-			soup (BeautifulSoup): Parsed HTML
+			page (pageParser.LibraryPage): Parsed results page
 			book_type (str): Type of book
 
 		Returns:
 			list: List of result dictionaries
 		"""
+		if page.results is not None:
+			return page.results
+
 		results = []
 
 		try:
-			# Find the results table
-			table = soup.find('table', class_='FULL')
-
-			if not table:
+			# Rows of the results table
+			if not page.result_rows:
 				log.warning("No results table found")
 				return results
 
 			# Parse each row (skip header row)
-			rows = table.find_all('tr')[1:]
-
-			for row in rows:
-				cols = row.find_all('td')
-
+			for cols in page.result_rows[1:]:
 				if len(cols) < 3:  # Need at least: number, title, author
 					continue
 
@@ -399,18 +901,13 @@ class SapieClient:
 
 				# Extract book ID from the download form (last column)
 				download_cell = cols[-1]
-				book_id = None
-
-				# Try to find S00224 (book ID) in the download form
-				s00224_input = download_cell.find('input', {'name': 'S00224'})
-				if s00224_input:
-					book_id = s00224_input.get('value', '')
+				book_id = download_cell.inputs.get('S00224')
 
 				# If not found, try to extract from link
 				if not book_id and len(cols) > 1:
-					link = cols[1].find('a')
-					if link and link.get('href'):
-						match = re.search(r'S00224=([^&]+)', link.get('href'))
+					link = cols[1].link
+					if link and link.href:
+						match = re.search(r'S00224=([^&]+)', link.href)
 						if match:
 							book_id = match.group(1)
 
@@ -419,11 +916,11 @@ class SapieClient:
 				s00221 = ''
 				s00222 = ''
 				if len(cols) > 1:
-					title_link = cols[1].find('a')
+					title_link = cols[1].link
 					if title_link:
-						title = title_link.get_text(strip=True)
+						title = title_link.get_text()
 						# Extract S00221 and S00222 from detail link
-						href = title_link.get('href', '')
+						href = title_link.href
 						s00221_match = re.search(r'S00221=([^&]+)', href)
 						s00222_match = re.search(r'S00222=([^&]+)', href)
 						if s00221_match:
@@ -431,18 +928,17 @@ class SapieClient:
 						if s00222_match:
 							s00222 = s00222_match.group(1)
 					else:
-						title = cols[1].get_text(strip=True)
+						title = cols[1].get_text()
 
 				# Extract author (column 2)
 				author = ''
 				if len(cols) > 2:
-					author = cols[2].get_text(strip=True)
+					author = cols[2].get_text()
 
 				# Extract type from download form
 				result_type = '不明'
-				s00202_input = download_cell.find('input', {'name': 'S00202'})
-				if s00202_input:
-					s00202_value = s00202_input.get('value', '')
+				s00202_value = download_cell.inputs.get('S00202')
+				if s00202_value is not None:
 					if s00202_value == "11":
 						result_type = '点字'
 					elif s00202_value == "22":
@@ -456,7 +952,7 @@ class SapieClient:
 					'author': author,
 					'type': result_type,
 					'producer': '',  # Not extracted for now
-					's00202': s00202_value if s00202_input else '',  # Store for download
+					's00202': s00202_value or '',  # Store for download
 					's00215': '',  # Could extract from download form if needed
 					's00221': s00221,  # Search ID for detail page
 					's00222': s00222   # Book ID for detail page
@@ -468,22 +964,36 @@ class SapieClient:
 		except Exception as e:
 			log.error(f"Error parsing search results: {e}", exc_info=True)
 
+		page.results = results
 		return results
 
 	def is_logged_in(self):
 		"""Check if user is logged in"""
 		return self.logged_in
 
-	def download_book(self, book_id, download_path, book_format='BRL', s00202_override=None, s00215_override=None):
+	def download_book(self, book_id, download_path, book_format='BRL', s00202_override=None, s00215_override=None,
+	                  chunk_size=DOWNLOAD_CHUNK_SIZE, progress_callback=None, cancel_event=None):
 		"""
 		Download a book
 
+		The book is written to a .part file with a JSON manifest next to it.
+		If an earlier attempt was interrupted, the download resumes with a
+		Range request; servers that ignore the range send the whole book
+		again. The finished file is renamed into place atomically.
+
 		Args:
 			book_id (str): ID of the book to download (S00224 value)
 			download_path (str): Directory to save the file
 			book_format (str): Format of the book - 'BRL' (braille) or 'DAISY'
 			s00202_override (str): Actual S00202 value from search results
 			s00215_override (str): Actual S00215 value from search results
+			chunk_size (int): Bytes read from the network per chunk
+			progress_callback (callable): Called with (received, total, speed, eta)
+				at most every DOWNLOAD_PROGRESS_INTERVAL seconds and once at the
+				end: bytes received including a resumed part, the length of the
+				book or None, bytes per second, and seconds remaining or None
+			cancel_event (threading.Event): When set, the download stops after
+				the current chunk and keeps its .part file for resuming
 
 		Returns:
 			tuple: (success: bool, file_path: str or error_message: str)
@@ -492,7 +1002,6 @@ class SapieClient:
 			return (False, "ダウンロードする前にログインしてください。")
 
 		try:
-			import os
 			log.info(f"Starting download: book_id={book_id}, format={book_format}, path={download_path}")
 
 			# Validate book_id
@@ -500,7 +1009,7 @@ class SapieClient:
 				return (False, "この図書はダウンロードできない資料です。\nコンテンツが登録されていないか、現物貸出のみの資料の可能性があります。")
 
 			# Extract session tokens
-			self._extract_session_tokens()
+			self._ensure_session_tokens()
 
 			# Determine form values based on format
 			if book_format == 'DAISY':
@@ -529,20 +1038,54 @@ class SapieClient:
 
 			log.info(f"Downloading book_id={book_id}, S00202={s00202_value}")
 
+			# Unfinished download of the same book from an earlier attempt
+			part_path = os.path.join(download_path, f"sapie_book_{book_id}_{s00202_value}{PART_SUFFIX}")
+			manifest_path = part_path[:-len(PART_SUFFIX)] + MANIFEST_SUFFIX
+			manifest = self._read_download_manifest(manifest_path, part_path)
+			resume_from = manifest.get('bytes', 0)
+
+			headers = {}
+			if resume_from:
+				headers['Range'] = f"bytes={resume_from}-"
+				validator = manifest.get('etag') or manifest.get('last_modified')
+				if validator:
+					headers['If-Range'] = validator
+				log.info(f"Resuming download from byte {resume_from}")
+
 			# Submit download request
 			download_url = "https://cntdwn.sapie.or.jp/download/download.aspx"
-			response = self.session.post(download_url, data=form_data, stream=True)
+			response = self.session.post(download_url, data=form_data, headers=headers, stream=True)
 
 			log.info(f"Response status: {response.status_code}")
 
-			# Check for errors in response
-			if response.status_code != 200:
-				log.error(f"Download failed: HTTP {response.status_code}")
-				return (False, f"ダウンロード失敗: HTTP {response.status_code}")
+			if response.status_code == 416 and resume_from and resume_from == manifest.get('total'):
+				# The part file already holds the whole book
+				response.close()
+				response = None
+			elif response.status_code == 416 and resume_from:
+				# The range no longer matches the book - start over
+				response.close()
+				log.info("Range not satisfiable, restarting download")
+				resume_from = 0
+				response = self.session.post(download_url, data=form_data, stream=True)
+				log.info(f"Response status: {response.status_code}")
+
+			if response is not None:
+				if response.status_code == 206 and self._content_range_start(response) == resume_from:
+					log.info(f"Server resumed download at byte {resume_from}")
+				elif response.status_code == 200:
+					if resume_from:
+						log.info("Server does not support resuming, downloading the whole book")
+					resume_from = 0
+				else:
+					# Check for errors in response
+					log.error(f"Download failed: HTTP {response.status_code}")
+					response.close()
+					return (False, f"ダウンロード失敗: HTTP {response.status_code}")
 
 			# Get filename from Content-Disposition header
-			filename = None
-			if 'Content-Disposition' in response.headers:
+			filename = manifest.get('filename') if response is None else None
+			if response is not None and 'Content-Disposition' in response.headers:
 				from urllib.parse import unquote
 				cd = response.headers['Content-Disposition']
 				filename_match = re.search(r'filename[^;=\n]*=(([\'"]).*?\2|[^;\n]*)', cd)
@@ -577,10 +1120,64 @@ class SapieClient:
 			file_path = os.path.join(download_path, filename)
 			log.info(f"Saving to: {file_path}")
 
-			with open(file_path, 'wb') as f:
-				for chunk in response.iter_content(chunk_size=8192):
-					if chunk:
-						f.write(chunk)
+			if response is not None:
+				if response.status_code == 206:
+					total = self._content_range_total(response)
+				else:
+					content_length = response.headers.get('Content-Length', '')
+					total = int(content_length) if content_length.isdigit() else None
+
+				manifest = {
+					'book_id': book_id,
+					'format': book_format,
+					's00202': s00202_value,
+					'filename': filename,
+					'total': total,
+					'etag': response.headers.get('ETag', ''),
+					'last_modified': response.headers.get('Last-Modified', ''),
+					'accept_ranges': response.headers.get('Accept-Ranges', '')
+				}
+				self._write_download_manifest(manifest_path, manifest)
+
+				received = resume_from
+				started = time.monotonic()
+				last_report = started
+				try:
+					with open(part_path, 'ab' if resume_from else 'wb') as f:
+						for chunk in response.iter_content(chunk_size=chunk_size):
+							if cancel_event is not None and cancel_event.is_set():
+								log.info(f"Download cancelled after {received} bytes")
+								return (False, "ダウンロードを中断しました。\n再度ダウンロードすると続きから再開します。")
+							if chunk:
+								f.write(chunk)
+								received += len(chunk)
+
+								now = time.monotonic()
+								if progress_callback and now - last_report >= DOWNLOAD_PROGRESS_INTERVAL:
+									last_report = now
+									self._report_download_progress(
+										progress_callback, received, resume_from, total, now - started
+									)
+
+					if progress_callback:
+						self._report_download_progress(
+							progress_callback, received, resume_from, total, time.monotonic() - started
+						)
+				except requests.exceptions.RequestException as e:
+					log.error(f"Download interrupted after {received} bytes: {e}")
+					return (False, f"ダウンロードが中断されました: {str(e)}\n再度ダウンロードすると続きから再開します。")
+				finally:
+					response.close()
+
+				if total is not None and received < total:
+					log.error(f"Download incomplete: {received} of {total} bytes")
+					return (False, f"ダウンロードが中断されました ({received}/{total} バイト)。\n再度ダウンロードすると続きから再開します。")
+
+			os.replace(part_path, file_path)
+			try:
+				os.remove(manifest_path)
+			except OSError:
+				pass
 
 			log.info(f"Download complete: {file_path}")
 			return (True, file_path)
@@ -589,115 +1186,146 @@ class SapieClient:
 			log.error(f"Download error: {e}", exc_info=True)
 			return (False, f"ダウンロードエラー: {str(e)}")
 
-	def get_new_arrivals(self, book_type="braille", period="week"):
+	def _report_download_progress(self, progress_callback, received, resumed_at, total, elapsed):
 		"""
-		Get new arrivals from Sapie Library
+		Pass the progress of a download to its callback
 
 		Args:
-			book_type (str): Type of book - "braille" or "daisy"
-			period (str): Time period - "week" or "month"
+			progress_callback (callable): Callback given to download_book
+			received (int): Bytes of the book received so far
+			resumed_at (int): Bytes that were already in the part file
+			total (int): Length of the book, or None if unknown
+			elapsed (float): Seconds since the response started
+		"""
+		speed = (received - resumed_at) / elapsed if elapsed > 0 else 0.0
+		eta = None
+		if total is not None and speed > 0:
+			eta = max(total - received, 0) / speed
+		try:
+			progress_callback(received, total, speed, eta)
+		except Exception as e:
+			log.error(f"Download progress callback error: {e}", exc_info=True)
 
-		Returns:
-			tuple: (success: bool, results: list or error_message: str)
+	def _read_download_manifest(self, manifest_path, part_path):
 		"""
-		if not self.logged_in:
-			return (False, "ログインしてください。")
+		Read the resume information of an unfinished download
 
-		try:
-			log.info(f"Getting new arrivals: type={book_type}, period={period}")
+		Args:
+			manifest_path (str): Path of the manifest
+			part_path (str): Path of the partially downloaded file
 
-			# Extract current session tokens
-			self._extract_session_tokens()
+		Returns:
+			dict: Manifest with 'bytes' set to the size of the part file, or
+				an empty dict if there is nothing to resume
+		"""
+		if not os.path.exists(part_path) or not os.path.exists(manifest_path):
+			return {}
 
-			# New arrivals use J02LST01 action with S00213 (type) and S00214 (period)
-			action = "J02LST01"
+		try:
+			with open(manifest_path, 'r', encoding='utf-8') as f:
+				manifest = json.load(f)
+			manifest['bytes'] = os.path.getsize(part_path)
+			return manifest
+		except Exception as e:
+			log.warning(f"Ignoring unreadable download manifest {manifest_path}: {e}")
+			return {}
 
-			# Determine type parameter (S00213)
-			if book_type == "braille":
-				type_param = "1"  # Braille
-			else:
-				type_param = "2"  # DAISY (録音)
+	def _write_download_manifest(self, manifest_path, manifest):
+		"""
+		Write the resume information of a download
 
-			# Determine period parameter (S00214)
-			if period == "month":
-				period_param = "2"  # 1 month
-			else:
-				period_param = "1"  # 1 week
+		Args:
+			manifest_path (str): Path of the manifest
+			manifest (dict): Resume information
+		"""
+		temp_path = manifest_path + '.tmp'
+		with open(temp_path, 'w', encoding='utf-8') as f:
+			json.dump(manifest, f, ensure_ascii=False)
+		os.replace(temp_path, manifest_path)
+
+	def _content_range_start(self, response):
+		"""Get the first byte position of a 206 response, or None"""
+		match = re.match(r'bytes\s+(\d+)-\d+/', response.headers.get('Content-Range', ''))
+		return int(match.group(1)) if match else None
+
+	def _content_range_total(self, response):
+		"""Get the complete length from the Content-Range of a 206 response, or None"""
+		match = re.match(r'bytes\s+\d+-\d+/(\d+)', response.headers.get('Content-Range', ''))
+		return int(match.group(1)) if match else None
+
+	def get_new_arrivals(self, book_type="braille", period="week", on_page=None):
+		"""
+		Get new arrivals from Sapie Library
 
-			# Build URL for new arrivals page
-			new_arrivals_url = f"{self.LIBRARY_BASE_URL}?S00101={action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}&S00213={type_param}&S00214={period_param}&RTNTME={self.session_tokens.get('RTNTME', '')}"
+		Args:
+			book_type (str): Type of book - "braille" or "daisy"
+			period (str): Time period - "week" or "month"
+			on_page (callable): Optional callback receiving the results of each page
 
-			log.info(f"Requesting new arrivals: {new_arrivals_url}")
+		Returns:
+			tuple: (success: bool, results: list or error_message: str)
+		"""
+		return self._collect_results(
+			self.iter_new_arrivals(book_type, period),
+			"New arrivals retrieval", "新着取得エラー", on_page,
+			("new_arrivals", book_type, {'period': period})
+		)
 
-			# Request new arrivals page
-			response = self.session.get(new_arrivals_url)
-			response.encoding = 'shift_jis'
+	def iter_new_arrivals(self, book_type="braille", period="week"):
+		"""
+		Get new arrivals from Sapie Library, yielding results page by page
 
-			# DEBUG: Save response HTML to file
-			import os
-			debug_file = os.path.join(os.path.expanduser('~'), 'sapie_new_arrivals_debug.html')
-			try:
-				with open(debug_file, 'w', encoding='shift_jis', errors='ignore') as f:
-					f.write(response.text)
-				log.info(f"DEBUG: New arrivals HTML saved to {debug_file}")
-			except Exception as e:
-				log.warning(f"Could not save debug file: {e}")
+		Args:
+			book_type (str): Type of book - "braille" or "daisy"
+			period (str): Time period - "week" or "month"
 
-			# Parse results from all pages
-			all_results = []
-			current_page = 1
-			max_pages = 100
+		Yields:
+			list: Results of one page as soon as it has been parsed
+		"""
+		self._require_login()
 
-			while current_page <= max_pages:
-				soup = BeautifulSoup(response.text, 'html.parser')
+		log.info(f"Getting new arrivals: type={book_type}, period={period}")
 
-				# Check for "no results" message
-				if "該当するデータが見つかりませんでした" in response.text or "検索結果：0件" in response.text:
-					log.info("No new arrivals found")
-					break
+		# Extract current session tokens
+		self._ensure_session_tokens()
 
-				# Parse results from current page
-				page_results = self._parse_search_results(soup, book_type)
-				all_results.extend(page_results)
-				log.info(f"Page {current_page}: {len(page_results)} results (total: {len(all_results)})")
+		# New arrivals use J02LST01 action with S00213 (type) and S00214 (period)
+		action = "J02LST01"
 
-				# Check if there's a next page
-				next_page_url = self._has_next_page(soup)
-				if not next_page_url:
-					log.info("No more pages")
-					break
+		# Determine type parameter (S00213)
+		if book_type == "braille":
+			type_param = "1"  # Braille
+		else:
+			type_param = "2"  # DAISY (録音)
 
-				# Get next page
-				try:
-					current_page += 1
-					if next_page_url.startswith('http'):
-						full_url = next_page_url
-					else:
-						full_url = f"https://library.sapie.or.jp/cgi-bin/{next_page_url}"
+		# Determine period parameter (S00214)
+		if period == "month":
+			period_param = "2"  # 1 month
+		else:
+			period_param = "1"  # 1 week
 
-					log.info(f"Requesting page {current_page}: {full_url}")
-					response = self.session.get(full_url)
-					response.encoding = 'shift_jis'
+		# Build URL for new arrivals page
+		new_arrivals_url = f"{self.LIBRARY_BASE_URL}?S00101={action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}&S00213={type_param}&S00214={period_param}&RTNTME={self.session_tokens.get('RTNTME', '')}"
 
-				except Exception as e:
-					log.error(f"Error fetching next page: {e}")
-					break
+		log.info(f"Requesting new arrivals: {new_arrivals_url}")
 
-			if all_results:
-				log.info(f"New arrivals retrieval successful: {len(all_results)} total results")
-				return (True, all_results)
-			else:
-				log.info("No new arrivals found")
-				return (True, [])
+		# Request new arrivals page
+		page = self._get_page(new_arrivals_url)
 
-		except requests.exceptions.RequestException as e:
-			log.error(f"Network error getting new arrivals: {e}")
-			return (False, f"ネットワークエラー: {str(e)}")
+		# DEBUG: Save response HTML to file
+		import os
+		debug_file = os.path.join(os.path.expanduser('~'), 'sapie_new_arrivals_debug.html')
+		try:
+			with open(debug_file, 'w', encoding='shift_jis', errors='ignore') as f:
+				f.write(page.html)
+			log.info(f"DEBUG: New arrivals HTML saved to {debug_file}")
 		except Exception as e:
-			log.error(f"New arrivals error: {e}", exc_info=True)
-			return (False, f"新着取得エラー: {str(e)}")
+			log.warning(f"Could not save debug file: {e}")
 
-	def get_popular_books(self, ranking_type="braille_download"):
+		# Parse results from all pages
+		yield from self._iter_result_pages(page, book_type)
+
+	def get_popular_books(self, ranking_type="braille_download", on_page=None):
 		"""
 		Get popular books from Sapie Library
 
@@ -705,370 +1333,300 @@ class SapieClient:
 			ranking_type (str): Type of ranking -
 				"braille_download", "daisy_download", "daisy_play",
 				"braille_request", "daisy_request"
+			on_page (callable): Optional callback receiving the results of each page
 
 		Returns:
 			tuple: (success: bool, results: list or error_message: str)
 		"""
-		if not self.logged_in:
-			return (False, "ログインしてください。")
-
-		try:
-			log.info(f"Getting popular books: ranking_type={ranking_type}")
+		return self._collect_results(
+			self.iter_popular_books(ranking_type),
+			"Popular books retrieval", "人気図書取得エラー", on_page,
+			("popular_books", None, {'ranking_type': ranking_type})
+		)
 
-			# Extract current session tokens
-			self._extract_session_tokens()
-
-			# Popular books use J03LST01 action
-			action = "J03LST01"
-
-			# Mapping ranking types to S00201 parameter values and book types
-			ranking_map = {
-				"braille_download": ("1", "braille", "点字ダウンロード"),
-				"daisy_download": ("3", "daisy", "デイジーダウンロード"),
-				"daisy_play": ("4", "daisy", "デイジー再生"),
-				"braille_request": ("21", "braille", "点字オンラインリクエスト"),
-				"daisy_request": ("22", "daisy", "録音オンラインリクエスト")
-			}
-
-			# Get ranking parameters
-			if ranking_type in ranking_map:
-				s00201_param, book_type, ranking_name = ranking_map[ranking_type]
-			else:
-				# Default to braille download
-				s00201_param, book_type, ranking_name = ("1", "braille", "点字ダウンロード")
-
-			# Calculate date for 1 week ago (default period)
-			from datetime import datetime, timedelta
-			one_week_ago = datetime.now() - timedelta(days=7)
-			date_param = one_week_ago.strftime("%Y%m%d")
-
-			# Build URL for popular books page
-			# S00201: ranking type, S00212: category (1=books), S00222: start date
-			popular_url = f"{self.LIBRARY_BASE_URL}?S00101={action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}&S00201={s00201_param}&S00212=1&S00222={date_param}&RTNTME={self.session_tokens.get('RTNTME', '')}"
+	def iter_popular_books(self, ranking_type="braille_download"):
+		"""
+		Get popular books from Sapie Library, yielding results page by page
 
-			log.info(f"Requesting {ranking_name} ranking: {popular_url}")
+		Args:
+			ranking_type (str): Type of ranking -
+				"braille_download", "daisy_download", "daisy_play",
+				"braille_request", "daisy_request"
 
-			# Request popular books page
-			response = self.session.get(popular_url)
-			response.encoding = 'shift_jis'
+		Yields:
+			list: Results of one page as soon as it has been parsed
+		"""
+		self._require_login()
 
-			# Parse results from all pages
-			all_results = []
-			current_page = 1
-			max_pages = 100
+		log.info(f"Getting popular books: ranking_type={ranking_type}")
 
-			while current_page <= max_pages:
-				soup = BeautifulSoup(response.text, 'html.parser')
+		# Extract current session tokens
+		self._ensure_session_tokens()
 
-				# Check for "no results" message
-				if "該当するデータが見つかりませんでした" in response.text or "検索結果：0件" in response.text:
-					log.info("No popular books found")
-					break
+		# Popular books use J03LST01 action
+		action = "J03LST01"
 
-				# Parse results from current page
-				page_results = self._parse_search_results(soup, book_type)
-				all_results.extend(page_results)
-				log.info(f"Page {current_page}: {len(page_results)} results (total: {len(all_results)})")
+		# Mapping ranking types to S00201 parameter values and book types
+		ranking_map = {
+			"braille_download": ("1", "braille", "点字ダウンロード"),
+			"daisy_download": ("3", "daisy", "デイジーダウンロード"),
+			"daisy_play": ("4", "daisy", "デイジー再生"),
+			"braille_request": ("21", "braille", "点字オンラインリクエスト"),
+			"daisy_request": ("22", "daisy", "録音オンラインリクエスト")
+		}
 
-				# Check if there's a next page
-				next_page_url = self._has_next_page(soup)
-				if not next_page_url:
-					log.info("No more pages")
-					break
+		# Get ranking parameters
+		if ranking_type in ranking_map:
+			s00201_param, book_type, ranking_name = ranking_map[ranking_type]
+		else:
+			# Default to braille download
+			s00201_param, book_type, ranking_name = ("1", "braille", "点字ダウンロード")
 
-				# Get next page
-				try:
-					current_page += 1
-					if next_page_url.startswith('http'):
-						full_url = next_page_url
-					else:
-						full_url = f"https://library.sapie.or.jp/cgi-bin/{next_page_url}"
+		# Calculate date for 1 week ago (default period)
+		from datetime import datetime, timedelta
+		one_week_ago = datetime.now() - timedelta(days=7)
+		date_param = one_week_ago.strftime("%Y%m%d")
 
-					log.info(f"Requesting page {current_page}: {full_url}")
-					response = self.session.get(full_url)
-					response.encoding = 'shift_jis'
+		# Build URL for popular books page
+		# S00201: ranking type, S00212: category (1=books), S00222: start date
+		popular_url = f"{self.LIBRARY_BASE_URL}?S00101={action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}&S00201={s00201_param}&S00212=1&S00222={date_param}&RTNTME={self.session_tokens.get('RTNTME', '')}"
 
-				except Exception as e:
-					log.error(f"Error fetching next page: {e}")
-					break
+		log.info(f"Requesting {ranking_name} ranking: {popular_url}")
 
-			if all_results:
-				log.info(f"{ranking_name} ranking retrieval successful: {len(all_results)} total results")
-				return (True, all_results)
-			else:
-				log.info(f"No results found for {ranking_name} ranking")
-				return (True, [])
+		# Request popular books page
+		page = self._get_page(popular_url)
 
-		except requests.exceptions.RequestException as e:
-			log.error(f"Network error getting popular books: {e}")
-			return (False, f"ネットワークエラー: {str(e)}")
-		except Exception as e:
-			log.error(f"Popular books error: {e}", exc_info=True)
-			return (False, f"人気図書取得エラー: {str(e)}")
+		# Parse results from all pages
+		yield from self._iter_result_pages(page, book_type)
 
 	def _get_all_popular_rankings(self):
 		"""
 		Get all 5 popular ranking types
 
+		The rankings are fetched concurrently; the merged results keep the
+		order of POPULAR_RANKINGS.
+
 		Returns:
 			tuple: (success: bool, results: list or error_message: str)
 		"""
 		try:
-			# All ranking types with their names
-			ranking_types = [
-				("3", "デイジーダウンロード", "daisy"),
-				("4", "デイジー再生", "daisy"),
-				("22", "録音オンラインリクエスト", "daisy"),
-				("1", "点字ダウンロード", "braille"),
-				("21", "点字オンラインリクエスト", "braille")
-			]
+			ranking_results = dict(self.iter_all_popular_rankings())
 
 			all_results = []
-			action = "J03LST01"
-
-			# Calculate date for 1 week ago
-			from datetime import datetime, timedelta
-			one_week_ago = datetime.now() - timedelta(days=7)
-			date_param = one_week_ago.strftime("%Y%m%d")
+			for ranking_type, ranking_name, book_type in POPULAR_RANKINGS:
+				all_results.extend(ranking_results.get(ranking_name, []))
 
-			for ranking_type, ranking_name, book_type in ranking_types:
-				log.info(f"Getting {ranking_name} ranking...")
-
-				# Build URL
-				popular_url = f"{self.LIBRARY_BASE_URL}?S00101={action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}&S00201={ranking_type}&S00212=1&S00222={date_param}&RTNTME={self.session_tokens.get('RTNTME', '')}"
-
-				# Request ranking page
-				response = self.session.get(popular_url)
-				response.encoding = 'shift_jis'
-
-				# Parse results with pagination
-				current_page = 1
-				max_pages = 100
+			log.info(f"All rankings retrieval successful: {len(all_results)} total results")
+			return (True, all_results)
 
-				while current_page <= max_pages:
-					soup = BeautifulSoup(response.text, 'html.parser')
+		except Exception as e:
+			log.error(f"Error getting all rankings: {e}", exc_info=True)
+			return (False, f"全ランキング取得エラー: {str(e)}")
 
-					# Check for "no results" message
-					if "該当するデータが見つかりませんでした" in response.text or "検索結果：0件" in response.text:
-						break
+	def iter_all_popular_rankings(self):
+		"""
+		Get all 5 popular ranking types, yielding each ranking as soon as it completes
 
-					# Parse results from current page
-					page_results = self._parse_search_results(soup, book_type)
+		Yields:
+			tuple: (ranking_name: str, results: list) in order of completion,
+				with each result tagged with 'ranking_type'
+		"""
+		self._require_login()
 
-					# Add ranking type info to each result
-					for result in page_results:
-						result['ranking_type'] = ranking_name
+		# Extract current session tokens
+		self._ensure_session_tokens()
 
-					all_results.extend(page_results)
+		# Calculate date for 1 week ago
+		from datetime import datetime, timedelta
+		one_week_ago = datetime.now() - timedelta(days=7)
+		date_param = one_week_ago.strftime("%Y%m%d")
 
-					# Check if there's a next page
-					next_page_url = self._has_next_page(soup)
-					if not next_page_url:
-						break
+		executor = ThreadPoolExecutor(max_workers=RANKING_FETCH_WORKERS)
+		futures = {}
+		try:
+			for ranking_type, ranking_name, book_type in POPULAR_RANKINGS:
+				future = executor.submit(self._fetch_ranking, ranking_type, ranking_name, book_type, date_param)
+				futures[future] = ranking_name
+
+			for future in as_completed(futures):
+				yield (futures[future], future.result())
+		finally:
+			# Stop rankings not started yet if the consumer stops iterating early
+			for future in futures:
+				future.cancel()
+			executor.shutdown(wait=False)
+
+	def _fetch_ranking(self, ranking_type, ranking_name, book_type, date_param):
+		"""
+		Fetch all pages of one popular book ranking
 
-					# Get next page
-					try:
-						current_page += 1
-						if next_page_url.startswith('http'):
-							full_url = next_page_url
-						else:
-							full_url = f"https://library.sapie.or.jp/cgi-bin/{next_page_url}"
+		Args:
+			ranking_type (str): S00201 value of the ranking
+			ranking_name (str): Name stored in the 'ranking_type' field of each result
+			book_type (str): Type of book
+			date_param (str): Start date of the ranking period (YYYYMMDD)
 
-						response = self.session.get(full_url)
-						response.encoding = 'shift_jis'
+		Returns:
+			list: Results of the ranking
+		"""
+		log.info(f"Getting {ranking_name} ranking...")
 
-					except Exception as e:
-						log.error(f"Error fetching next page: {e}")
-						break
+		# Build URL
+		action = "J03LST01"
+		popular_url = f"{self.LIBRARY_BASE_URL}?S00101={action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}&S00201={ranking_type}&S00212=1&S00222={date_param}&RTNTME={self.session_tokens.get('RTNTME', '')}"
 
-				log.info(f"{ranking_name}: {len([r for r in all_results if r.get('ranking_type') == ranking_name])} results")
+		# Request ranking page
+		page = self._get_page(popular_url)
 
-			log.info(f"All rankings retrieval successful: {len(all_results)} total results")
-			return (True, all_results)
+		# Parse results from all pages
+		results = []
+		for page_results in self._iter_result_pages(page, book_type):
+			# Add ranking type info to each result
+			for result in page_results:
+				result['ranking_type'] = ranking_name
+			results.extend(page_results)
 
-		except Exception as e:
-			log.error(f"Error getting all rankings: {e}", exc_info=True)
-			return (False, f"全ランキング取得エラー: {str(e)}")
+		log.info(f"{ranking_name}: {len(results)} results")
+		return results
 
-	def detailed_search(self, search_params):
+	def detailed_search(self, search_params, on_page=None):
 		"""
 		Perform detailed search on Sapie Library
 
 		Args:
 			search_params (dict): Detailed search parameters
+			on_page (callable): Optional callback receiving the results of each page
 
 		Returns:
 			tuple: (success: bool, results: list or error_message: str)
 		"""
-		if not self.logged_in:
-			return (False, "ログインしてください。")
-
-		try:
-			log.info(f"Performing detailed search with {len(search_params)} parameters")
-
-			# Extract current session tokens
-			self._extract_session_tokens()
-
-			# Detailed search uses J01SCH04 for form page
-			search_action = "J01SCH04"
-			book_type = search_params.get("book_type", "all")
-
-			# Navigate to search form page first
-			search_page_url = f"{self.LIBRARY_BASE_URL}?S00101={search_action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}"
+		return self._collect_results(
+			self.iter_detailed_search(search_params),
+			"Detailed search", "詳細検索エラー", on_page,
+			("detailed_search", None, search_params)
+		)
 
-			log.info(f"Navigating to detailed search page: {search_page_url}")
-			response = self.session.get(search_page_url)
-			response.encoding = 'shift_jis'
+	def iter_detailed_search(self, search_params):
+		"""
+		Perform detailed search on Sapie Library, yielding results page by page
 
-			# Extract ALL form fields from search page
-			soup = BeautifulSoup(response.text, 'html.parser')
-			search_data = {}
-			for hidden in soup.find_all('input', type='hidden'):
-				name = hidden.get('name')
-				value = hidden.get('value', '')
-				if name:
-					search_data[name] = value
+		Args:
+			search_params (dict): Detailed search parameters
 
-			# Set execution action to J01LST04
-			search_data['S00101'] = 'J01LST04'
+		Yields:
+			list: Results of one page as soon as it has been parsed
+		"""
+		self._require_login()
 
-			# Add detailed search parameters (corrected parameter names)
-			if search_params.get("title"):
-				search_data['S00251'] = search_params.get("title", '')
-				search_data['S00215'] = search_params.get("title_method", '1')  # Corrected from S00253
+		log.info(f"Performing detailed search with {len(search_params)} parameters")
 
-			if search_params.get("author"):
-				search_data['S00252'] = search_params.get("author", '')
-				search_data['S00216'] = search_params.get("author_method", '1')  # Corrected from S00254
+		# Extract current session tokens
+		self._ensure_session_tokens()
 
-			if search_params.get("keyword"):
-				search_data['S00253'] = search_params.get("keyword", '')  # Corrected from S00255
-				search_data['S00234'] = search_params.get("keyword_method", '1')  # Corrected from S00256
-				if search_params.get("exclude_abstract"):
-					search_data['S00220'] = search_params.get("exclude_abstract", '')  # Corrected from S00267
+		# Detailed search uses J01SCH04 for form page
+		search_action = "J01SCH04"
+		book_type = search_params.get("book_type", "all")
 
-			if search_params.get("publisher"):
-				search_data['S00254'] = search_params.get("publisher", '')  # Corrected from S00257
+		# Navigate to search form page first
+		search_page_url = f"{self.LIBRARY_BASE_URL}?S00101={search_action}&S00102={self.session_tokens.get('S00102', '')}&S00103={self.session_tokens.get('S00103', '')}"
 
-			if search_params.get("ndc"):
-				search_data['S00241'] = search_params.get("ndc", '')  # Corrected from S00258
+		log.info(f"Navigating to detailed search page: {search_page_url}")
+		page = self._get_page(search_page_url)
 
-			if search_params.get("genre"):
-				search_data['S00239'] = search_params.get("genre", '')  # Corrected from S00259
+		# Extract ALL form fields from search page
+		search_data = {}
+		for name, value in page.hidden_inputs:
+			if name:
+				search_data[name] = value
 
-			if search_params.get("isbn"):
-				search_data['S00243'] = search_params.get("isbn", '')  # Corrected from S00260
+		# Set execution action to J01LST04
+		search_data['S00101'] = 'J01LST04'
 
-			if search_params.get("braille_num"):
-				search_data['S00233'] = search_params.get("braille_num", '')  # Corrected from S00261
+		# Add detailed search parameters (corrected parameter names)
+		if search_params.get("title"):
+			search_data['S00251'] = search_params.get("title", '')
+			search_data['S00215'] = search_params.get("title_method", '1')  # Corrected from S00253
 
-			if search_params.get("producer_id"):
-				search_data['S00231'] = search_params.get("producer_id", '')  # Corrected from S00263
+		if search_params.get("author"):
+			search_data['S00252'] = search_params.get("author", '')
+			search_data['S00216'] = search_params.get("author_method", '1')  # Corrected from S00254
 
-			if search_params.get("holder_id"):
-				search_data['S00232'] = search_params.get("holder_id", '')  # Corrected from S00264
+		if search_params.get("keyword"):
+			search_data['S00253'] = search_params.get("keyword", '')  # Corrected from S00255
+			search_data['S00234'] = search_params.get("keyword_method", '1')  # Corrected from S00256
+			if search_params.get("exclude_abstract"):
+				search_data['S00220'] = search_params.get("exclude_abstract", '')  # Corrected from S00267
 
-			if search_params.get("has_content"):
-				search_data['S00213'] = search_params.get("has_content", '')  # Corrected from S00265
+		if search_params.get("publisher"):
+			search_data['S00254'] = search_params.get("publisher", '')  # Corrected from S00257
 
-			if search_params.get("online_request"):
-				search_data['S00214'] = search_params.get("online_request", '')  # Corrected from S00266
+		if search_params.get("ndc"):
+			search_data['S00241'] = search_params.get("ndc", '')  # Corrected from S00258
 
-			if search_params.get("include_ndl"):
-				search_data['S00262'] = search_params.get("include_ndl", '')  # Unchanged
+		if search_params.get("genre"):
+			search_data['S00239'] = search_params.get("genre", '')  # Corrected from S00259
 
-			# Submit detailed search
-			import urllib.parse
+		if search_params.get("isbn"):
+			search_data['S00243'] = search_params.get("isbn", '')  # Corrected from S00260
 
-			# Manually URL encode with shift_jis
-			encoded_parts = []
-			for key, value in search_data.items():
-				if isinstance(key, str):
-					key_bytes = key.encode('shift_jis', errors='ignore')
-				else:
-					key_bytes = str(key).encode('shift_jis', errors='ignore')
+		if search_params.get("braille_num"):
+			search_data['S00233'] = search_params.get("braille_num", '')  # Corrected from S00261
 
-				if isinstance(value, str):
-					value_bytes = value.encode('shift_jis', errors='ignore')
-				else:
-					value_bytes = str(value).encode('shift_jis', errors='ignore')
+		if search_params.get("producer_id"):
+			search_data['S00231'] = search_params.get("producer_id", '')  # Corrected from S00263
 
-				encoded_key = urllib.parse.quote_from_bytes(key_bytes)
-				encoded_value = urllib.parse.quote_from_bytes(value_bytes)
-				encoded_parts.append(f'{encoded_key}={encoded_value}')
+		if search_params.get("holder_id"):
+			search_data['S00232'] = search_params.get("holder_id", '')  # Corrected from S00264
 
-			encoded_body = '&'.join(encoded_parts)
+		if search_params.get("has_content"):
+			search_data['S00213'] = search_params.get("has_content", '')  # Corrected from S00265
 
-			response = self.session.post(
-				self.LIBRARY_BASE_URL,
-				data=encoded_body.encode('ascii'),
-				headers={'Content-Type': 'application/x-www-form-urlencoded'}
-			)
-			response.encoding = 'shift_jis'
+		if search_params.get("online_request"):
+			search_data['S00214'] = search_params.get("online_request", '')  # Corrected from S00266
 
-			# DEBUG: Save response HTML to file
-			import os
-			debug_file = os.path.join(os.path.expanduser('~'), 'sapie_detailed_search_debug.html')
-			try:
-				with open(debug_file, 'w', encoding='shift_jis', errors='ignore') as f:
-					f.write(response.text)
-				log.info(f"DEBUG: Detailed search HTML saved to {debug_file}")
-			except Exception as e:
-				log.warning(f"Could not save debug file: {e}")
+		if search_params.get("include_ndl"):
+			search_data['S00262'] = search_params.get("include_ndl", '')  # Unchanged
 
-			# Parse results from all pages
-			all_results = []
-			current_page = 1
-			max_pages = 100
-
-			while current_page <= max_pages:
-				soup = BeautifulSoup(response.text, 'html.parser')
-
-				# Check for "no results" message
-				if "該当するデータが見つかりませんでした" in response.text or "検索結果：0件" in response.text:
-					log.info("No results found")
-					break
+		# Submit detailed search
+		import urllib.parse
 
-				# Parse results from current page
-				page_results = self._parse_search_results(soup, book_type)
-				all_results.extend(page_results)
-				log.info(f"Page {current_page}: {len(page_results)} results (total: {len(all_results)})")
-
-				# Check if there's a next page
-				next_page_url = self._has_next_page(soup)
-				if not next_page_url:
-					log.info("No more pages")
-					break
+		# Manually URL encode with shift_jis
+		encoded_parts = []
+		for key, value in search_data.items():
+			if isinstance(key, str):
+				key_bytes = key.encode('shift_jis', errors='ignore')
+			else:
+				key_bytes = str(key).encode('shift_jis', errors='ignore')
 
-				# Get next page
-				try:
-					current_page += 1
-					if next_page_url.startswith('http'):
-						full_url = next_page_url
-					else:
-						full_url = f"https://library.sapie.or.jp/cgi-bin/{next_page_url}"
+			if isinstance(value, str):
+				value_bytes = value.encode('shift_jis', errors='ignore')
+			else:
+				value_bytes = str(value).encode('shift_jis', errors='ignore')
 
-					log.info(f"Requesting page {current_page}: {full_url}")
-					response = self.session.get(full_url)
-					response.encoding = 'shift_jis'
+			encoded_key = urllib.parse.quote_from_bytes(key_bytes)
+			encoded_value = urllib.parse.quote_from_bytes(value_bytes)
+			encoded_parts.append(f'{encoded_key}={encoded_value}')
 
-				except Exception as e:
-					log.error(f"Error fetching next page: {e}")
-					break
+		encoded_body = '&'.join(encoded_parts)
 
-			if all_results:
-				log.info(f"Detailed search successful: {len(all_results)} total results")
-				return (True, all_results)
-			else:
-				log.info("Detailed search returned no results")
-				return (True, [])
+		page = self._post_page(
+			self.LIBRARY_BASE_URL,
+			data=encoded_body.encode('ascii'),
+			headers={'Content-Type': 'application/x-www-form-urlencoded'}
+		)
 
-		except requests.exceptions.RequestException as e:
-			log.error(f"Network error during detailed search: {e}")
-			return (False, f"ネットワークエラー: {str(e)}")
+		# DEBUG: Save response HTML to file
+		import os
+		debug_file = os.path.join(os.path.expanduser('~'), 'sapie_detailed_search_debug.html')
+		try:
+			with open(debug_file, 'w', encoding='shift_jis', errors='ignore') as f:
+				f.write(page.html)
+			log.info(f"DEBUG: Detailed search HTML saved to {debug_file}")
 		except Exception as e:
-			log.error(f"Detailed search error: {e}", exc_info=True)
-			return (False, f"詳細検索エラー: {str(e)}")
+			log.warning(f"Could not save debug file: {e}")
+
+		# Parse results from all pages
+		yield from self._iter_result_pages(page, book_type)
 
 	def get_genre_subgenres(self, genre_code):
 		"""
@@ -1087,7 +1645,7 @@ class SapieClient:
 			log.info(f"Getting subgenres for genre: code='{genre_code}'")
 
 			# Extract session tokens
-			self._extract_session_tokens()
+			self._ensure_session_tokens()
 
 			# Build genre URL to get subgenre list
 			# Use J01SC202 to navigate to the subgenre selection page for the given main genre
@@ -1095,14 +1653,13 @@ class SapieClient:
 
 			log.info(f"Fetching subgenres from: {genre_url}")
 
-			response = self.session.get(genre_url)
-			response.encoding = 'shift_jis'
+			page = self._get_page(genre_url)
 
-			if response.status_code != 200:
-				log.error(f"Failed to load subgenres page: HTTP {response.status_code}")
-				return (False, f"サブジャンルページの読み込みに失敗しました (HTTP {response.status_code})")
+			if page.status_code != 200:
+				log.error(f"Failed to load subgenres page: HTTP {page.status_code}")
+				return (False, f"サブジャンルページの読み込みに失敗しました (HTTP {page.status_code})")
 
-			soup = BeautifulSoup(response.text, 'html.parser')
+			soup = page.soup
 
 			# Parse subgenres from the page
 			# Look for ul.LINK which contains the subgenre links
@@ -1139,7 +1696,8 @@ class SapieClient:
 			return (False, f"サブジャンル取得エラー: {str(e)}")
 
 	def genre_search(self, subgenre_code, material_type="", has_content=False, production_status="",
-	                 orig_pub_from="", orig_pub_to="", complete_from="", complete_to="", daisy_only=False):
+	                 orig_pub_from="", orig_pub_to="", complete_from="", complete_to="", daisy_only=False,
+	                 on_page=None):
 		"""
 		Perform genre search on Sapie Library
 
@@ -1153,142 +1711,181 @@ class SapieClient:
 			complete_from (str): Completion date from (S00226)
 			complete_to (str): Completion date to (S00227)
 			daisy_only (bool): DAISY only (S00208)
+			on_page (callable): Optional callback receiving the results of each page
 
 		Returns:
 			tuple: (success: bool, results: list or error_message: str)
 		"""
-		if not self.logged_in:
-			return (False, "ログインしてください。")
+		return self._collect_results(
+			self.iter_genre_search(subgenre_code, material_type, has_content, production_status,
+				orig_pub_from, orig_pub_to, complete_from, complete_to, daisy_only),
+			"Genre search", "ジャンル検索エラー", on_page,
+			("genre_search", None, {
+				'subgenre_code': subgenre_code, 'material_type': material_type,
+				'has_content': has_content, 'production_status': production_status,
+				'orig_pub_from': orig_pub_from, 'orig_pub_to': orig_pub_to,
+				'complete_from': complete_from, 'complete_to': complete_to,
+				'daisy_only': daisy_only
+			})
+		)
+
+	def iter_genre_search(self, subgenre_code, material_type="", has_content=False, production_status="",
+	                 orig_pub_from="", orig_pub_to="", complete_from="", complete_to="", daisy_only=False):
+		"""
+		Perform genre search on Sapie Library, yielding results page by page
 
-		try:
-			log.info(f"Performing genre search: subgenre={subgenre_code}")
+		Args:
+			subgenre_code (str): Subgenre code (e.g., "0602")
+			material_type (str): Material type code (S00201)
+			has_content (bool): Only materials with content (S00213)
+			production_status (str): Production status (S00219)
+			orig_pub_from (str): Original publication date from (S00222)
+			orig_pub_to (str): Original publication date to (S00223)
+			complete_from (str): Completion date from (S00226)
+			complete_to (str): Completion date to (S00227)
+			daisy_only (bool): DAISY only (S00208)
 
-			# Extract current session tokens
-			self._extract_session_tokens()
+		Yields:
+			list: Results of one page as soon as it has been parsed
+		"""
+		self._require_login()
 
-			# Determine book type for result parsing
-			book_type = "daisy" if daisy_only else "braille"
+		log.info(f"Performing genre search: subgenre={subgenre_code}")
 
-			# Build search data - use J01LST05 action for genre search results
-			search_data = {
-				'S00101': 'J01LST05',  # Search results action
-				'S00102': self.session_tokens.get('S00102', ''),
-				'S00103': self.session_tokens.get('S00103', ''),
-				'RTNTME': self.session_tokens.get('RTNTME', ''),
-				'S00239': subgenre_code,  # Subgenre code
-			}
+		# Extract current session tokens
+		self._ensure_session_tokens()
 
-			# Add optional parameters with correct field names
-			if material_type:
-				search_data['S00201'] = material_type
+		# Determine book type for result parsing
+		book_type = "daisy" if daisy_only else "braille"
 
-			if has_content:
-				search_data['S00213'] = "1"
+		# Build search data - use J01LST05 action for genre search results
+		search_data = {
+			'S00101': 'J01LST05',  # Search results action
+			'S00102': self.session_tokens.get('S00102', ''),
+			'S00103': self.session_tokens.get('S00103', ''),
+			'RTNTME': self.session_tokens.get('RTNTME', ''),
+			'S00239': subgenre_code,  # Subgenre code
+		}
 
-			if daisy_only:
-				search_data['S00208'] = "1"
+		# Add optional parameters with correct field names
+		if material_type:
+			search_data['S00201'] = material_type
 
-			if production_status:
-				search_data['S00219'] = production_status
+		if has_content:
+			search_data['S00213'] = "1"
 
-			if orig_pub_from:
-				search_data['S00222'] = orig_pub_from
+		if daisy_only:
+			search_data['S00208'] = "1"
 
-			if orig_pub_to:
-				search_data['S00223'] = orig_pub_to
+		if production_status:
+			search_data['S00219'] = production_status
 
-			if complete_from:
-				search_data['S00226'] = complete_from
+		if orig_pub_from:
+			search_data['S00222'] = orig_pub_from
 
-			if complete_to:
-				search_data['S00227'] = complete_to
+		if orig_pub_to:
+			search_data['S00223'] = orig_pub_to
 
-			# Submit genre search
-			import urllib.parse
+		if complete_from:
+			search_data['S00226'] = complete_from
 
-			# Manually URL encode with shift_jis
-			encoded_parts = []
-			for key, value in search_data.items():
-				if isinstance(key, str):
-					key_bytes = key.encode('shift_jis', errors='ignore')
-				else:
-					key_bytes = str(key).encode('shift_jis', errors='ignore')
+		if complete_to:
+			search_data['S00227'] = complete_to
 
-				if isinstance(value, str):
-					value_bytes = value.encode('shift_jis', errors='ignore')
-				else:
-					value_bytes = str(value).encode('shift_jis', errors='ignore')
+		# Submit genre search
+		import urllib.parse
 
-				encoded_key = urllib.parse.quote_from_bytes(key_bytes)
-				encoded_value = urllib.parse.quote_from_bytes(value_bytes)
-				encoded_parts.append(f'{encoded_key}={encoded_value}')
+		# Manually URL encode with shift_jis
+		encoded_parts = []
+		for key, value in search_data.items():
+			if isinstance(key, str):
+				key_bytes = key.encode('shift_jis', errors='ignore')
+			else:
+				key_bytes = str(key).encode('shift_jis', errors='ignore')
 
-			encoded_body = '&'.join(encoded_parts)
+			if isinstance(value, str):
+				value_bytes = value.encode('shift_jis', errors='ignore')
+			else:
+				value_bytes = str(value).encode('shift_jis', errors='ignore')
 
-			response = self.session.post(
-				self.LIBRARY_BASE_URL,
-				data=encoded_body.encode('ascii'),
-				headers={'Content-Type': 'application/x-www-form-urlencoded'}
-			)
-			response.encoding = 'shift_jis'
+			encoded_key = urllib.parse.quote_from_bytes(key_bytes)
+			encoded_value = urllib.parse.quote_from_bytes(value_bytes)
+			encoded_parts.append(f'{encoded_key}={encoded_value}')
 
-			# Parse results from all pages
-			all_results = []
-			current_page = 1
-			max_pages = 100
+		encoded_body = '&'.join(encoded_parts)
 
-			while current_page <= max_pages:
-				soup = BeautifulSoup(response.text, 'html.parser')
+		page = self._post_page(
+			self.LIBRARY_BASE_URL,
+			data=encoded_body.encode('ascii'),
+			headers={'Content-Type': 'application/x-www-form-urlencoded'}
+		)
 
-				# Check for "no results" message
-				if "該当するデータが見つかりませんでした" in response.text or "検索結果：0件" in response.text:
-					log.info("No results found")
-					break
+		# Parse results from all pages
+		yield from self._iter_result_pages(page, book_type)
 
-				# Parse results from current page
-				page_results = self._parse_search_results(soup, book_type)
-				all_results.extend(page_results)
-				log.info(f"Page {current_page}: {len(page_results)} results (total: {len(all_results)})")
+	def get_book_details(self, s00221, s00222):
+		"""
+		Fetch detailed information for a specific book
 
-				# Check if there's a next page
-				next_page_url = self._has_next_page(soup)
-				if not next_page_url:
-					log.info("No more pages")
-					break
+		Details are served from the detail cache when available. If the same
+		book is already being fetched (e.g. by DetailPrefetcher), that request
+		is waited for instead of sending another one.
 
-				# Get next page
-				try:
-					current_page += 1
-					if next_page_url.startswith('http'):
-						full_url = next_page_url
-					else:
-						full_url = f"https://library.sapie.or.jp/cgi-bin/{next_page_url}"
+		Args:
+			s00221 (str): Search ID (optional, can be empty)
+			s00222 (str): Book ID (required)
 
-					log.info(f"Requesting page {current_page}: {full_url}")
-					response = self.session.get(full_url)
-					response.encoding = 'shift_jis'
+		Returns:
+			tuple: (success: bool, details: dict or error_message: str)
+		"""
+		cached_details = self.get_cached_book_details(s00222)
+		if cached_details is not None:
+			log.debug(f"Book details served from cache: {s00222}")
+			return (True, cached_details)
 
-				except Exception as e:
-					log.error(f"Error fetching next page: {e}")
+		if not self.logged_in:
+			return (False, "ログインしてください。")
+
+		while True:
+			with self._detail_lock:
+				pending = self._detail_fetches.get(s00222)
+				if pending is None:
+					self._detail_fetches[s00222] = threading.Event()
 					break
 
-			if all_results:
-				log.info(f"Genre search successful: {len(all_results)} total results")
-				return (True, all_results)
-			else:
-				log.info("Genre search returned no results")
-				return (True, [])
+			# Another thread is fetching this book: take its result from the
+			# cache, or claim the fetch once it has failed or given up
+			pending.wait(DETAIL_WAIT_TIMEOUT)
+			cached_details = self.get_cached_book_details(s00222)
+			if cached_details is not None:
+				return (True, cached_details)
 
-		except requests.exceptions.RequestException as e:
-			log.error(f"Network error during genre search: {e}")
-			return (False, f"ネットワークエラー: {str(e)}")
-		except Exception as e:
-			log.error(f"Genre search error: {e}", exc_info=True)
-			return (False, f"ジャンル検索エラー: {str(e)}")
+		try:
+			success, result = self._fetch_book_details(s00221, s00222)
+			if success and self.detail_cache:
+				self.detail_cache.put_details(s00222, result, account=self.username)
+			return (success, result)
+		finally:
+			with self._detail_lock:
+				self._detail_fetches.pop(s00222).set()
+
+	def get_cached_book_details(self, s00222):
+		"""
+		Get the details of a book from the detail cache
 
-	def get_book_details(self, s00221, s00222):
+		Args:
+			s00222 (str): Book ID
+
+		Returns:
+			dict or None: Cached details, or None if not cached
 		"""
-		Fetch detailed information for a specific book
+		if not self.detail_cache or not s00222:
+			return None
+		return self.detail_cache.get_details(s00222, account=self.username)
+
+	def _fetch_book_details(self, s00221, s00222):
+		"""
+		Fetch and parse the detail page of a book
 
 		Args:
 			s00221 (str): Search ID (optional, can be empty)
@@ -1297,12 +1894,9 @@ class SapieClient:
 		Returns:
 			tuple: (success: bool, details: dict or error_message: str)
 		"""
-		if not self.logged_in:
-			return (False, "ログインしてください。")
-
 		try:
 			# Extract current session tokens
-			self._extract_session_tokens()
+			self._ensure_session_tokens()
 
 			# Build detail page URL
 			# S00221 is optional - if not provided, omit it
@@ -1327,26 +1921,12 @@ class SapieClient:
 					f"RTNTME={self.session_tokens.get('RTNTME', '')}"
 				)
 
-			response = self.session.get(detail_url)
-			response.encoding = 'shift_jis'
-
-			# Parse the detail page
-			soup = BeautifulSoup(response.content.decode('shift_jis', errors='ignore'), 'html.parser')
+			page = self._get_page(detail_url, errors='ignore')
 
-			# Extract detailed information
+			# Extract detailed information from the th/td table rows
 			details = {}
-
-			# Find all table rows in the detail page
-			rows = soup.find_all('tr')
-
-			for row in rows:
-				th = row.find('th')
-				td = row.find('td')
-
-				if th and td:
-					label = th.get_text(strip=True)
-					value = td.get_text(strip=True)
-					details[label] = value
+			for label, value in page.detail_rows:
+				details[label] = value
 
 			if details:
 				log.info(f"Book details retrieved successfully: {len(details)} fields")
@@ -1381,9 +1961,87 @@ class SapieClient:
 		except Exception as e:
 			log.error(f"Error closing session: {e}")
 
+		# Write the cache changes still waiting for their delayed write
+		for cache in (self.result_cache, self.detail_cache):
+			if cache:
+				try:
+					cache.close()
+				except Exception as e:
+					log.error(f"Error writing cache: {e}")
+
 	def __del__(self):
 		"""Cleanup when object is destroyed"""
 		try:
 			self.close()
 		except:
 			pass
+
+
+class DetailPrefetcher:
+	"""Fetch book details in the background before they are asked for"""
+
+	def __init__(self, client, workers=DETAIL_PREFETCH_WORKERS):
+		"""
+		Initialize the prefetcher
+
+		Args:
+			client (SapieClient): Client with a detail cache
+			workers (int): Maximum number of concurrent detail requests
+		"""
+		self.client = client
+		self.workers = workers
+		self._condition = threading.Condition()
+		self._queue = []
+		self._threads = []
+		self._stopped = False
+
+	def prefetch(self, books):
+		"""
+		Replace the books waiting to be prefetched
+
+		Books queued by an earlier call that have not been started yet are
+		dropped, so only the neighbourhood of the current selection is fetched.
+
+		Args:
+			books (list): Result dictionaries, most wanted first
+		"""
+		with self._condition:
+			if self._stopped:
+				return
+
+			self._queue = [
+				(book.get('s00221', ''), book['s00222'])
+				for book in books
+				if book.get('s00222') and self.client.get_cached_book_details(book['s00222']) is None
+			]
+
+			while len(self._threads) < min(self.workers, len(self._queue)):
+				thread = threading.Thread(target=self._run, daemon=True)
+				thread.start()
+				self._threads.append(thread)
+
+			self._condition.notify_all()
+
+	def stop(self):
+		"""Stop prefetching; requests already running are completed"""
+		with self._condition:
+			self._stopped = True
+			self._queue = []
+			self._condition.notify_all()
+
+	def _run(self):
+		"""Worker thread fetching queued book details"""
+		while True:
+			with self._condition:
+				while not self._queue and not self._stopped:
+					self._condition.wait()
+				if self._stopped:
+					return
+				s00221, s00222 = self._queue.pop(0)
+
+			try:
+				success, result = self.client.get_book_details(s00221, s00222)
+				if not success:
+					log.debug(f"Prefetching details of {s00222} failed: {result}")
+			except Exception as e:
+				log.debug(f"Error prefetching details of {s00222}: {e}")
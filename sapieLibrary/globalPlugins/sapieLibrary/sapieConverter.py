@@ -5,48 +5,160 @@ import os
 import zipfile
 import logging
 
+from . import archiveIndex
+
 log = logging.getLogger(__name__)
 
 # Supported braille file extensions
-BRAILLE_EXTENSIONS = ('.BES', '.BET', '.BMT', '.BSE', '.NAB', '.BRL')
+BRAILLE_EXTENSIONS = archiveIndex.BRAILLE_EXTENSIONS
+
+# Bytes of a BES file skipped before the braille text starts
+BES_HEADER_SIZE = 1024
+
+# Bytes read at a time from a braille file in an archive
+BES_CHUNK_SIZE = 256 * 1024
+
+# Range of BES bytes holding braille cells
+BES_CELL_FIRST = 0xa0
+BES_CELL_LAST = 0xdf
+
+
+def _make_bes_tables():
+	"""
+	Build the byte tables of the BES conversion
+
+	Returns:
+		tuple: (bytes deleted from the output, low byte table, high byte table)
+			where the tables map a BES byte to the UTF-16 code unit of its output
+	"""
+	delete = bytearray()
+	low = bytearray(256)
+	high = bytearray(256)
+	for byte in range(256):
+		if BES_CELL_FIRST <= byte <= BES_CELL_LAST:
+			# Braille cell: U+2800 + dots
+			low[byte] = byte - BES_CELL_FIRST
+			high[byte] = 0x28
+		elif byte in (0x0a, 0x0d):
+			low[byte] = byte
+		elif byte not in (0xfd, 0xfe):
+			# 0x0c (removed by page breaks), 0xff and anything else
+			delete.append(byte)
+	return bytes(delete), bytes(low), bytes(high)
+
+
+BES_DELETE, BES_LOW_BYTES, BES_HIGH_BYTES = _make_bes_tables()
+
+
+class BesDecoder:
+	"""
+	Incremental BES to Unicode braille decoder
+
+	Content can be passed in chunks of any size; the output is the same as
+	converting the whole content at once. The decoder carries the header
+	skip, a 0x0D at the end of a chunk that may pair with a 0xFE, and the
+	last two bytes that a page break (0xFD) in the next chunk removes.
+	"""
+
+	def __init__(self):
+		# Bytes seen before the braille text starts
+		self._header = bytearray()
+		self._inBody = False
+		# Converted bytes not yet passed on, at most the last two
+		self._pending = bytearray()
+		# Position in the braille text of the first pending byte
+		self._position = 0
+
+	def decode(self, data, final=False):
+		"""
+		Convert the next chunk of BES content
+
+		Args:
+			data (bytes): Next chunk of the content
+			final (bool): Whether this is the last chunk
+
+		Returns:
+			str: Unicode braille of the bytes that are complete
+		"""
+		if not self._inBody:
+			self._header += data
+			if len(self._header) > BES_HEADER_SIZE + 1:
+				data = bytes(self._header[BES_HEADER_SIZE + 1:])
+				self._inBody = True
+				self._header = bytearray()
+			elif final:
+				# Content not longer than the header keeps only its last byte
+				data = bytes(self._header[-1:])
+				self._header = bytearray()
+			else:
+				return ''
+
+		carried = len(self._pending)
+		tenji = self._pending + data
+		tenji = tenji.replace(b'\x0d\xfe', b'\r\n')
+
+		# A page break (0xfd) removes the two bytes before it; page breaks
+		# among the carried bytes have been handled already
+		pos = tenji.find(0xfd, max(carried, 2 - self._position))
+		while pos != -1:
+			tenji[pos - 2:pos] = b'\x0c\x0c'
+			pos = tenji.find(0xfd, pos + 1)
+
+		if final:
+			complete = len(tenji)
+		else:
+			complete = max(len(tenji) - 2, 0)
+		self._pending = tenji[complete:]
+		self._position += complete
+		return self._convert(tenji[:complete])
+
+	def reset(self):
+		"""Forget the state of earlier content"""
+		self.__init__()
+
+	def _convert(self, tenji):
+		"""Convert bytes whose page breaks have been applied"""
+		tenji = tenji.translate(None, BES_DELETE)
+		tenji = tenji.replace(b'\xfd', b'\r\n').replace(b'\xfe', b'\r\n')
+
+		units = bytearray(len(tenji) * 2)
+		units[0::2] = tenji.translate(BES_LOW_BYTES)
+		units[1::2] = tenji.translate(BES_HIGH_BYTES)
+		return units.decode('utf-16-le')
 
 
 def convert_bes_to_unicode(content):
-	"""Convert BES binary content to Unicode braille patterns"""
-	result = ""
-	i = 0
-	for i in range(len(content)):
-		if i > 1024:
-			break
+	"""Convert BES binary content to Unicode braille patterns
 
-	tenji = bytearray(content[i:])
-	tenji = tenji.replace(b'\x0d\xfe', b'\r\n')
+	The conversion works on whole buffers: page breaks are found with
+	bytes.find, unused bytes are removed with bytes.translate, and the
+	output is assembled as UTF-16 code units from two translation tables.
+	"""
+	return BesDecoder().decode(content, final=True)
 
-	for i in range(2, len(tenji)):
-		if tenji[i] == 0xfd:
-			tenji[i-2] = 0x0c
-			tenji[i-1] = 0x0c
 
-	for i in range(len(tenji)):
-		byte = tenji[i]
-		ch = chr(byte + 0x2800 - 0xa0)
+def iter_bes_unicode(f, chunk_size=BES_CHUNK_SIZE):
+	"""Convert a BES file to Unicode braille chunk by chunk
 
-		if byte == 0x0d:
-			result += "\r"
-		elif byte == 0x0a:
-			result += "\n"
-		elif byte == 0xfd:
-			result += "\r\n"
-		elif byte == 0xfe:
-			result += "\r\n"
-		elif byte == 0x0c:
-			pass
-		elif byte == 0xff:
-			pass
-		elif '\u2800' <= ch <= '\u283f':
-			result += chr(byte + 0x2800 - 0xa0)
+	Args:
+		f: Binary file object, e.g. from ZipFile.open
+		chunk_size: Bytes read at a time
+
+	Yields:
+		Unicode braille text of each chunk
+	"""
+	decoder = BesDecoder()
+	while True:
+		chunk = f.read(chunk_size)
+		if not chunk:
+			break
+		text = decoder.decode(chunk)
+		if text:
+			yield text
 
-	return result
+	text = decoder.decode(b'', final=True)
+	if text:
+		yield text
 
 
 def list_braille_files(file_path):
@@ -55,19 +167,8 @@ def list_braille_files(file_path):
 	Returns:
 		List of tuples (display_name, internal_filename)
 	"""
-	bes_files = []
 	try:
-		with zipfile.ZipFile(file_path, mode='r', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
-			for info in zf.infolist():
-				try:
-					filename = info.filename.encode('cp437').decode('cp932')
-				except:
-					filename = info.filename
-
-				name, ext = os.path.splitext(filename)
-
-				if ext.upper() in BRAILLE_EXTENSIONS:
-					bes_files.append((name, info.filename))
+		bes_files = list(archiveIndex.get_index(file_path).braille_files)
 
 		# Sort by name
 		bes_files.sort(key=lambda x: x[0])
@@ -78,6 +179,84 @@ def list_braille_files(file_path):
 		return []
 
 
+def iter_book_text(file_path, selected_files=None, convert_to_kana=True):
+	"""Convert BES files in a ZIP/EXE piece by piece
+
+	Braille is read in chunks and passed through TenjiTexter.KanaStream,
+	so the first pages are available before the whole book has been
+	converted, and the complete text never has to be held in memory.
+
+	Args:
+		file_path: Path to the ZIP/EXE file
+		selected_files: Internal filenames to convert, in order; all braille files if None
+		convert_to_kana: Whether to convert to kana
+
+	Yields:
+		Text of the book, in pieces
+	"""
+	stream = None
+	if convert_to_kana:
+		from .TenjiTexter import KanaStream
+		stream = KanaStream()
+
+	with zipfile.ZipFile(file_path, mode='r', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+		if selected_files is None:
+			index = archiveIndex.get_index(file_path, zf)
+			members = [internal_name for name, internal_name in index.braille_files]
+		else:
+			members = selected_files
+
+		for internal_name in members:
+			try:
+				with zf.open(internal_name) as f:
+					for text in iter_bes_unicode(f):
+						if stream:
+							text, stream = _feed_kana(stream, text)
+						if text:
+							yield text
+			except Exception as e:
+				if selected_files is None:
+					raise
+				log.error(f"Error reading {internal_name}: {e}")
+
+	if stream:
+		text, stream = _feed_kana(stream, '', final=True)
+		if text:
+			yield text
+
+
+def _feed_kana(stream, text, final=False):
+	"""Pass braille to a KanaStream
+
+	If the conversion fails, the rest of the book is left as braille.
+
+	Returns:
+		Tuple of (text, stream), stream being None after a failure
+	"""
+	try:
+		return stream.feed(text, final), stream
+	except Exception as e:
+		log.error(f"Kana conversion failed: {e}")
+		return stream.abort(), None
+
+
+def get_book_title(file_path, selected_files=None):
+	"""Get the title of a book: the name of its first (selected) BES file
+
+	Returns:
+		Title string, the archive name if there is no BES file
+	"""
+	try:
+		index = archiveIndex.get_index(file_path)
+		if selected_files:
+			return os.path.splitext(index.names.get(selected_files[0], selected_files[0]))[0]
+		if index.braille_files:
+			return index.braille_files[0][0]
+	except Exception as e:
+		log.error(f"Error listing BES files: {e}")
+	return os.path.splitext(os.path.basename(file_path))[0]
+
+
 def extract_and_convert_selected_bes(file_path, selected_files, convert_to_kana=True):
 	"""Extract and convert specific BES files from ZIP/EXE
 
@@ -89,42 +268,9 @@ def extract_and_convert_selected_bes(file_path, selected_files, convert_to_kana=
 	Returns:
 		Tuple of (text_content, book_title)
 	"""
-	result = ""
-	book_title = os.path.splitext(os.path.basename(file_path))[0]
-
 	try:
-		with zipfile.ZipFile(file_path, mode='r', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
-			for internal_name in selected_files:
-				try:
-					with zf.open(internal_name) as f:
-						content = f.read()
-						braille_text = convert_bes_to_unicode(content)
-						result += braille_text
-				except Exception as e:
-					log.error(f"Error reading {internal_name}: {e}")
-
-				# Get display name for title
-				try:
-					filename = internal_name.encode('cp437').decode('cp932')
-				except:
-					filename = internal_name
-				name, ext = os.path.splitext(filename)
-				if not book_title or book_title == os.path.splitext(os.path.basename(file_path))[0]:
-					book_title = name
-
-		if convert_to_kana and result:
-			try:
-				from .TenjiTexter import DocumentsViewer
-				dv = DocumentsViewer()
-				dv.buff = result
-				result = dv.katakana_conv()
-				result = dv.Cxx(result)
-				result = dv.Cxx2(result)
-				result = dv.Cxx3(result)
-			except Exception as e:
-				log.error(f"Kana conversion failed: {e}")
-
-		return result, book_title
+		result = ''.join(iter_book_text(file_path, selected_files, convert_to_kana))
+		return result, get_book_title(file_path, selected_files)
 
 	except Exception as e:
 		log.error(f"Error extracting BES: {e}")
@@ -133,41 +279,9 @@ def extract_and_convert_selected_bes(file_path, selected_files, convert_to_kana=
 
 def extract_and_convert_bes(file_path, convert_to_kana=True):
 	"""Extract BES files from ZIP/EXE and convert to readable text"""
-	result = ""
-	book_title = os.path.splitext(os.path.basename(file_path))[0]
-
 	try:
-		with zipfile.ZipFile(file_path, mode='r', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
-			for info in zf.infolist():
-				try:
-					filename = info.filename.encode('cp437').decode('cp932')
-				except:
-					filename = info.filename
-
-				name, ext = os.path.splitext(filename)
-
-				if ext.upper() in BRAILLE_EXTENSIONS:
-					with zf.open(info.filename) as f:
-						content = f.read()
-						braille_text = convert_bes_to_unicode(content)
-						result += braille_text
-
-					if not book_title or book_title == os.path.splitext(os.path.basename(file_path))[0]:
-						book_title = name
-
-		if convert_to_kana and result:
-			try:
-				from .TenjiTexter import DocumentsViewer
-				dv = DocumentsViewer()
-				dv.buff = result
-				result = dv.katakana_conv()
-				result = dv.Cxx(result)
-				result = dv.Cxx2(result)
-				result = dv.Cxx3(result)
-			except Exception as e:
-				log.error(f"Kana conversion failed: {e}")
-
-		return result, book_title
+		result = ''.join(iter_book_text(file_path, None, convert_to_kana))
+		return result, get_book_title(file_path)
 
 	except Exception as e:
 		log.error(f"Error extracting BES: {e}")
@@ -8,15 +8,55 @@ import config
 import logging
 import addonHandler
 import threading
+import time
 from . import loginDialog
-from . import sapieClient
-from . import downloadThread
+from . import downloadManager
+from . import resultCache
 
 # Initialize translations
 addonHandler.initTranslation()
 
 log = logging.getLogger(__name__)
 
+# Rows above and below the selection whose details are prefetched
+DETAIL_PREFETCH_RADIUS = 2
+
+# Download progress is spoken when it has grown by this many percent,
+# at most once per interval in seconds
+DOWNLOAD_SPEECH_STEP = 25
+DOWNLOAD_SPEECH_INTERVAL = 10
+
+# Thread importing sapieClient in the background, see warmUpClient()
+_warmUpThread = None
+
+
+def warmUpClient():
+	"""
+	Import sapieClient in a background thread
+
+	sapieClient pulls in requests, urllib3, charset_normalizer, idna and
+	bs4, which take longer to import than the dialog takes to open. The
+	dialog therefore opens without them and starts this import, which has
+	usually finished by the time the user has entered their ID and
+	password. Code that needs the client imports sapieClient itself and
+	waits for the import if it is still running.
+	"""
+	global _warmUpThread
+	if _warmUpThread is not None:
+		return
+
+	def warmUp():
+		try:
+			start = time.perf_counter()
+			from . import sapieClient
+			log.debug(f"sapieClient imported in {time.perf_counter() - start:.2f} s")
+		except Exception as e:
+			log.error(f"Could not import sapieClient: {e}", exc_info=True)
+
+	_warmUpThread = threading.Thread(target=warmUp, daemon=True)
+	_warmUpThread.start()
+
+
 class BookDetailDialog(wx.Dialog):
 	"""Dialog to display detailed book information"""
 
@@ -88,6 +128,17 @@ class SapieDialog(wx.Dialog):
 
 		self.client = None
 		self.searchResults = []
+		# Incremented whenever the results list is cleared so that pages
+		# still arriving from an earlier query can be discarded
+		self._resultsGeneration = 0
+		self.detailPrefetcher = None
+		self.downloadManager = None
+		# Latest download progress waiting for the main thread, so that
+		# progress reports never queue up in the wx event loop
+		self._pendingDownloadProgress = None
+		self._downloadProgressLock = threading.Lock()
+		self._lastSpokenPercent = 0
+		self._lastProgressSpeech = 0
 		self.isLoggedIn = False
 
 		self._createControls()
@@ -97,6 +148,9 @@ class SapieDialog(wx.Dialog):
 		# Show login panel initially, hide search panel
 		self._showLoginPanel()
 
+		# Load the networking stack while the user logs in
+		warmUpClient()
+
 	def _createControls(self):
 		"""Create dialog controls"""
 		self.mainSizer = wx.BoxSizer(wx.VERTICAL)
@@ -114,6 +168,12 @@ class SapieDialog(wx.Dialog):
 		self.mainSizer.Add(self.progressBar, flag=wx.EXPAND | wx.ALL, border=5)
 		self.progressBar.Hide()
 
+		# Download progress bar (initially hidden), separate from the search
+		# pulse so both can run at once
+		self.downloadProgressBar = wx.Gauge(self, range=100, style=wx.GA_HORIZONTAL)
+		self.mainSizer.Add(self.downloadProgressBar, flag=wx.EXPAND | wx.ALL, border=5)
+		self.downloadProgressBar.Hide()
+
 		# Status text (always visible)
 		self.statusText = wx.StaticText(self, label=_("ログインしてください"))
 		self.mainSizer.Add(self.statusText, flag=wx.ALL, border=5)
@@ -221,7 +281,7 @@ class SapieDialog(wx.Dialog):
 
 		self.resultsList = wx.ListCtrl(
 			panel,
-			style=wx.LC_REPORT | wx.LC_SINGLE_SEL
+			style=wx.LC_REPORT
 		)
 		self.resultsList.InsertColumn(0, _("タイトル"), width=300)
 		self.resultsList.InsertColumn(1, _("著者"), width=150)
@@ -916,7 +976,11 @@ class SapieDialog(wx.Dialog):
 			try:
 				# Initialize client
 				if not self.client:
-					self.client = sapieClient.SapieClient()
+					from . import sapieClient
+					self.client = sapieClient.SapieClient(
+						result_cache=resultCache.ResultCache(),
+						detail_cache=resultCache.DetailCache()
+					)
 
 				success, message = self.client.login(username, password)
 
@@ -985,6 +1049,7 @@ class SapieDialog(wx.Dialog):
 
 			# Switch to search panel
 			self._showSearchPanel()
+			self._startDownloadManager()
 		else:
 			self.setStatus(_("ログイン失敗"))
 			wx.MessageBox(
@@ -1042,6 +1107,9 @@ class SapieDialog(wx.Dialog):
 
 	def onLogout(self, evt):
 		"""Handle logout button click"""
+		self._stopDetailPrefetch()
+		self._stopDownloadManager()
+
 		if self.client:
 			self.client.close()
 			self.client = None
@@ -1051,8 +1119,12 @@ class SapieDialog(wx.Dialog):
 		ui.message(_("ログアウトしました"))
 
 		# Clear search results
-		self.resultsList.DeleteAllItems()
-		self.searchResults = []
+		self._clearResults()
+
+		# Queries still running are ignored from now on, so their progress goes too
+		if hasattr(self, 'progressTimer'):
+			self.progressTimer.Stop()
+		self._hideProgress()
 
 		# Switch back to login panel
 		self._showLoginPanel()
@@ -1410,18 +1482,18 @@ class SapieDialog(wx.Dialog):
 		def searchThread():
 			"""Background thread for search"""
 			try:
-				success, results = self.client.search(bookType, search_params)
+				success, results = self.client.search(bookType, search_params, on_page=onPage)
 
 				# Call UI update on main thread
-				wx.CallAfter(self._onSearchComplete, success, results)
+				wx.CallAfter(self._onSearchComplete, generation, success, results)
 
 			except Exception as e:
 				log.error(f"Search thread error: {e}", exc_info=True)
-				wx.CallAfter(self._onSearchError, str(e))
+				wx.CallAfter(self._onSearchError, generation, str(e))
 
 		# Clear previous results and show progress
-		self.resultsList.DeleteAllItems()
-		self.searchResults = []
+		generation = self._clearResults()
+		onPage = self._makePageCallback(generation)
 		self._showProgress()
 		self.setStatus(_("検索中..."))
 		self.searchButton.Enable(False)
@@ -1436,14 +1508,20 @@ class SapieDialog(wx.Dialog):
 			self.Bind(wx.EVT_TIMER, self._onProgressTimer, self.progressTimer)
 			self.progressTimer.Start(100)  # Update every 100ms
 
-	def _onSearchComplete(self, success, results):
+	def _onSearchComplete(self, generation, success, results):
 		"""
 		Handle search completion on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			success (bool): Whether search succeeded
 			results (list or str): Search results or error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.searchButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1463,13 +1541,20 @@ class SapieDialog(wx.Dialog):
 				wx.OK | wx.ICON_ERROR
 			)
 
-	def _onSearchError(self, error_msg):
+	def _onSearchError(self, generation, error_msg):
 		"""
 		Handle search error on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			error_msg (str): Error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.searchButton.Enable(True)
+			self.onlineRequestSearchButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1494,18 +1579,18 @@ class SapieDialog(wx.Dialog):
 		def searchThread():
 			"""Background thread for detailed search"""
 			try:
-				success, results = self.client.detailed_search(search_params)
+				success, results = self.client.detailed_search(search_params, on_page=onPage)
 
 				# Call UI update on main thread
-				wx.CallAfter(self._onDetailedSearchComplete, success, results)
+				wx.CallAfter(self._onDetailedSearchComplete, generation, success, results)
 
 			except Exception as e:
 				log.error(f"Detailed search thread error: {e}", exc_info=True)
-				wx.CallAfter(self._onDetailedSearchError, str(e))
+				wx.CallAfter(self._onDetailedSearchError, generation, str(e))
 
 		# Clear previous results and show progress
-		self.resultsList.DeleteAllItems()
-		self.searchResults = []
+		generation = self._clearResults()
+		onPage = self._makePageCallback(generation)
 		self._showProgress()
 		self.setStatus(_("詳細検索中..."))
 		self.detailedSearchButton.Enable(False)
@@ -1520,14 +1605,20 @@ class SapieDialog(wx.Dialog):
 			self.Bind(wx.EVT_TIMER, self._onProgressTimer, self.progressTimer)
 			self.progressTimer.Start(100)  # Update every 100ms
 
-	def _onDetailedSearchComplete(self, success, results):
+	def _onDetailedSearchComplete(self, generation, success, results):
 		"""
 		Handle detailed search completion on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			success (bool): Whether search succeeded
 			results (list or str): Search results or error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.detailedSearchButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1547,13 +1638,19 @@ class SapieDialog(wx.Dialog):
 				wx.OK | wx.ICON_ERROR
 			)
 
-	def _onDetailedSearchError(self, error_msg):
+	def _onDetailedSearchError(self, generation, error_msg):
 		"""
 		Handle detailed search error on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			error_msg (str): Error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.detailedSearchButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1683,18 +1780,19 @@ class SapieDialog(wx.Dialog):
 			try:
 				success, results = self.client.genre_search(subgenre_code, material_type, has_content,
 				                                            production_status, orig_pub_from, orig_pub_to,
-				                                            complete_from, complete_to, daisy_only)
+				                                            complete_from, complete_to, daisy_only,
+				                                            on_page=onPage)
 
 				# Call UI update on main thread
-				wx.CallAfter(self._onGenreSearchComplete, success, results)
+				wx.CallAfter(self._onGenreSearchComplete, generation, success, results)
 
 			except Exception as e:
 				log.error(f"Genre search thread error: {e}", exc_info=True)
-				wx.CallAfter(self._onGenreSearchError, str(e))
+				wx.CallAfter(self._onGenreSearchError, generation, str(e))
 
 		# Clear previous results and show progress
-		self.resultsList.DeleteAllItems()
-		self.searchResults = []
+		generation = self._clearResults()
+		onPage = self._makePageCallback(generation)
 		self._showProgress()
 		self.setStatus(_("ジャンル検索中..."))
 		self.genreSearchButton.Enable(False)
@@ -1709,14 +1807,20 @@ class SapieDialog(wx.Dialog):
 			self.Bind(wx.EVT_TIMER, self._onProgressTimer, self.progressTimer)
 			self.progressTimer.Start(100)  # Update every 100ms
 
-	def _onGenreSearchComplete(self, success, results):
+	def _onGenreSearchComplete(self, generation, success, results):
 		"""
 		Handle genre search completion on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			success (bool): Whether search succeeded
 			results (list or str): Search results or error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.genreSearchButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1736,13 +1840,19 @@ class SapieDialog(wx.Dialog):
 				wx.OK | wx.ICON_ERROR
 			)
 
-	def _onGenreSearchError(self, error_msg):
+	def _onGenreSearchError(self, generation, error_msg):
 		"""
 		Handle genre search error on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			error_msg (str): Error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.genreSearchButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1769,15 +1879,14 @@ class SapieDialog(wx.Dialog):
 				success, results = self.client.search_online_request(search_params)
 
 				# Call UI update on main thread
-				wx.CallAfter(self._onOnlineRequestSearchComplete, success, results)
+				wx.CallAfter(self._onOnlineRequestSearchComplete, generation, success, results)
 
 			except Exception as e:
 				log.error(f"Online request search thread error: {e}", exc_info=True)
-				wx.CallAfter(self._onOnlineRequestSearchError, str(e))
+				wx.CallAfter(self._onOnlineRequestSearchError, generation, str(e))
 
 		# Clear previous results and show progress
-		self.resultsList.DeleteAllItems()
-		self.searchResults = []
+		generation = self._clearResults()
 		self._showProgress()
 		self.setStatus(_("オンラインリクエスト検索中..."))
 		self.onlineRequestSearchButton.Enable(False)
@@ -1792,14 +1901,20 @@ class SapieDialog(wx.Dialog):
 			self.Bind(wx.EVT_TIMER, self._onProgressTimer, self.progressTimer)
 			self.progressTimer.Start(100)  # Update every 100ms
 
-	def _onOnlineRequestSearchComplete(self, success, results):
+	def _onOnlineRequestSearchComplete(self, generation, success, results):
 		"""
 		Handle online request search completion on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			success (bool): Whether search succeeded
 			results (list or str): Search results or error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.onlineRequestSearchButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1819,13 +1934,19 @@ class SapieDialog(wx.Dialog):
 				wx.OK | wx.ICON_ERROR
 			)
 
-	def _onOnlineRequestSearchError(self, error_msg):
+	def _onOnlineRequestSearchError(self, generation, error_msg):
 		"""
 		Handle online request search error on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			error_msg (str): Error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.onlineRequestSearchButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1850,18 +1971,18 @@ class SapieDialog(wx.Dialog):
 		def loadThread():
 			"""Background thread for new arrivals load"""
 			try:
-				success, results = self.client.get_new_arrivals(bookType, period)
+				success, results = self.client.get_new_arrivals(bookType, period, on_page=onPage)
 
 				# Call UI update on main thread
-				wx.CallAfter(self._onNewArrivalsLoadComplete, success, results)
+				wx.CallAfter(self._onNewArrivalsLoadComplete, generation, success, results)
 
 			except Exception as e:
 				log.error(f"New arrivals load thread error: {e}", exc_info=True)
-				wx.CallAfter(self._onNewArrivalsLoadError, str(e))
+				wx.CallAfter(self._onNewArrivalsLoadError, generation, str(e))
 
 		# Clear previous results and show progress
-		self.resultsList.DeleteAllItems()
-		self.searchResults = []
+		generation = self._clearResults()
+		onPage = self._makePageCallback(generation)
 		self._showProgress()
 		self.setStatus(_("新着情報を取得中..."))
 		self.newArrivalsLoadButton.Enable(False)
@@ -1876,14 +1997,20 @@ class SapieDialog(wx.Dialog):
 			self.Bind(wx.EVT_TIMER, self._onProgressTimer, self.progressTimer)
 			self.progressTimer.Start(100)  # Update every 100ms
 
-	def _onNewArrivalsLoadComplete(self, success, results):
+	def _onNewArrivalsLoadComplete(self, generation, success, results):
 		"""
 		Handle new arrivals load completion on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			success (bool): Whether load succeeded
 			results (list or str): Load results or error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.newArrivalsLoadButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1903,13 +2030,19 @@ class SapieDialog(wx.Dialog):
 				wx.OK | wx.ICON_ERROR
 			)
 
-	def _onNewArrivalsLoadError(self, error_msg):
+	def _onNewArrivalsLoadError(self, generation, error_msg):
 		"""
 		Handle new arrivals load error on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			error_msg (str): Error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.newArrivalsLoadButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1933,18 +2066,18 @@ class SapieDialog(wx.Dialog):
 		def loadThread():
 			"""Background thread for popular books load"""
 			try:
-				success, results = self.client.get_popular_books(bookType)
+				success, results = self.client.get_popular_books(bookType, on_page=onPage)
 
 				# Call UI update on main thread
-				wx.CallAfter(self._onPopularBooksLoadComplete, success, results)
+				wx.CallAfter(self._onPopularBooksLoadComplete, generation, success, results)
 
 			except Exception as e:
 				log.error(f"Popular books load thread error: {e}", exc_info=True)
-				wx.CallAfter(self._onPopularBooksLoadError, str(e))
+				wx.CallAfter(self._onPopularBooksLoadError, generation, str(e))
 
 		# Clear previous results and show progress
-		self.resultsList.DeleteAllItems()
-		self.searchResults = []
+		generation = self._clearResults()
+		onPage = self._makePageCallback(generation)
 		self._showProgress()
 		self.setStatus(_("人気のある本を取得中..."))
 		self.popularBooksLoadButton.Enable(False)
@@ -1959,14 +2092,20 @@ class SapieDialog(wx.Dialog):
 			self.Bind(wx.EVT_TIMER, self._onProgressTimer, self.progressTimer)
 			self.progressTimer.Start(100)  # Update every 100ms
 
-	def _onPopularBooksLoadComplete(self, success, results):
+	def _onPopularBooksLoadComplete(self, generation, success, results):
 		"""
 		Handle popular books load completion on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			success (bool): Whether load succeeded
 			results (list or str): Load results or error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.popularBooksLoadButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -1986,13 +2125,19 @@ class SapieDialog(wx.Dialog):
 				wx.OK | wx.ICON_ERROR
 			)
 
-	def _onPopularBooksLoadError(self, error_msg):
+	def _onPopularBooksLoadError(self, generation, error_msg):
 		"""
 		Handle popular books load error on main thread
 
 		Args:
+			generation (int): Results generation of the query
 			error_msg (str): Error message
 		"""
+		if generation != self._resultsGeneration:
+			# Query superseded by a newer one, which owns the results and status
+			self.popularBooksLoadButton.Enable(True)
+			return
+
 		# Stop progress timer and hide progress bar
 		if hasattr(self, 'progressTimer'):
 			self.progressTimer.Stop()
@@ -2006,16 +2151,65 @@ class SapieDialog(wx.Dialog):
 			wx.OK | wx.ICON_ERROR
 		)
 
+	def _clearResults(self):
+		"""
+		Clear the results list and start a new results generation
+
+		Returns:
+			int: Generation number of the query about to be started
+		"""
+		self.resultsList.DeleteAllItems()
+		self.searchResults = []
+		self._resultsGeneration += 1
+		return self._resultsGeneration
+
+	def _makePageCallback(self, generation):
+		"""
+		Create a callback that passes each page of results to the main thread
+
+		Args:
+			generation (int): Results generation the callback belongs to
+
+		Returns:
+			callable: Callback for the on_page argument of the client methods
+		"""
+		def onPage(pageResults):
+			wx.CallAfter(self._appendResults, generation, pageResults)
+		return onPage
+
+	def _appendResults(self, generation, pageResults):
+		"""
+		Append one page of results to the list while a query is still running
+
+		Args:
+			generation (int): Results generation the page belongs to
+			pageResults (list): List of book dictionaries of one page
+		"""
+		if generation != self._resultsGeneration:
+			# Page of a query that has been superseded
+			return
+
+		self.searchResults.extend(pageResults)
+		self._displayResults(self.searchResults)
+		self.setStatus(_(f"{len(self.searchResults)}件取得済み..."))
+
 	def _displayResults(self, results):
 		"""
 		Display search results in the list
 
+		Rows already shown are kept, so the list can be filled page by page
+		while a query is still running.
+
 		Args:
 			results (list): List of book dictionaries
 		"""
-		self.resultsList.DeleteAllItems()
+		shownCount = self.resultsList.GetItemCount()
+		if shownCount > len(results):
+			self.resultsList.DeleteAllItems()
+			shownCount = 0
 
-		for i, book in enumerate(results):
+		for i in range(shownCount, len(results)):
+			book = results[i]
 			index = self.resultsList.InsertItem(i, book.get('title', ''))
 			self.resultsList.SetItem(index, 1, book.get('author', ''))
 			self.resultsList.SetItem(index, 2, book.get('type', ''))
@@ -2025,8 +2219,8 @@ class SapieDialog(wx.Dialog):
 			else:
 				self.resultsList.SetItem(index, 3, '')
 
-		# Select first item if available
-		if results:
+		# Select first item when it has just been added
+		if results and shownCount == 0:
 			self.resultsList.Select(0)
 			self.resultsList.SetFocus()
 
@@ -2044,20 +2238,54 @@ class SapieDialog(wx.Dialog):
 
 			# Enable detail button for all results (will check parameters when clicked)
 			self.detailButton.Enable(True)
+
+			self._prefetchDetails(selectedIndex)
 		else:
 			self.downloadButton.Enable(False)
 			self.detailButton.Enable(False)
 
-	def onDownload(self, evt):
-		"""Handle download button click"""
-		selectedIndex = self.resultsList.GetFirstSelected()
-		if selectedIndex < 0:
-			return
+	def _prefetchDetails(self, selectedIndex):
+		"""
+		Prefetch the details of the selected row and its neighbours
 
-		if selectedIndex >= len(self.searchResults):
+		Args:
+			selectedIndex (int): Index of the selected result
+		"""
+		if not self.client or not self.isLoggedIn:
 			return
 
-		book = self.searchResults[selectedIndex]
+		if not self.detailPrefetcher:
+			from . import sapieClient
+			self.detailPrefetcher = sapieClient.DetailPrefetcher(self.client)
+
+		# Selected row first, then rows by distance, next row before previous
+		books = [self.searchResults[selectedIndex]]
+		for distance in range(1, DETAIL_PREFETCH_RADIUS + 1):
+			for index in (selectedIndex + distance, selectedIndex - distance):
+				if 0 <= index < len(self.searchResults):
+					books.append(self.searchResults[index])
+		self.detailPrefetcher.prefetch(books)
+
+	def _stopDetailPrefetch(self):
+		"""Stop prefetching book details"""
+		if self.detailPrefetcher:
+			self.detailPrefetcher.stop()
+			self.detailPrefetcher = None
+
+	def onDownload(self, evt):
+		"""Handle download button click: queue every selected book"""
+		books = []
+		selectedIndex = self.resultsList.GetFirstSelected()
+		while selectedIndex >= 0:
+			if selectedIndex < len(self.searchResults):
+				book = self.searchResults[selectedIndex]
+				# Online requests can't be downloaded
+				if not book.get('is_online_request', False):
+					books.append(book)
+			selectedIndex = self.resultsList.GetNextSelected(selectedIndex)
+
+		if not books or not self.downloadManager:
+			return
 
 		# Get download path from config
 		downloadPath = config.conf["sapieLibrary"].get("downloadPath", "")
@@ -2080,47 +2308,182 @@ class SapieDialog(wx.Dialog):
 
 			dlg.Destroy()
 
-		# Show progress bar and disable download button
-		self._showProgress()
-		self.downloadButton.Enable(False)
-		self.setStatus(_(f"ダウンロード中: {book.get('title', '')}"))
-		ui.message(_("ダウンロードを開始しました"))
+		added = self.downloadManager.add(books, downloadPath)
+		if not added:
+			ui.message(_("選択した図書はすでにダウンロード待ちです"))
+			return
 
-		# Start progress animation timer if not already running
-		if not hasattr(self, 'progressTimer') or not self.progressTimer.IsRunning():
-			self.progressTimer = wx.Timer(self)
-			self.Bind(wx.EVT_TIMER, self._onProgressTimer, self.progressTimer)
-			self.progressTimer.Start(100)  # Update every 100ms
+		if len(added) == 1:
+			self.setStatus(_(f"ダウンロード中: {added[0].title}"))
+			ui.message(_("ダウンロードを開始しました"))
+		else:
+			self.setStatus(_(f"{len(added)}件のダウンロードを追加しました"))
+			ui.message(_(f"{len(added)}件のダウンロードを開始しました"))
+		self._showDownloadProgress()
+
+	def _startDownloadManager(self):
+		"""Create the download queue for the logged in client and resume unfinished downloads"""
+		def onUpdate(item, progress):
+			if item.status != downloadManager.DOWNLOADING:
+				wx.CallAfter(self._onDownloadUpdate, item, progress)
+				return
 
-		# Start download in background thread
-		thread = downloadThread.DownloadThread(
-			self.client,
-			book.get('id', ''),
-			downloadPath,
-			self._onDownloadComplete,
-			self._onDownloadError,
-			book.get('format', 'BRL'),  # Pass format for DAISY vs Braille
-			book.get('s00202', None),  # Pass actual S00202 value from search results
-			book.get('s00215', None)   # Pass actual S00215 value (priority/source)
-		)
-		thread.start()
+			# Progress reports replace the one still waiting instead of
+			# adding another event
+			with self._downloadProgressLock:
+				waiting = self._pendingDownloadProgress is not None
+				self._pendingDownloadProgress = (item, progress)
+			if not waiting:
+				wx.CallAfter(self._onDownloadProgress)
+
+		self.downloadManager = downloadManager.DownloadManager(self.client, on_update=onUpdate)
+
+		pending = self.downloadManager.get_pending()
+		if pending:
+			self.setStatus(_(f"未完了のダウンロード{len(pending)}件を再開します"))
+			ui.message(_(f"未完了のダウンロード{len(pending)}件を再開します"))
+			self._showDownloadProgress()
+			self.downloadManager.start()
+
+	def _stopDownloadManager(self):
+		"""Stop the downloads before the client is closed; unfinished items are kept for next time"""
+		if self.downloadManager:
+			self.downloadManager.stop()
+			self.downloadManager = None
+
+	def _showDownloadProgress(self):
+		"""Show the download progress bar"""
+		if not self.downloadProgressBar.IsShown():
+			self.downloadProgressBar.SetValue(0)
+			self._lastSpokenPercent = 0
+			self._lastProgressSpeech = time.monotonic()
+		self.downloadProgressBar.Show()
+		self.Layout()
+
+	def _hideDownloadProgress(self):
+		"""Hide the download progress bar"""
+		self.downloadProgressBar.Hide()
+		self.Layout()
+
+	def _onDownloadProgress(self):
+		"""Show the latest download progress on the main thread"""
+		with self._downloadProgressLock:
+			item, progress = self._pendingDownloadProgress
+			self._pendingDownloadProgress = None
+
+		# A state change of the item may have been handled in the meantime
+		if item.status != downloadManager.DOWNLOADING:
+			return
+		if not self.downloadProgressBar.IsShown():
+			self._showDownloadProgress()
+
+		percent = int(progress['fraction'] * 100)
+		if item.total is None and progress['total'] == 1:
+			# Length of the book unknown
+			self.downloadProgressBar.Pulse()
+		else:
+			self.downloadProgressBar.SetValue(percent)
+
+		total = progress['total']
+		finished = progress[downloadManager.DONE] + progress[downloadManager.FAILED]
+		if total > 1:
+			label = _(f"ダウンロード中 ({finished + 1}/{total}): {item.title}")
+		else:
+			label = _(f"ダウンロード中: {item.title}")
+		# Not logged: the status changes several times per second
+		self.statusText.SetLabel(f"{label} {self._formatDownloadProgress(item)}")
+
+		now = time.monotonic()
+		if (percent >= self._lastSpokenPercent + DOWNLOAD_SPEECH_STEP
+				and now - self._lastProgressSpeech >= DOWNLOAD_SPEECH_INTERVAL):
+			self._lastSpokenPercent = percent - percent % DOWNLOAD_SPEECH_STEP
+			self._lastProgressSpeech = now
+			ui.message(_(f"{percent}パーセント"))
+
+	def _formatDownloadProgress(self, item):
+		"""
+		Describe the progress of a running download
+
+		Args:
+			item (downloadManager.DownloadItem): Running download
+
+		Returns:
+			str: Received size, percentage, speed and remaining time
+		"""
+		parts = []
+		if item.total:
+			parts.append(f"{item.received * 100 // item.total}% ({self._formatSize(item.received)}/{self._formatSize(item.total)})")
+		else:
+			parts.append(self._formatSize(item.received))
+		parts.append(f"{self._formatSize(item.speed)}/秒")
+		if item.eta is not None:
+			if item.eta < 60:
+				parts.append(_(f"残り約{int(item.eta) + 1}秒"))
+			else:
+				parts.append(_(f"残り約{int(item.eta // 60) + 1}分"))
+		return " ".join(parts)
+
+	def _formatSize(self, size):
+		"""Format a number of bytes as KB or MB"""
+		if size >= 1024 * 1024:
+			return f"{size / (1024 * 1024):.1f}MB"
+		return f"{size / 1024:.0f}KB"
 
-	def _onDownloadComplete(self, bookId, filePath):
+	def _onDownloadUpdate(self, item, progress):
 		"""
-		Callback for download completion
+		Report a change of a queued download on the main thread
+
+		A batch of one book is reported as before; larger batches announce
+		each finished book and a summary at the end.
 
 		Args:
-			bookId (str): Book ID
-			filePath (str): Downloaded file path
+			item (downloadManager.DownloadItem): Download that changed state
+			progress (dict): Aggregate progress from DownloadManager.get_progress()
 		"""
-		wx.CallAfter(self._downloadCompleteUI, bookId, filePath)
+		total = progress['total']
+		finished = progress[downloadManager.DONE] + progress[downloadManager.FAILED]
+
+		if total == 1:
+			if item.status == downloadManager.DONE:
+				self._downloadCompleteUI(item.book_id, item.file_path)
+			else:
+				self._downloadErrorUI(item.book_id, item.error)
+			return
+
+		if item.status == downloadManager.DONE:
+			ui.message(_(f"ダウンロード完了 ({finished}/{total}): {item.title}"))
+		else:
+			ui.message(_(f"ダウンロード失敗 ({finished}/{total}): {item.title}"))
+
+		if finished == total:
+			self._downloadBatchCompleteUI(progress)
+
+	def _downloadBatchCompleteUI(self, progress):
+		"""UI update when every book of a batch has finished"""
+		# A search may still be using the other progress bar
+		self._hideDownloadProgress()
+
+		failed = progress[downloadManager.FAILED]
+		message = _(f"{progress['total']}件のダウンロードが終了しました（成功 {progress[downloadManager.DONE]}件、失敗 {failed}件）")
+		self.setStatus(message)
+		ui.message(message)
+
+		if failed and self.downloadManager:
+			errors = [
+				f"{item.title}: {item.error}"
+				for item in self.downloadManager.items
+				if item.status == downloadManager.FAILED
+			]
+			wx.MessageBox(
+				"\n".join(errors),
+				_("ダウンロードエラー"),
+				wx.OK | wx.ICON_ERROR
+			)
 
 	def _downloadCompleteUI(self, bookId, filePath):
 		"""UI update for download completion"""
-		# Stop progress timer and hide progress bar
-		if hasattr(self, 'progressTimer'):
-			self.progressTimer.Stop()
-		self._hideProgress()
+		# A search may still be using the other progress bar
+		self._hideDownloadProgress()
 		self.downloadButton.Enable(True)
 
 		self.setStatus(_("ダウンロード完了"))
@@ -2136,22 +2499,10 @@ class SapieDialog(wx.Dialog):
 
 		wx.CallLater(500, showViewDialog)
 
-	def _onDownloadError(self, bookId, errorMsg):
-		"""
-		Callback for download error
-
-		Args:
-			bookId (str): Book ID
-			errorMsg (str): Error message
-		"""
-		wx.CallAfter(self._downloadErrorUI, bookId, errorMsg)
-
 	def _downloadErrorUI(self, bookId, errorMsg):
 		"""UI update for download error"""
-		# Stop progress timer and hide progress bar
-		if hasattr(self, 'progressTimer'):
-			self.progressTimer.Stop()
-		self._hideProgress()
+		# A search may still be using the other progress bar
+		self._hideDownloadProgress()
 		self.downloadButton.Enable(True)
 
 		self.setStatus(_("ダウンロードエラー"))
@@ -2198,6 +2549,12 @@ class SapieDialog(wx.Dialog):
 				)
 				return
 
+			# Show cached or prefetched details right away
+			cachedDetails = self.client.get_cached_book_details(s00222)
+			if cachedDetails is not None:
+				self._onDetailComplete(True, cachedDetails, book)
+				return
+
 			# Show progress and disable button
 			self.detailButton.Enable(False)
 			self.setStatus(_(f"詳細情報を取得中: {book.get('title', '')}"))
@@ -2256,6 +2613,9 @@ class SapieDialog(wx.Dialog):
 		if hasattr(self, 'progressTimer') and self.progressTimer.IsRunning():
 			self.progressTimer.Stop()
 
+		self._stopDetailPrefetch()
+		self._stopDownloadManager()
+
 		# Close client connection
 		if self.client:
 			self.client.close()
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+# Sapie Library - Persistent cache of converted book text
+
+import os
+import zlib
+import codecs
+import hashlib
+import logging
+import tempfile
+import threading
+
+from . import resultCache
+
+log = logging.getLogger(__name__)
+
+# Upper bound of the cached text (compressed size in bytes)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bytes read at a time when hashing archives and reading cached text
+READ_CHUNK_SIZE = 256 * 1024
+
+CACHE_FILE_SUFFIX = '.txt.z'
+
+# Output modes of the conversion
+KANA = 'kana'
+BRAILLE = 'braille'
+
+
+def hash_file(file_path):
+	"""
+	Compute the content hash of an archive
+
+	Args:
+		file_path (str): Path of the file
+
+	Returns:
+		str: Hex SHA-1 digest of the file content
+	"""
+	digest = hashlib.sha1()
+	with open(file_path, 'rb') as f:
+		while True:
+			chunk = f.read(READ_CHUNK_SIZE)
+			if not chunk:
+				break
+			digest.update(chunk)
+	return digest.hexdigest()
+
+
+class TextCache:
+	"""
+	Converted text of books, one zlib-compressed file per entry
+
+	Entries are keyed by the content hash of the archive, the internal
+	names of the converted members and the output mode, so a book that
+	is moved or downloaded again still hits, while a changed archive
+	misses. The least recently used entries are deleted when the files
+	exceed the size bound.
+	"""
+
+	def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+		"""
+		Initialize the cache
+
+		Args:
+			directory (str): Cache directory, defaults to text in get_cache_dir()
+			max_bytes (int): Size bound of the cache files
+		"""
+		self.directory = directory or os.path.join(resultCache.get_cache_dir(), 'text')
+		self.max_bytes = max_bytes
+		self.hits = 0
+		self.misses = 0
+		self._lock = threading.Lock()
+		# (path, size, mtime) -> content hash of archives seen in this session
+		self._hashes = {}
+
+	def make_key(self, file_path, members, mode):
+		"""
+		Build the cache key of a conversion
+
+		Args:
+			file_path (str): Path of the ZIP/EXE archive
+			members (list): Internal names of the converted members, in order
+			mode (str): KANA or BRAILLE
+
+		Returns:
+			str: Cache key
+		"""
+		stat = os.stat(file_path)
+		identity = (os.path.abspath(file_path), stat.st_size, stat.st_mtime)
+		with self._lock:
+			content_hash = self._hashes.get(identity)
+		if content_hash is None:
+			content_hash = hash_file(file_path)
+			with self._lock:
+				self._hashes[identity] = content_hash
+
+		key = '\0'.join([content_hash, mode] + list(members))
+		return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+	def get(self, key):
+		"""
+		Look up cached text
+
+		Args:
+			key (str): Key from make_key()
+
+		Returns:
+			iterator or None: Pieces of the cached text, or None if not cached
+		"""
+		path = self._path(key)
+		try:
+			f = open(path, 'rb')
+		except OSError:
+			self.misses += 1
+			return None
+
+		self.hits += 1
+		try:
+			# Mark the entry as recently used
+			os.utime(path)
+		except OSError:
+			pass
+		return self._read(f, path)
+
+	def store(self, key, pieces):
+		"""
+		Cache text while it is being produced
+
+		The entry is written only if all pieces are consumed.
+
+		Args:
+			key (str): Key from make_key()
+			pieces (iterable): Pieces of the text
+
+		Yields:
+			The pieces unchanged
+		"""
+		compressor = zlib.compressobj()
+		temp_path = None
+		try:
+			os.makedirs(self.directory, exist_ok=True)
+			fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+			f = os.fdopen(fd, 'wb')
+		except Exception as e:
+			log.warning(f"Could not create text cache entry: {e}")
+			f = None
+
+		try:
+			for text in pieces:
+				if f:
+					f.write(compressor.compress(text.encode('utf-8')))
+				yield text
+
+			if f:
+				f.write(compressor.flush())
+				f.close()
+				f = None
+				os.replace(temp_path, self._path(key))
+				temp_path = None
+				self.evict()
+		finally:
+			if f:
+				f.close()
+			if temp_path:
+				try:
+					os.remove(temp_path)
+				except OSError:
+					pass
+
+	def evict(self):
+		"""Delete least recently used entries until the size bound is met"""
+		with self._lock:
+			try:
+				entries = []
+				for name in os.listdir(self.directory):
+					if name.endswith(CACHE_FILE_SUFFIX):
+						path = os.path.join(self.directory, name)
+						stat = os.stat(path)
+						entries.append((stat.st_mtime, stat.st_size, path))
+			except OSError as e:
+				log.warning(f"Could not list text cache: {e}")
+				return
+
+			size = sum(entry[1] for entry in entries)
+			entries.sort()
+			for mtime, entry_size, path in entries:
+				if size <= self.max_bytes:
+					break
+				try:
+					os.remove(path)
+					size -= entry_size
+					log.debug(f"Evicted cached text {os.path.basename(path)}")
+				except OSError:
+					pass
+
+	def clear(self):
+		"""Delete all entries"""
+		with self._lock:
+			try:
+				names = os.listdir(self.directory)
+			except OSError:
+				return
+			for name in names:
+				if name.endswith(CACHE_FILE_SUFFIX):
+					try:
+						os.remove(os.path.join(self.directory, name))
+					except OSError:
+						pass
+
+	def get_stats(self):
+		"""
+		Get cache statistics
+
+		Returns:
+			dict: Number of entries, their size in bytes, hits and misses
+		"""
+		entries = 0
+		size = 0
+		try:
+			for name in os.listdir(self.directory):
+				if name.endswith(CACHE_FILE_SUFFIX):
+					entries += 1
+					size += os.path.getsize(os.path.join(self.directory, name))
+		except OSError:
+			pass
+		return {'entries': entries, 'bytes': size, 'hits': self.hits, 'misses': self.misses}
+
+	def _path(self, key):
+		"""Get the file of an entry"""
+		return os.path.join(self.directory, key + CACHE_FILE_SUFFIX)
+
+	def _read(self, f, path):
+		"""Decompress an entry piece by piece"""
+		decompressor = zlib.decompressobj()
+		decoder = codecs.getincrementaldecoder('utf-8')()
+		try:
+			with f:
+				while True:
+					chunk = f.read(READ_CHUNK_SIZE)
+					if not chunk:
+						break
+					text = decoder.decode(decompressor.decompress(chunk))
+					if text:
+						yield text
+				text = decoder.decode(decompressor.flush(), final=True)
+				if text:
+					yield text
+		except (zlib.error, UnicodeDecodeError):
+			# A damaged entry is dropped so the next open converts again
+			log.warning(f"Removing damaged text cache entry {os.path.basename(path)}")
+			try:
+				os.remove(path)
+			except OSError:
+				pass
+			raise
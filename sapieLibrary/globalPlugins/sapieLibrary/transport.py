@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Sapie Library - HTTP transport settings (connection pools, timeouts, retries)
+
+import logging
+import threading
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.timeout import Timeout
+
+log = logging.getLogger(__name__)
+
+# Seconds to wait for a connection and between bytes of a response
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
+
+# Retries of failed connections, reset connections and 5xx responses
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+# Only requests that are safe to repeat are retried after being sent
+RETRY_METHODS = ('GET', 'HEAD')
+
+# Connection pool size and read timeout per Sapie host. The library host
+# serves concurrent page, ranking and detail requests; the download host
+# may take a while before it starts sending a book.
+HOST_SETTINGS = {
+	"https://library.sapie.or.jp/": {'pool_maxsize': 16, 'read_timeout': READ_TIMEOUT},
+	"https://member.sapie.or.jp/": {'pool_maxsize': 2, 'read_timeout': READ_TIMEOUT},
+	"https://cntdwn.sapie.or.jp/": {'pool_maxsize': 4, 'read_timeout': 120},
+}
+
+# Settings for any other host (one pool per host, several hosts)
+DEFAULT_HOST_SETTINGS = {'pool_connections': 10, 'pool_maxsize': 4, 'read_timeout': READ_TIMEOUT}
+
+
+class SapieHTTPAdapter(HTTPAdapter):
+	"""HTTPAdapter applying a default timeout and counting retries"""
+
+	def __init__(self, timeout=None, **kwargs):
+		"""
+		Initialize the adapter
+
+		Args:
+			timeout (urllib3.util.Timeout): Timeout used when a request sets none
+			**kwargs: Arguments passed to requests.adapters.HTTPAdapter
+		"""
+		self.timeout = timeout or Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT)
+		self.retries = 0
+		self._stats_lock = threading.Lock()
+		super().__init__(**kwargs)
+
+	def send(self, request, timeout=None, **kwargs):
+		"""Send a request with the default timeout unless one is given"""
+		if timeout is None:
+			timeout = self.timeout
+
+		response = super().send(request, timeout=timeout, **kwargs)
+
+		retries = getattr(response.raw, 'retries', None)
+		if retries is not None and retries.history:
+			with self._stats_lock:
+				self.retries += len(retries.history)
+			log.debug(f"{request.url} succeeded after {len(retries.history)} retries")
+		return response
+
+	def get_pool_stats(self):
+		"""
+		Get connection reuse statistics of the adapter's pools
+
+		Returns:
+			dict: Connections opened, requests sent, requests that reused an
+				open connection, and retries
+		"""
+		connections = 0
+		requests_sent = 0
+		pools = self.poolmanager.pools
+		for key in list(pools.keys()):
+			try:
+				pool = pools[key]
+			except KeyError:
+				continue
+			connections += pool.num_connections
+			requests_sent += pool.num_requests
+
+		return {
+			'connections': connections,
+			'requests': requests_sent,
+			'reused': max(requests_sent - connections, 0),
+			'retries': self.retries
+		}
+
+
+def make_retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF_FACTOR):
+	"""
+	Build the retry policy
+
+	Connection failures are retried for every request, while reset
+	connections and 5xx responses are only retried for GET/HEAD requests.
+
+	Args:
+		total (int): Maximum number of retries
+		backoff_factor (float): Base of the exponential backoff in seconds
+
+	Returns:
+		urllib3.util.Retry: Retry policy
+	"""
+	return Retry(
+		total=total,
+		connect=total,
+		read=total,
+		status=total,
+		backoff_factor=backoff_factor,
+		status_forcelist=RETRY_STATUS_CODES,
+		allowed_methods=frozenset(RETRY_METHODS),
+		raise_on_status=False
+	)
+
+
+def configure_session(session, host_settings=None, connect_timeout=CONNECT_TIMEOUT, retry=None):
+	"""
+	Mount pooled, retrying adapters with timeouts on a requests session
+
+	Args:
+		session (requests.Session): Session to configure
+		host_settings (dict): URL prefix to {'pool_maxsize', 'read_timeout'},
+			merged over HOST_SETTINGS
+		connect_timeout (float): Seconds to wait for a connection
+		retry (urllib3.util.Retry): Retry policy, defaults to make_retry()
+
+	Returns:
+		dict: URL prefix to the mounted SapieHTTPAdapter
+	"""
+	settings = dict(HOST_SETTINGS)
+	if host_settings:
+		settings.update(host_settings)
+	retry = retry or make_retry()
+
+	adapters = {}
+	for prefix in ("https://", "http://"):
+		adapters[prefix] = _make_adapter(DEFAULT_HOST_SETTINGS, connect_timeout, retry)
+	for prefix, host in settings.items():
+		adapters[prefix] = _make_adapter(host, connect_timeout, retry)
+
+	for prefix, adapter in adapters.items():
+		session.mount(prefix, adapter)
+	return adapters
+
+
+def _make_adapter(host, connect_timeout, retry):
+	"""Create the adapter for one host"""
+	return SapieHTTPAdapter(
+		timeout=Timeout(connect=connect_timeout, read=host.get('read_timeout', READ_TIMEOUT)),
+		pool_connections=host.get('pool_connections', 1),
+		pool_maxsize=host.get('pool_maxsize', DEFAULT_HOST_SETTINGS['pool_maxsize']),
+		max_retries=retry
+	)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Tests of the DAISY 3 (DTBook) section extraction
+#
+# Usage: python -m unittest discover tests
+
+import os
+import sys
+import json
+import types
+import shutil
+import threading
+import zipfile
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(ROOT_DIR, 'sapieLibrary', 'globalPlugins', 'sapieLibrary')
+
+# sapieLibrary/__init__.py needs NVDA, so the package is created bare
+if 'sapieLibrary' not in sys.modules:
+	package = types.ModuleType('sapieLibrary')
+	package.__path__ = [PACKAGE_DIR]
+	sys.modules['sapieLibrary'] = package
+
+from sapieLibrary import daisyConverter
+
+DTBOOK = '''<?xml version="1.0" encoding="utf-8"?>
+<!DOCTYPE dtbook PUBLIC "-//NISO//DTD dtbook 2005-3//EN" "http://www.daisy.org/z3986/2005/dtbook-2005-3.dtd">
+<dtbook xmlns="http://www.daisy.org/z3986/2005/dtbook/"><book><bodymatter>
+<level1><h1><sent>第一章</sent></h1><p>本文&nbsp;一</p><pagenum>3</pagenum>
+<level2><h2>一節</h2><p>節の本文</p></level2><p>章の続き</p></level1>
+<level1><p>見出しなし</p></level1>
+</bodymatter></book></dtbook>'''
+
+
+def make_book(path, xml_files):
+	"""Write a DAISY 3 archive with the given DTBook files"""
+	with zipfile.ZipFile(path, 'w') as zf:
+		zf.writestr('book/book.opf', '<package/>')
+		for name, xml_text in xml_files.items():
+			zf.writestr('book/' + name, xml_text.encode('utf-8'))
+
+
+class DTBookSectionsTest(unittest.TestCase):
+
+	def test_nested_levels_are_sections(self):
+		sections = daisyConverter._dtbook_sections(DTBOOK)
+		self.assertEqual(sections, [
+			{'level': 1, 'title': '第一章', 'content': '第一章\n本文 一\n3\n章の続き'},
+			{'level': 2, 'title': '一節', 'content': '一節\n節の本文'},
+			{'level': 1, 'title': 'セクション', 'content': '見出しなし'},
+		])
+
+	def test_headings_only_matches_content(self):
+		headings = daisyConverter._dtbook_sections(DTBOOK, with_content=False)
+		sections = daisyConverter._dtbook_sections(DTBOOK)
+		self.assertEqual(headings, [dict(section, content=None) for section in sections])
+
+	def test_malformed_xml_falls_back_to_regex(self):
+		sections = daisyConverter._dtbook_sections('<dtbook><level1><h1>見出し</h1><p>本文&nbsp;</level1>')
+		self.assertEqual(sections, [{'level': 1, 'title': '見出し', 'content': '見出し本文'}])
+
+
+class DaisyBookTest(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.path = os.path.join(self.directory, 'book.zip')
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_sections_of_a_file_are_parsed_once(self):
+		count = daisyConverter.SECTION_CACHE_SIZE * 2
+		body = ''.join(f'<level1><h1>章{i}</h1><p>本文{i}</p></level1>' for i in range(count))
+		make_book(self.path, {
+			'a.xml': f'<dtbook><book><bodymatter>{body}</bodymatter></book></dtbook>',
+			'b.xml': DTBOOK,
+		})
+
+		parse = daisyConverter._dtbook_sections
+		with mock.patch.object(daisyConverter, '_dtbook_sections', side_effect=parse) as parser:
+			with daisyConverter.DaisyBook(self.path) as book:
+				sections = list(book.iter_sections())
+
+		# One headings pass and one content pass per file
+		self.assertEqual(parser.call_count, 4)
+		self.assertEqual(len(sections), count + 3)
+		self.assertEqual(sections[count - 1]['content'], f'章{count - 1}\n本文{count - 1}')
+		self.assertEqual(sections[count + 1]['content'], '一節\n節の本文')
+
+	def test_browser_opens_before_sections_are_extracted(self):
+		make_book(self.path, {'b.xml': DTBOOK})
+		extracted = threading.Event()
+
+		def write_parts(book, parts_dir):
+			# The browser has been opened before the sections are extracted
+			self.assertTrue(browser.called)
+			write_html_parts(book, parts_dir)
+			extracted.set()
+
+		write_html_parts = daisyConverter.write_html_parts
+		with mock.patch.object(daisyConverter.tempfile, 'gettempdir', return_value=self.directory), \
+				mock.patch.object(daisyConverter, 'write_html_parts', side_effect=write_parts), \
+				mock.patch.object(daisyConverter.webbrowser, 'open') as browser:
+			success, title = daisyConverter.open_daisy_in_browser(self.path)
+			self.assertTrue(success)
+			self.assertTrue(extracted.wait(10))
+
+		with open(os.path.join(self.directory, f'{title}_daisy.html'), encoding='utf-8') as f:
+			page = f.read()
+		self.assertIn('<a href="#section1">一節</a>', page)
+		self.assertEqual(page.count('読み込み中...</div>'), 3)
+
+		with open(os.path.join(self.directory, f'{title}_daisy_files', 'part0.js'), encoding='utf-8') as f:
+			script = f.read()
+		first, contents, last = json.loads('[' + script[len('sapieDaisyFill('):-len(');\n')] + ']')
+		self.assertEqual((first, last), (0, True))
+		self.assertEqual(contents[1], '一節\n節の本文')
+
+
+if __name__ == '__main__':
+	unittest.main()
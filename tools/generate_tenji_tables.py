@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Generate TenjiTexter/Compiled_Table.py from the source braille tables
+#
+# Usage: python tools/generate_tenji_tables.py [--check]
+#
+# Japanese_Table, Info_Table and English_Table map text to braille and
+# stay the place to edit the tables. TenjiTexter converts braille to text,
+# so it needs them inverted; this script does the inversion once and
+# writes the result as plain dict literals, which load from the .pyc
+# without building any OrderedDict. Run it after editing a source table.
+# With --check it only reports whether Compiled_Table.py is up to date.
+
+import os
+import sys
+import hashlib
+import importlib.util
+
+TENJI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'sapieLibrary', 'globalPlugins', 'sapieLibrary', 'TenjiTexter')
+OUTPUT_PATH = os.path.join(TENJI_DIR, 'Compiled_Table.py')
+
+# Source module and names of the tables, in the order TenjiTexter defined them
+SOURCE_TABLES = (
+	('Japanese_Table', ('j01', 'j02', 'j03', 'j04', 'j05', 'j06', 'j07', 'j08', 'j09', 'j10', 'j11', 'j12')),
+	('Info_Table', ('i01', 'i02', 'i03', 'i04', 'i05', 'i06')),
+	('English_Table', ('e01', 'e02', 'e03', 'e04', 'e05', 'e06', 'e07')),
+)
+
+# Tables combined into PAIR_TABLES (two cells giving one character)
+PAIR_SOURCE_TABLES = ('j02', 'j03', 'j04', 'j05', 'j06', 'j07', 'j08', 'j09')
+
+
+def load_source(name):
+	"""Load a source table module without importing the TenjiTexter package"""
+	spec = importlib.util.spec_from_file_location(name, os.path.join(TENJI_DIR, name + '.py'))
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+
+def source_digest():
+	"""Hash of the source table files"""
+	digest = hashlib.sha1()
+	for name, tables in SOURCE_TABLES:
+		with open(os.path.join(TENJI_DIR, name + '.py'), 'rb') as f:
+			digest.update(f.read())
+	return digest.hexdigest()
+
+
+def build_tables():
+	"""
+	Invert the source tables
+
+	Returns:
+		dict: Table name to {braille: text}, plus PAIR_TABLES and J01_TRANSLATION
+	"""
+	tables = {}
+	for module_name, names in SOURCE_TABLES:
+		module = load_source(module_name)
+		for name in names:
+			# Same inversion as before: the last text of a braille pattern wins
+			tables[name] = dict((v, k) for k, v in getattr(module, name).items())
+
+	pair_tables = {}
+	for name in PAIR_SOURCE_TABLES:
+		for key, value in tables[name].items():
+			pair_tables.setdefault(key[0], {}).setdefault(key[1], value)
+	tables['PAIR_TABLES'] = pair_tables
+	tables['J01_TRANSLATION'] = str.maketrans(tables['j01'])
+	return tables
+
+
+def format_dict(value, indent='    '):
+	"""Write a dict literal with one entry per line"""
+	if not value:
+		return '{}'
+	lines = ['{']
+	for key, item in value.items():
+		if isinstance(item, dict):
+			item = format_dict(item, indent + '    ')
+		else:
+			item = repr(item)
+		lines.append(f'{indent}{key!r}: {item},')
+	lines.append(indent[:-4] + '}')
+	return '\n'.join(lines)
+
+
+def render():
+	"""Get the source of Compiled_Table.py"""
+	tables = build_tables()
+	out = [
+		'# -----------------------------------------------------------------------------',
+		'#  TenjiTexter',
+		'#  Generated by tools/generate_tenji_tables.py - do not edit.',
+		'#  Edit Japanese_Table.py, Info_Table.py or English_Table.py and run the',
+		'#  script again.',
+		'# -----------------------------------------------------------------------------',
+		'',
+		f'SOURCE_DIGEST = {source_digest()!r}',
+		'',
+	]
+	for name, value in tables.items():
+		out.append('')
+		out.append(f'{name} = {format_dict(value)}')
+		out.append('')
+	return '\n'.join(out)
+
+
+def main(args):
+	source = render()
+	try:
+		with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
+			current = f.read()
+	except OSError:
+		current = None
+
+	if '--check' in args:
+		if current != source:
+			print(f"{OUTPUT_PATH} is out of date")
+			return 1
+		print(f"{OUTPUT_PATH} is up to date")
+		return 0
+
+	if current != source:
+		with open(OUTPUT_PATH, 'w', encoding='utf-8', newline='\n') as f:
+			f.write(source)
+		print(f"Wrote {OUTPUT_PATH}")
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))